@@ -0,0 +1,56 @@
+"""Measure how parallel geometry fetch throughput scales with worker processes.
+
+Fetches the same sample of ids from a local division_area copy with each
+worker count, with the geometry cache disabled, and reports geometries per
+second and the speedup over one worker.
+
+Usage:
+    uv run python benchmarks/bench_parallel.py --source DIR [--workers 1 2 4 8] [--ids 5000]
+"""
+
+import argparse
+import json
+import time
+
+from wkls.engine import WklsEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--source", required=True, help="local directory of division_area files"
+    )
+    parser.add_argument("--metadata", help="metadata parquet (default: packaged)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--ids", type=int, default=5000, help="ids to fetch")
+    args = parser.parse_args()
+
+    engine = WklsEngine(
+        metadata_path=args.metadata, geometry_source=args.source, cache_enabled=False
+    )
+    ids = [
+        row[0]
+        for row in engine.sql(
+            f"SELECT id FROM wkls USING SAMPLE reservoir({args.ids} ROWS) REPEATABLE (42)"
+        ).fetchall()
+    ]
+
+    results = {"ids": len(ids)}
+    baseline = None
+    for workers in args.workers:
+        engine.resolve_cache_clear()
+        start = time.perf_counter()
+        fetched = sum(1 for _ in engine.root().fetch_parallel(ids, workers=workers))
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        results[f"workers_{workers}"] = {
+            "fetched": fetched,
+            "seconds": elapsed,
+            "geometries_per_s": fetched / elapsed,
+            "speedup": baseline / elapsed,
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare chain resolution through the in-memory index with the SQL queries.
+
+Usage:
+    uv run python benchmarks/bench_resolve.py [--metadata PATH] [--repeat 1000]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from wkls.core import CITY_QUERY, COUNTRY_QUERY, REGION_QUERY
+from wkls.engine import WklsEngine
+
+
+def sample_chains(engine, n):
+    rows = engine.sql(
+        """
+        SELECT country, region, name FROM wkls
+        WHERE subtype IN ('county', 'locality', 'localadmin')
+        USING SAMPLE reservoir(1000 ROWS) REPEATABLE (42)
+        """
+    ).fetchall()
+    rng = random.Random(42)
+    chains = []
+    for _ in range(n):
+        country, region, name = rng.choice(rows)
+        suffix = region.split("-", 1)[1].lower()
+        chains.append(
+            rng.choice(
+                [
+                    [country.lower()],
+                    [country.lower(), suffix],
+                    [country.lower(), suffix, name.replace(" ", "").lower()],
+                ]
+            )
+        )
+    return chains
+
+
+def sql_lookup(engine, chain):
+    country_iso = chain[0].upper()
+    if len(chain) == 1:
+        return engine.sql(COUNTRY_QUERY, (country_iso,)).fetchall()
+    region_iso = country_iso + "-" + chain[1].upper()
+    if len(chain) == 2:
+        return engine.sql(REGION_QUERY, (country_iso, region_iso)).fetchall()
+    return engine.sql(CITY_QUERY, (country_iso, region_iso, chain[2])).fetchall()
+
+
+def timed(fn, chains):
+    start = time.perf_counter()
+    for chain in chains:
+        fn(chain)
+    elapsed = time.perf_counter() - start
+    return {"lookups": len(chains), "us_per_lookup": elapsed / len(chains) * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--metadata", help="metadata parquet (default: packaged)")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = WklsEngine(metadata_path=args.metadata)
+    chains = sample_chains(engine, args.repeat)
+
+    start = time.perf_counter()
+    index = engine.index()
+    build_s = time.perf_counter() - start
+
+    results = {
+        "index_build_s": build_s,
+        "index": timed(index.lookup, chains),
+        "sql": timed(lambda chain: sql_lookup(engine, chain), chains),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
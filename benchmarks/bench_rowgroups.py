@@ -0,0 +1,100 @@
+"""Compare id lookups over the whole division_area glob with row-group index lookups.
+
+For a sample of ids, reports latency, bytes read and rows scanned (from DuckDB's
+profiler) and files touched for a full `WHERE id = ...` scan and for a targeted read of the
+single row group recorded in the index.
+
+Usage:
+    uv run python benchmarks/bench_rowgroups.py --source DIR --index INDEX.parquet [--samples 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+
+import duckdb
+
+PROFILING_METRICS = {
+    "LATENCY": "true",
+    "TOTAL_BYTES_READ": "true",
+    "ROWS_RETURNED": "true",
+    "OPERATOR_CARDINALITY": "true",
+    "OPERATOR_ROWS_SCANNED": "true",
+    "CUMULATIVE_ROWS_SCANNED": "true",
+}
+
+
+def profiled(conn, query, params):
+    conn.execute(query, params).fetchall()
+    info = json.loads(conn.get_profiling_information(format="json"))
+    return (
+        info["latency"],
+        info["total_bytes_read"],
+        info["cumulative_rows_scanned"],
+    )
+
+
+def summarize(samples, files):
+    return {
+        "median_latency_ms": statistics.median(s[0] for s in samples) * 1000,
+        "median_bytes_read": statistics.median(s[1] for s in samples),
+        "median_rows_scanned": statistics.median(s[2] for s in samples),
+        "files_touched": files,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--source", required=True, help="directory of division_area files"
+    )
+    parser.add_argument("--index", required=True, help="row-group index parquet")
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    glob = os.path.join(args.source, "*")
+    conn = duckdb.connect()
+    n_files = conn.execute(f"SELECT count(*) FROM glob('{glob}')").fetchone()[0]
+    located = conn.execute(
+        f"""
+        SELECT id, file, first_row, num_rows FROM read_parquet('{args.index}')
+        USING SAMPLE {args.samples} ROWS
+        """
+    ).fetchall()
+
+    conn.execute("PRAGMA enable_profiling = 'no_output'")
+    conn.execute(f"SET custom_profiling_settings = '{json.dumps(PROFILING_METRICS)}'")
+
+    full, indexed = [], []
+    for geom_id, file, first_row, num_rows in located:
+        full.append(
+            profiled(
+                conn,
+                f"SELECT geometry FROM read_parquet('{glob}') WHERE id = ?",
+                [geom_id],
+            )
+        )
+        indexed.append(
+            profiled(
+                conn,
+                f"""
+                SELECT geometry
+                FROM read_parquet('{args.source}/{file}', file_row_number = true)
+                WHERE file_row_number BETWEEN {first_row} AND {first_row + num_rows - 1}
+                  AND id = ?
+                """,
+                [geom_id],
+            )
+        )
+
+    results = {
+        "samples": len(located),
+        "full_scan": summarize(full, n_files),
+        "rowgroup_index": summarize(indexed, 1),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Measure name search latency for prefix, exact and misspelled queries.
+
+Usage:
+    uv run python benchmarks/bench_search.py [--metadata PATH] [--repeat 1000]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from wkls.engine import WklsEngine
+
+
+def sample_names(engine, n):
+    rows = engine.sql(
+        """
+        SELECT name FROM wkls
+        WHERE subtype IN ('county', 'locality', 'localadmin') AND name IS NOT NULL
+        USING SAMPLE reservoir(1000 ROWS) REPEATABLE (42)
+        """
+    ).fetchall()
+    rng = random.Random(42)
+    return [rng.choice(rows)[0] for _ in range(n)], rng
+
+
+def misspell(name, rng):
+    if len(name) < 4:
+        return name
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1 :]
+
+
+def timed(index, queries):
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    elapsed = time.perf_counter() - start
+    return {"queries": len(queries), "us_per_query": elapsed / len(queries) * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--metadata", help="metadata parquet (default: packaged)")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = WklsEngine(metadata_path=args.metadata)
+    names, rng = sample_names(engine, args.repeat)
+
+    start = time.perf_counter()
+    index = engine.search_index()
+    build_s = time.perf_counter() - start
+
+    results = {
+        "index_build_s": build_s,
+        "prefix_3": timed(index, [name[:3] for name in names]),
+        "exact": timed(index, names),
+        "misspelled": timed(index, [misspell(name, rng) for name in names]),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Report payload size and latency of each simplification tier for large countries.
+
+The full-resolution geometry is fetched once per country; each tier is then
+timed on first use (simplification) and again when served from the cache.
+
+Usage:
+    uv run python benchmarks/bench_simplify.py [--countries us ca ru br] [--format geojson]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+
+from wkls.engine import LEVELS_OF_DETAIL, WklsEngine
+
+TIERS = [("full", None)] + list(LEVELS_OF_DETAIL.items())
+
+
+def timed(fn, **kwargs):
+    start = time.perf_counter()
+    value = fn(**kwargs)
+    return value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--countries", nargs="+", default=["us", "ca", "ru", "br"])
+    parser.add_argument("--format", default="geojson", help="geometry format")
+    parser.add_argument("--precision", type=int, help="decimal places to keep")
+    parser.add_argument("--source", help="division_area location (default: S3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        engine = WklsEngine(geometry_source=args.source, cache_dir=cache_dir)
+        root = engine.root()
+        results = {}
+        for country in args.countries:
+            chain = getattr(root, country)
+            _, fetch_s = timed(chain.wkb)
+            method = getattr(chain, args.format)
+            tiers = {}
+            for name, tolerance in TIERS:
+                options = {"tolerance": tolerance, "precision": args.precision}
+                payload, first_s = timed(method, **options)
+                _, cached_s = timed(method, **options)
+                if isinstance(payload, str):
+                    payload = payload.encode()
+                tiers[name] = {
+                    "tolerance": tolerance,
+                    "bytes": len(payload),
+                    "first_s": first_s,
+                    "cached_s": cached_s,
+                }
+            results[country] = {"fetch_s": fetch_s, "tiers": tiers}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measure how long `import wkls` and `wkls.warmup()` take in a fresh interpreter.
+
+Usage:
+    uv run python benchmarks/bench_startup.py [--runs 10] [--warmup]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import wkls
+print(time.perf_counter() - start)
+"""
+
+WARMUP_SNIPPET = """
+import time
+import wkls
+start = time.perf_counter()
+wkls.warmup()
+print(time.perf_counter() - start)
+"""
+
+
+def time_snippet(snippet, runs):
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", snippet],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return {
+        "runs": runs,
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warmup", action="store_true", help="also time wkls.warmup()")
+    args = parser.parse_args()
+
+    results = {"import": time_snippet(IMPORT_SNIPPET, args.runs)}
+    if args.warmup:
+        results["warmup"] = time_snippet(WARMUP_SNIPPET, args.runs)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Compare per-worker memory and lookup latency of the metadata store and DuckDB table.
+
+Starts --workers processes for each backend, the way a pre-forking server
+starts its workers. Each worker builds its own engine, resolves a sample of
+place chains (uncached) and lists the regions of the sampled countries, then
+waits until every worker is loaded before reading its memory use, so that
+pages shared between workers are counted while they are shared. RSS counts
+shared pages in full in every worker; PSS (Linux only) splits them between
+the workers that map them.
+
+Usage:
+    uv run python benchmarks/bench_store.py [--metadata PATH] [--store PATH] \\
+        [--workers 4] [--chains 2000]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+import duckdb
+
+from wkls.engine import WklsEngine, packaged_metadata_path
+from wkls.store import write_store
+
+CHAINS_QUERY = """
+    SELECT lower(country), lower(split_part(region, '-', 2)), name
+    FROM '{metadata}'
+    WHERE subtype = 'locality' AND region IS NOT NULL AND name IS NOT NULL
+    USING SAMPLE reservoir({count} ROWS) REPEATABLE (42)
+"""
+
+
+def memory_mb():
+    """Return (rss, pss) of the calling process in MB; pss is None off Linux."""
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        kb = {name: int(fields[name].split()[0]) for name in ("Rss", "Pss")}
+        return kb["Rss"] / 1024, kb["Pss"] / 1024
+    except OSError:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in KB elsewhere
+        return maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), None
+
+
+def worker(metadata, store, chains, barrier, results):
+    engine = WklsEngine(
+        metadata_path=metadata, metadata_store=store, resolve_cache_size=0
+    )
+    root = engine.root()
+    timings = []
+    for chain in chains:
+        start = time.perf_counter()
+        engine.resolve(chain)
+        timings.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    for country in sorted({chain[0] for chain in chains}):
+        root[country].regions()
+    listing = time.perf_counter() - start
+    barrier.wait()
+    rss, pss = memory_mb()
+    results.put((rss, pss, timings, listing))
+    # Keep the mappings alive until every worker has measured
+    barrier.wait()
+
+
+def measure(metadata, store, chains, workers):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(metadata, store, chains, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    measured = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    rss = [m[0] for m in measured]
+    pss = [m[1] for m in measured if m[1] is not None]
+    timings = sorted(t for m in measured for t in m[2])
+    return {
+        "workers": workers,
+        "rss_mb_per_worker": statistics.mean(rss),
+        "rss_mb_total": sum(rss),
+        "pss_mb_per_worker": statistics.mean(pss) if pss else None,
+        "pss_mb_total": sum(pss) if pss else None,
+        "lookup_median_us": statistics.median(timings) * 1e6,
+        "lookup_p95_us": timings[int(len(timings) * 0.95)] * 1e6,
+        "regions_listing_s": statistics.mean(m[3] for m in measured),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--metadata", default=packaged_metadata_path())
+    parser.add_argument(
+        "--store", help="metadata store (default: built from --metadata)"
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chains", type=int, default=2000, help="chains to resolve")
+    args = parser.parse_args()
+
+    chains = [
+        list(row)
+        for row in duckdb.connect()
+        .execute(CHAINS_QUERY.format(metadata=args.metadata, count=args.chains))
+        .fetchall()
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = args.store
+        if not store:
+            store = os.path.join(tmp, "metadata.wklsmeta")
+            result = WklsEngine(metadata_path=args.metadata).sql("SELECT * FROM wkls")
+            write_store(store, [d[0] for d in result.description], result.fetchall())
+        results = {
+            "chains": len(chains),
+            "store_mb": os.path.getsize(store) / 1e6,
+            "duckdb": measure(args.metadata, None, chains, args.workers),
+            "store": measure(args.metadata, store, chains, args.workers),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
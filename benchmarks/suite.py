@@ -0,0 +1,395 @@
+"""Run the wkls benchmark suite offline against a synthetic division_area release.
+
+Covers cold and warm import, 1/2/3-level chain resolution, the listing
+methods, single (uncached and cached) and batch geometry fetches in every
+output format, and concurrent load. The synthetic release is a grid of
+countries, regions, counties and localities with circular boundaries, written
+to a temporary directory as a metadata parquet plus a division_area directory;
+nothing is read from S3.
+
+Results are written as JSON. Every benchmark reports median_us, which
+--compare uses to flag regressions between two runs.
+
+Usage:
+    uv run python benchmarks/suite.py [--output results.json] [--repeat 200] [--countries 20]
+    uv run python benchmarks/suite.py --compare baseline.json results.json [--threshold 0.1]
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+
+from wkls.core import GEOMETRY_FORMATS
+from wkls.engine import WklsEngine
+
+# Places per synthetic country
+REGIONS_PER_COUNTRY = 10
+COUNTIES_PER_REGION = 5
+LOCALITIES_PER_REGION = 20
+
+# Ids per call in the batch geometry benchmarks
+BATCH_SIZE = 100
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import wkls
+print(time.perf_counter() - start)
+"""
+
+FIRST_LOOKUP_SNIPPET = """
+import sys
+import time
+from wkls.engine import WklsEngine
+root = WklsEngine(metadata_path=sys.argv[1], geometry_source=sys.argv[2]).root()
+start = time.perf_counter()
+root["aa"]["r0"].resolve()
+print(time.perf_counter() - start)
+"""
+
+FIXTURE_QUERY = """
+    CREATE TABLE places AS
+    SELECT id, country, region, subtype, name, id || 'd' AS division_id,
+           ST_Buffer(ST_Point(x, y), r, {quad_segs}) AS geometry
+    FROM read_csv('{csv}', header = true, types = {{'id': 'VARCHAR', 'region': 'VARCHAR'}})
+"""
+
+
+def country_code(i):
+    return chr(65 + i // 26) + chr(65 + i % 26)
+
+
+def fixture_rows(countries):
+    """Yield (id, country, region, subtype, name, x, y, r) for the synthetic grid."""
+    n = 0
+    for c in range(countries):
+        country = country_code(c)
+        x0, y0 = -170 + (c % 17) * 20, -60 + (c // 17) * 20
+        n += 1
+        yield f"{n:032x}", country, "", "country", f"Country {country}", x0, y0, 9.0
+        for r in range(REGIONS_PER_COUNTRY):
+            region = f"{country}-R{r}"
+            x1, y1 = x0 - 8 + (r % 4) * 5, y0 - 8 + (r // 4) * 5
+            n += 1
+            yield f"{n:032x}", country, region, "region", f"Region {r}", x1, y1, 2.0
+            places = [("county", f"County {k}") for k in range(COUNTIES_PER_REGION)]
+            places += [("locality", f"Town {k}") for k in range(LOCALITIES_PER_REGION)]
+            for k, (subtype, name) in enumerate(places):
+                x2, y2 = x1 - 2 + (k % 5) * 0.8, y1 - 2 + (k // 5) * 0.8
+                n += 1
+                yield f"{n:032x}", country, region, subtype, name, x2, y2, 0.3
+
+
+def build_fixture(directory, countries, vertices, files=4):
+    """Write metadata.parquet and a division_area/ directory of `files` parquet files."""
+    csv_path = os.path.join(directory, "places.csv")
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "country", "region", "subtype", "name", "x", "y", "r"])
+        writer.writerows(fixture_rows(countries))
+
+    metadata = os.path.join(directory, "metadata.parquet")
+    source = os.path.join(directory, "division_area")
+    os.makedirs(source)
+    conn = duckdb.connect()
+    conn.execute("INSTALL spatial")
+    conn.load_extension("spatial")
+    conn.execute(FIXTURE_QUERY.format(csv=csv_path, quad_segs=max(1, vertices // 4)))
+    conn.execute(f"""
+        COPY (SELECT id, country, region, subtype, name, division_id FROM places)
+        TO '{metadata}' (FORMAT parquet)
+    """)
+    for k in range(files):
+        conn.execute(f"""
+            COPY (
+                SELECT id, country, region, subtype, {{'primary': name}} AS names,
+                       division_id, geometry,
+                       {{'xmin': ST_XMin(geometry), 'xmax': ST_XMax(geometry),
+                         'ymin': ST_YMin(geometry), 'ymax': ST_YMax(geometry)}} AS bbox
+                FROM places
+                WHERE hash(country) % {files} = {k}
+                ORDER BY id
+            ) TO '{source}/part-{k}.parquet' (FORMAT parquet, ROW_GROUP_SIZE 2048)
+        """)
+    rows = conn.execute("SELECT count(*) FROM places").fetchone()[0]
+    conn.close()
+    return metadata, source, rows
+
+
+def summarize(timings):
+    """Summarize per-call timings in seconds as microsecond statistics."""
+    timings = sorted(timings)
+    return {
+        "n": len(timings),
+        "median_us": statistics.median(timings) * 1e6,
+        "p95_us": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1e6,
+        "min_us": timings[0] * 1e6,
+        "mean_us": statistics.fmean(timings) * 1e6,
+    }
+
+
+def measure(fn, args_list, setup=None):
+    """Time fn(*args) for each args in args_list, running setup() untimed before each call."""
+    timings = []
+    for args in args_list:
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def time_snippet(snippet, args=(), env=None):
+    """Run a snippet in a fresh interpreter and return the seconds it printed."""
+    out = subprocess.run(
+        [sys.executable, "-c", snippet, *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def bench_import(results, runs, metadata, source):
+    with tempfile.TemporaryDirectory() as pycache:
+        # A fresh bytecode cache per run forces every module to be compiled
+        cold = [
+            time_snippet(
+                IMPORT_SNIPPET,
+                env=dict(os.environ, PYTHONPYCACHEPREFIX=os.path.join(pycache, str(i))),
+            )
+            for i in range(runs)
+        ]
+    results["import.cold"] = summarize(cold)
+    results["import.warm"] = summarize(
+        [time_snippet(IMPORT_SNIPPET) for _ in range(runs)]
+    )
+    results["import.first_lookup"] = summarize(
+        [time_snippet(FIRST_LOOKUP_SNIPPET, (metadata, source)) for _ in range(runs)]
+    )
+
+
+def sample_chains(engine, repeat, rng):
+    rows = engine.sql(
+        "SELECT country, region, name FROM wkls WHERE subtype = 'locality'"
+    ).fetchall()
+    chains = {1: [], 2: [], 3: []}
+    for _ in range(repeat):
+        country, region, name = rng.choice(rows)
+        suffix = region.split("-", 1)[1].lower()
+        chains[1].append([country.lower()])
+        chains[2].append([country.lower(), suffix])
+        chains[3].append([country.lower(), suffix, name.replace(" ", "").lower()])
+    return chains
+
+
+def bench_resolution(results, engine, repeat, rng):
+    root = engine.root()
+    chains = sample_chains(engine, repeat, rng)
+
+    def resolve(chain):
+        wkl = root
+        for part in chain:
+            wkl = wkl[part]
+        return wkl.resolve()
+
+    for level, level_chains in chains.items():
+        args = [(chain,) for chain in level_chains]
+        results[f"resolve.level{level}"] = measure(
+            resolve, args, setup=engine.resolve_cache_clear
+        )
+        results[f"resolve.level{level}.memoized"] = measure(resolve, args)
+
+    results["list.countries"] = measure(lambda: root.countries(), [()] * repeat)
+    results["list.regions"] = measure(
+        lambda chain: root[chain[0]].regions(), [(chain,) for chain in chains[1]]
+    )
+    results["list.counties"] = measure(
+        lambda chain: root[chain[0]][chain[1]].counties(),
+        [(chain,) for chain in chains[2]],
+    )
+    results["list.cities"] = measure(
+        lambda chain: root[chain[0]][chain[1]].cities(),
+        [(chain,) for chain in chains[2]],
+    )
+
+
+def bench_geometries(results, metadata, source, cache_dir, repeat, rng):
+    ids = [
+        row[0]
+        for row in duckdb.sql(
+            f"SELECT id FROM read_parquet('{metadata}') ORDER BY id"
+        ).fetchall()
+    ]
+    sample = [rng.choice(ids) for _ in range(repeat)]
+    batches = [rng.sample(ids, BATCH_SIZE) for _ in range(max(1, repeat // 10))]
+
+    uncached = WklsEngine(
+        metadata_path=metadata, geometry_source=source, cache_enabled=False
+    )
+    cached = WklsEngine(
+        metadata_path=metadata, geometry_source=source, cache_dir=cache_dir
+    )
+    uncached.warmup()
+    cached.warmup()
+    cached.fetch_wkb_many(sample)
+
+    for fmt, expr in GEOMETRY_FORMATS.items():
+        results[f"geometry.single.{fmt}"] = measure(
+            uncached.root()._get_geom_expr, [(expr, geom_id) for geom_id in sample]
+        )
+        results[f"geometry.cached.{fmt}"] = measure(
+            cached.root()._get_geom_expr, [(expr, geom_id) for geom_id in sample]
+        )
+        results[f"geometry.batch.{fmt}"] = measure(
+            lambda batch, fmt=fmt: uncached.root().geometries(batch, fmt=fmt),
+            [(batch,) for batch in batches],
+        )
+    return cached
+
+
+def bench_concurrency(results, engine, repeat, workers, rng):
+    """Mix resolutions and cached geometry fetches across a thread pool."""
+    root = engine.root()
+    chains = sample_chains(engine, repeat, rng)[3]
+    timings = []
+    lock = threading.Lock()
+
+    def call(chain):
+        start = time.perf_counter()
+        wkl = root
+        for part in chain:
+            wkl = wkl[part]
+        wkl.wkb()
+        with lock:
+            timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(call, chains))
+    elapsed = time.perf_counter() - start
+    summary = summarize(timings)
+    summary["workers"] = workers
+    summary["ops_per_s"] = len(chains) / elapsed
+    results[f"concurrent.{workers}"] = summary
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        metadata, source, rows = build_fixture(directory, args.countries, args.vertices)
+        fixture_s = time.perf_counter() - start
+
+        bench_import(results, args.import_runs, metadata, source)
+        cached = bench_geometries(
+            results,
+            metadata,
+            source,
+            os.path.join(directory, "cache"),
+            args.repeat,
+            rng,
+        )
+        bench_resolution(results, cached, args.repeat, rng)
+        bench_concurrency(results, cached, args.repeat, args.workers, rng)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "duckdb": duckdb.__version__,
+            "platform": platform.platform(),
+            "countries": args.countries,
+            "rows": rows,
+            "vertices": args.vertices,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "fixture_s": fixture_s,
+        },
+        "results": results,
+    }
+
+
+def compare(old_path, new_path, threshold):
+    """Print the median change of every benchmark; return the regressed names."""
+    with open(old_path) as f:
+        old = json.load(f)["results"]
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+
+    regressions = []
+    width = max(len(name) for name in new)
+    print(f"{'benchmark':<{width}}  {'old_us':>12}  {'new_us':>12}  {'change':>8}")
+    for name in sorted(set(old) & set(new)):
+        before, after = old[name]["median_us"], new[name]["median_us"]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  improved"
+        print(
+            f"{name:<{width}}  {before:>12.1f}  {after:>12.1f}  {change:>+8.1%}{flag}"
+        )
+    for name in sorted(set(old) ^ set(new)):
+        print(f"{name:<{width}}  only in {'old' if name in old else 'new'} run")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--output", help="write the results JSON here (default: stdout)"
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="calls per benchmark")
+    parser.add_argument("--import-runs", type=int, default=5)
+    parser.add_argument("--countries", type=int, default=20)
+    parser.add_argument(
+        "--vertices", type=int, default=256, help="vertices per boundary"
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="compare two results files instead of running the suite",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative median slowdown reported as a regression",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
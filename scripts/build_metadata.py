@@ -0,0 +1,110 @@
+"""Add bbox, representative point, area, digest and parent columns to the wkls metadata parquet.
+
+The columns are computed from a local copy (or an extract, see wkls extract)
+of division_area, so that spatial filters such as wkls.within_bbox() can be
+answered from metadata alone. The MD5 digest and byte size of each WKB
+geometry let wkls.changed_since() detect changed geometries without fetching
+them. Rows without a geometry in the source keep NULL values.
+
+With --divisions pointing at the division type of the same release, each
+row also gets the parent_division_id of its division, which wkls uses to
+navigate the hierarchy below localities (children(), ancestors() and chains
+deeper than three levels).
+
+Usage:
+    uv run python scripts/build_metadata.py \\
+        --source /data/overture/release/2025-05-21.0/theme=divisions/type=division_area \\
+        --divisions /data/overture/release/2025-05-21.0/theme=divisions/type=division \\
+        --output overture_zstd22.parquet && mv overture_zstd22.parquet wkls/data/
+"""
+
+import argparse
+import os
+
+import duckdb
+
+METADATA_QUERY = """
+    COPY (
+        WITH areas AS (
+            SELECT
+                id,
+                ST_XMin(geometry) AS xmin,
+                ST_YMin(geometry) AS ymin,
+                ST_XMax(geometry) AS xmax,
+                ST_YMax(geometry) AS ymax,
+                -- The centroid, unless it falls outside the division
+                CASE WHEN ST_Contains(geometry, ST_Centroid(geometry))
+                     THEN ST_Centroid(geometry)
+                     ELSE ST_PointOnSurface(geometry)
+                END AS point,
+                ST_Area_Spheroid(ST_FlipCoordinates(geometry)) AS area,
+                md5(ST_AsWKB(geometry)) AS geometry_hash,
+                octet_length(ST_AsWKB(geometry)) AS geometry_size
+            FROM read_parquet('{source}')
+            WHERE id IN (SELECT id FROM read_parquet('{metadata}'))
+        )
+        SELECT
+            m.id, m.country, m.region, m.subtype, m.name, m.division_id,
+            a.xmin, a.ymin, a.xmax, a.ymax,
+            ST_X(a.point) AS centroid_lon,
+            ST_Y(a.point) AS centroid_lat,
+            a.area,
+            a.geometry_hash,
+            a.geometry_size,
+            p.parent_division_id
+        FROM read_parquet('{metadata}') m
+        LEFT JOIN areas a ON a.id = m.id
+        LEFT JOIN {parents} p ON p.id = m.division_id
+    ) TO '{output}' (FORMAT parquet, COMPRESSION zstd, COMPRESSION_LEVEL 22)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--source",
+        required=True,
+        help="local division_area directory or parquet file",
+    )
+    parser.add_argument("--output", required=True, help="metadata parquet to write")
+    parser.add_argument(
+        "--metadata",
+        default=os.path.join("wkls", "data", "overture_zstd22.parquet"),
+        help="existing wkls metadata parquet providing the rows",
+    )
+    parser.add_argument(
+        "--divisions",
+        help="local division directory or parquet file providing parent links",
+    )
+    args = parser.parse_args()
+
+    source = args.source
+    if os.path.isdir(source):
+        source = os.path.join(source, "*")
+    if os.path.abspath(args.output) == os.path.abspath(args.metadata):
+        parser.error("--output must differ from --metadata; move the file afterwards")
+
+    if args.divisions:
+        divisions = args.divisions
+        if os.path.isdir(divisions):
+            divisions = os.path.join(divisions, "*")
+        parents = f"(SELECT id, parent_division_id FROM read_parquet('{divisions}'))"
+    else:
+        parents = "(SELECT NULL::VARCHAR AS id, NULL::VARCHAR AS parent_division_id)"
+
+    conn = duckdb.connect()
+    conn.execute("INSTALL spatial")
+    conn.load_extension("spatial")
+    count = conn.execute(
+        METADATA_QUERY.format(
+            source=source,
+            metadata=args.metadata,
+            output=args.output,
+            parents=parents,
+        )
+    ).fetchone()[0]
+    print(f"Wrote {count} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Build the memory-mapped metadata store from the wkls metadata parquet.
+
+The store holds the same rows as the metadata table in a compact,
+dictionary-encoded file that processes map instead of loading, so that
+workers serving wkls lookups share one copy in the page cache. Point
+$WKLS_METADATA_STORE (or WklsEngine(metadata_store=...)) at the output.
+
+Usage:
+    uv run python scripts/build_metadata_store.py \\
+        --output wkls/data/overture_zstd22.wklsmeta
+"""
+
+import argparse
+import os
+
+from wkls.engine import WklsEngine
+from wkls.store import write_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", required=True, help="store file to write")
+    parser.add_argument("--metadata", help="metadata parquet (default: packaged)")
+    args = parser.parse_args()
+
+    engine = WklsEngine(metadata_path=args.metadata)
+    result = engine.sql("SELECT * FROM wkls")
+    columns = [d[0] for d in result.description]
+    count = write_store(args.output, columns, result.fetchall())
+    size = os.path.getsize(args.output)
+    print(f"Wrote {count} rows ({size / 1e6:.1f} MB) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Build the id -> file/row group index of a local copy of division_area.
+
+The index lets wkls read a geometry by opening exactly one row group of one
+file instead of checking the footer of every division_area file. Only ids
+present in the wkls metadata table are indexed.
+
+Usage:
+    uv run python scripts/build_rowgroup_index.py \\
+        --source /data/overture/release/2025-05-21.0/theme=divisions/type=division_area \\
+        --output wkls/data/division_area_rowgroups-2025-05-21.0.parquet
+"""
+
+import argparse
+import os
+
+import duckdb
+
+INDEX_QUERY = """
+    COPY (
+        WITH row_groups AS (
+            SELECT DISTINCT file_name, row_group_id, row_group_num_rows
+            FROM parquet_metadata('{glob}')
+        ),
+        bounds AS (
+            SELECT
+                file_name,
+                row_group_id,
+                row_group_num_rows::BIGINT AS num_rows,
+                (
+                    SUM(row_group_num_rows) OVER (
+                        PARTITION BY file_name ORDER BY row_group_id
+                    ) - row_group_num_rows
+                )::BIGINT AS first_row
+            FROM row_groups
+        )
+        SELECT
+            a.id,
+            parse_filename(a.filename) AS file,
+            b.row_group_id AS row_group,
+            b.first_row,
+            b.num_rows
+        FROM read_parquet('{glob}', filename = true, file_row_number = true) a
+        JOIN bounds b
+          ON b.file_name = a.filename
+         AND a.file_row_number >= b.first_row
+         AND a.file_row_number < b.first_row + b.num_rows
+        WHERE a.id IN (SELECT id FROM read_parquet('{metadata}'))
+        ORDER BY a.id
+    ) TO '{output}' (FORMAT parquet, COMPRESSION zstd)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--source", required=True, help="local directory of division_area files"
+    )
+    parser.add_argument("--output", required=True, help="index parquet to write")
+    parser.add_argument(
+        "--metadata",
+        default=os.path.join("wkls", "data", "overture_zstd22.parquet"),
+        help="wkls metadata parquet whose ids should be indexed",
+    )
+    args = parser.parse_args()
+
+    glob = os.path.join(args.source, "*")
+    count = (
+        duckdb.connect()
+        .execute(
+            INDEX_QUERY.format(glob=glob, metadata=args.metadata, output=args.output)
+        )
+        .fetchone()[0]
+    )
+    print(f"Indexed {count} ids into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import os
+
+import duckdb
+import pytest
+
+# A tiny stand-in for the packaged metadata parquet
+METADATA_ROWS = [
+    ("us0", "US", None, "country", "United States", "us0d"),
+    ("de0", "DE", None, "country", "Germany", "de0d"),
+    ("usca", "US", "US-CA", "region", "California", "uscad"),
+    ("usny", "US", "US-NY", "region", "New York", "usnyd"),
+    ("debe", "DE", "DE-BE", "region", "Berlin", "debed"),
+    ("sfco", "US", "US-CA", "county", "San Francisco", "sfcod"),
+    ("sfci", "US", "US-CA", "locality", "San Francisco", "sfcid"),
+    ("laci", "US", "US-CA", "locality", "Los Angeles", "lacid"),
+    ("nyci", "US", "US-NY", "locality", "City of New York", "nycid"),
+    ("beci", "DE", "DE-BE", "locality", "Berlin", "becid"),
+]
+
+# San Francisco's neighborhoods, linked to their parents by parent_division_id
+NEIGHBORHOOD_ROWS = [
+    ("soma", "US", "US-CA", "macrohood", "South of Market", "somad", "sfcid"),
+    ("mission", "US", "US-CA", "neighborhood", "Mission District", "missiond", "sfcid"),
+    ("rincon", "US", "US-CA", "neighborhood", "Rincon Hill", "rincond", "somad"),
+]
+
+# Bounding boxes (xmin, ymin, xmax, ymax) of the synthetic division_area polygons
+BOXES = {
+    "us0": (-125.0, 24.0, -66.0, 50.0),
+    "de0": (5.0, 47.0, 15.0, 55.0),
+    "usca": (-125.0, 32.0, -114.0, 42.0),
+    "usny": (-80.0, 40.0, -72.0, 45.0),
+    "debe": (13.0, 52.0, 13.8, 52.7),
+    "sfco": (-123.0, 37.6, -122.3, 37.9),
+    "sfci": (-122.6, 37.7, -122.35, 37.85),
+    "laci": (-118.7, 33.7, -118.1, 34.3),
+    "nyci": (-74.3, 40.5, -73.7, 40.9),
+    "beci": (13.1, 52.35, 13.75, 52.65),
+}
+
+
+def box_wkt(xmin, ymin, xmax, ymax):
+    return (
+        f"POLYGON (({xmin} {ymin}, {xmax} {ymin}, {xmax} {ymax}, "
+        f"{xmin} {ymax}, {xmin} {ymin}))"
+    )
+
+
+@pytest.fixture(scope="session")
+def metadata_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("metadata") / "metadata.parquet"
+    conn = duckdb.connect()
+    conn.execute(
+        "CREATE TABLE m (id VARCHAR, country VARCHAR, region VARCHAR, "
+        "subtype VARCHAR, name VARCHAR, division_id VARCHAR)"
+    )
+    conn.executemany("INSERT INTO m VALUES (?, ?, ?, ?, ?, ?)", METADATA_ROWS)
+    conn.execute(f"COPY m TO '{path}' (FORMAT parquet)")
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def spatial_metadata_path(tmp_path_factory):
+    """The synthetic metadata with bbox, centroid and area columns filled in."""
+    path = tmp_path_factory.mktemp("metadata") / "spatial_metadata.parquet"
+    conn = duckdb.connect()
+    conn.execute(
+        "CREATE TABLE m (id VARCHAR, country VARCHAR, region VARCHAR, "
+        "subtype VARCHAR, name VARCHAR, division_id VARCHAR, "
+        "xmin DOUBLE, ymin DOUBLE, xmax DOUBLE, ymax DOUBLE, "
+        "centroid_lon DOUBLE, centroid_lat DOUBLE, area DOUBLE)"
+    )
+    for row in METADATA_ROWS:
+        xmin, ymin, xmax, ymax = BOXES[row[0]]
+        centroid = ((xmin + xmax) / 2, (ymin + ymax) / 2)
+        area = (xmax - xmin) * (ymax - ymin) * 1e10
+        conn.execute(
+            "INSERT INTO m VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            row + (xmin, ymin, xmax, ymax) + centroid + (area,),
+        )
+    conn.execute(f"COPY m TO '{path}' (FORMAT parquet)")
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def engine(metadata_path, tmp_path):
+    from wkls.engine import WklsEngine
+
+    return WklsEngine(metadata_path=metadata_path, cache_dir=str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def linked_engine(tmp_path):
+    """An engine whose metadata carries parent links down to neighborhoods."""
+    from wkls.engine import WklsEngine
+
+    parents = {
+        "usca": "us0d",
+        "usny": "us0d",
+        "debe": "de0d",
+        "sfco": "uscad",
+        "sfci": "sfcod",
+        "laci": "uscad",
+        "nyci": "usnyd",
+        "beci": "debed",
+    }
+    path = tmp_path / "linked_metadata.parquet"
+    conn = duckdb.connect()
+    conn.execute(
+        "CREATE TABLE m (id VARCHAR, country VARCHAR, region VARCHAR, "
+        "subtype VARCHAR, name VARCHAR, division_id VARCHAR, "
+        "parent_division_id VARCHAR)"
+    )
+    rows = [row + (parents.get(row[0]),) for row in METADATA_ROWS]
+    conn.executemany("INSERT INTO m VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.executemany("INSERT INTO m VALUES (?, ?, ?, ?, ?, ?, ?)", NEIGHBORHOOD_ROWS)
+    conn.execute(f"COPY m TO '{path}' (FORMAT parquet)")
+    conn.close()
+    return WklsEngine(metadata_path=str(path), cache_dir=str(tmp_path / "cache"))
+
+
+@pytest.fixture(scope="session")
+def division_area_dir(tmp_path_factory):
+    """A synthetic local division_area release split over two parquet files."""
+    conn = duckdb.connect()
+    try:
+        conn.execute("INSTALL spatial")
+        conn.load_extension("spatial")
+    except duckdb.Error as e:
+        # Set WKLS_REQUIRE_SPATIAL where the extension must be available (CI)
+        if os.environ.get("WKLS_REQUIRE_SPATIAL"):
+            raise
+        pytest.skip(
+            f"DuckDB spatial extension is not available: {str(e).splitlines()[0]}"
+        )
+    directory = tmp_path_factory.mktemp("division_area")
+    conn.execute(
+        "CREATE TABLE da (id VARCHAR, country VARCHAR, region VARCHAR, "
+        "subtype VARCHAR, geometry GEOMETRY, "
+        "bbox STRUCT(xmin DOUBLE, xmax DOUBLE, ymin DOUBLE, ymax DOUBLE))"
+    )
+    for geom_id, country, region, subtype, _, _ in METADATA_ROWS:
+        xmin, ymin, xmax, ymax = BOXES[geom_id]
+        conn.execute(
+            "INSERT INTO da VALUES (?, ?, ?, ?, ST_GeomFromText(?), "
+            "{'xmin': ?, 'xmax': ?, 'ymin': ?, 'ymax': ?})",
+            (geom_id, country, region, subtype, box_wkt(xmin, ymin, xmax, ymax))
+            + (xmin, xmax, ymin, ymax),
+        )
+    for i, country in enumerate(["US", "DE"]):
+        conn.execute(
+            f"COPY (SELECT * FROM da WHERE country = '{country}') "
+            f"TO '{directory}/part-{i}.parquet' (FORMAT parquet)"
+        )
+    conn.close()
+    return str(directory)
+
+
+@pytest.fixture
+def local_engine(metadata_path, division_area_dir, tmp_path):
+    from wkls.engine import WklsEngine
+
+    return WklsEngine(
+        metadata_path=metadata_path,
+        geometry_source=division_area_dir,
+        cache_dir=str(tmp_path / "cache"),
+    )
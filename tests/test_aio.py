@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from wkls.aio import AsyncExecutor
+
+
+def test_call_shared_coalesces_requests():
+    """Test that concurrent callers of the same key share one call."""
+    executor = AsyncExecutor(max_workers=4)
+    calls = []
+    lock = threading.Lock()
+
+    def fetch(geom_id):
+        with lock:
+            calls.append(geom_id)
+        time.sleep(0.1)
+        return f"geometry of {geom_id}"
+
+    async def main():
+        return await asyncio.gather(
+            *[executor.call_shared(("wkt", "a"), fetch, "a") for _ in range(10)],
+            executor.call_shared(("wkt", "b"), fetch, "b"),
+        )
+
+    results = asyncio.run(main())
+    assert results == ["geometry of a"] * 10 + ["geometry of b"]
+    assert sorted(calls) == ["a", "b"]
+    executor.shutdown()
+
+
+def test_timeout_does_not_cancel_shared_call():
+    """Test that a caller timing out leaves the shared call running for others."""
+    executor = AsyncExecutor(max_workers=2)
+
+    def fetch():
+        time.sleep(0.2)
+        return "done"
+
+    async def main():
+        impatient = asyncio.wait_for(executor.call_shared("k", fetch), 0.01)
+        patient = executor.call_shared("k", fetch)
+        return await asyncio.gather(impatient, patient, return_exceptions=True)
+
+    impatient, patient = asyncio.run(main())
+    assert isinstance(impatient, asyncio.TimeoutError)
+    assert patient == "done"
+    executor.shutdown()
+
+
+def test_async_listing_methods(engine):
+    """Test the coroutine variants of the listing methods."""
+    root = engine.root()
+
+    async def main():
+        return await asyncio.gather(
+            root.acountries(), root.us.ca.acities(), root.us.aregions()
+        )
+
+    countries, cities, regions = asyncio.run(main())
+    assert len(countries) == 2
+    assert sorted(cities["name"]) == ["Los Angeles", "San Francisco"]
+    assert len(regions) == 2
+
+
+def test_aget_errors(engine):
+    """Test that aget() reports unknown places and bad arguments."""
+    root = engine.root()
+    with pytest.raises(ValueError, match="Unknown geometry format"):
+        asyncio.run(root.aget("us.ca.sanfrancisco", "png"))
+    with pytest.raises(ValueError, match="No result found for: us.ca.nowhere"):
+        asyncio.run(root.aget("us.ca.nowhere"))
+
+
+def test_async_geometry(local_engine):
+    """Test the coroutine geometry variants against a local geometry source."""
+    root = local_engine.root()
+
+    async def main():
+        return await asyncio.gather(
+            root.aget("us.ca.losangeles"),
+            root.aget(["us", "ca", "losangeles"], "wkt", timeout=30),
+            root.us.ca.losangeles.awkt(),
+        )
+
+    results = asyncio.run(main())
+    assert results[0].startswith("POLYGON ((-118.7 33.7")
+    assert results[0] == results[1] == results[2]
@@ -0,0 +1,120 @@
+import sqlite3
+import time
+
+import pytest
+
+from wkls.cache import GeometryCache, NegativeCache
+from wkls.engine import WklsEngine
+
+
+def test_put_and_get(tmp_path):
+    """Test that cached WKB round-trips through the on-disk cache."""
+    cache = GeometryCache("v1", directory=str(tmp_path))
+    assert cache.get("abc") is None
+
+    cache.put("abc", b"\x01\x02\x03")
+    assert cache.get("abc") == b"\x01\x02\x03"
+    assert cache.size() == 3
+
+    # A second cache object over the same directory sees the entry
+    other = GeometryCache("v1", directory=str(tmp_path))
+    assert other.get("abc") == b"\x01\x02\x03"
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used entries are evicted first."""
+    cache = GeometryCache("v1", directory=str(tmp_path), max_bytes=25)
+    cache.put("a", b"a" * 10)
+    cache.put("b", b"b" * 10)
+    # Touch "a" so that "b" becomes the least recently used entry
+    assert cache.get("a") is not None
+    cache.put("c", b"c" * 10)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.size() <= 25
+
+    # Entries larger than the whole cache are never stored
+    cache.put("huge", b"x" * 100)
+    assert cache.get("huge") is None
+
+
+def test_hits_are_read_only(tmp_path):
+    """Test that hits don't wait on writers and that the tracked size stays exact."""
+    cache = GeometryCache("v1", directory=str(tmp_path), max_bytes=25)
+    cache.put("a", b"a" * 10)
+    cache.put("a", b"a" * 5)
+    cache.put("b", b"b" * 10)
+    # Evicts "a", the least recently used entry
+    cache.put("c", b"c" * 11)
+
+    writer = sqlite3.connect(cache.path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert cache.get("c") == b"c" * 11
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    conn = sqlite3.connect(cache.path)
+    (total,) = conn.execute(
+        "SELECT value FROM meta WHERE key = 'total_size'"
+    ).fetchone()
+    (actual,) = conn.execute("SELECT SUM(size) FROM geometries").fetchone()
+    conn.close()
+    assert total == actual == cache.size() == 21
+
+
+def test_unusable_cache_dir(metadata_path, tmp_path, monkeypatch):
+    """Test that an unwritable or corrupt cache warns once and is bypassed."""
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setenv("WKLS_CACHE_DIR", str(blocker / "wkls"))
+    engine = WklsEngine(metadata_path=metadata_path)
+    monkeypatch.setattr(
+        engine, "_scan_wkb", lambda ids: [(geom_id, b"wkb") for geom_id in ids]
+    )
+    with pytest.warns(RuntimeWarning, match="geometries are fetched without it"):
+        assert engine.geometry_cache() is None
+    assert engine.fetch_wkb_many(["sfci"]) == {"sfci": b"wkb"}
+
+    corrupt = tmp_path / "corrupt"
+    corrupt.mkdir()
+    (corrupt / "geometries.sqlite").write_bytes(b"not a database" * 100)
+    with pytest.warns(RuntimeWarning, match="cannot be used"):
+        cache = GeometryCache("v1", directory=str(corrupt))
+    assert cache.get("abc") is None
+    cache.put("abc", b"wkb")
+
+
+def test_version_namespaces(tmp_path):
+    """Test that each version only sees its own entries in a shared cache file."""
+    old = GeometryCache("v1", directory=str(tmp_path))
+    old.put("abc", b"old")
+
+    new = GeometryCache("v2", directory=str(tmp_path))
+    assert new.get("abc") is None
+    assert new.size() == 0
+
+    new.put("abc", b"new")
+    assert old.get("abc") == b"old"
+    new.clear()
+    assert old.get("abc") == b"old"
+
+
+def test_negative_cache_expiry(monkeypatch):
+    """Test that remembered misses expire after the ttl and are bounded."""
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    misses = NegativeCache(ttl=10, max_entries=2)
+    misses.add("a")
+    assert "a" in misses
+    now[0] += 11
+    assert "a" not in misses
+
+    misses.add("a")
+    misses.add("b")
+    misses.add("c")
+    assert "a" not in misses
+    assert "b" in misses and "c" in misses
@@ -0,0 +1,99 @@
+import hashlib
+
+import duckdb
+import pytest
+
+from wkls.engine import WklsEngine
+
+from .conftest import METADATA_ROWS
+
+
+def fake_wkb(geom_id):
+    return f"wkb-{geom_id}".encode()
+
+
+@pytest.fixture
+def digest_engine(tmp_path):
+    """An engine whose metadata carries the digests of fake_wkb() geometries."""
+    path = tmp_path / "digest_metadata.parquet"
+    conn = duckdb.connect()
+    conn.execute(
+        "CREATE TABLE m (id VARCHAR, country VARCHAR, region VARCHAR, "
+        "subtype VARCHAR, name VARCHAR, division_id VARCHAR, "
+        "geometry_hash VARCHAR, geometry_size BIGINT)"
+    )
+    for row in METADATA_ROWS:
+        wkb = fake_wkb(row[0])
+        conn.execute(
+            "INSERT INTO m VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            row + (hashlib.md5(wkb).hexdigest(), len(wkb)),
+        )
+    conn.execute(f"COPY m TO '{path}' (FORMAT parquet)")
+    conn.close()
+    return WklsEngine(metadata_path=str(path), cache_dir=str(tmp_path / "cache"))
+
+
+def test_geometry_hash_from_metadata(digest_engine, monkeypatch):
+    """Test that digests stored with the metadata are returned without any scan."""
+    monkeypatch.setattr(digest_engine, "_scan_wkb", pytest.fail)
+    root = digest_engine.root()
+    wkb = fake_wkb("laci")
+    assert root.us.ca.losangeles.geometry_hash() == hashlib.md5(wkb).hexdigest()
+    assert root.us.ca.losangeles.geometry_size() == len(wkb)
+    assert root.de.geometry_hash() == hashlib.md5(fake_wkb("de0")).hexdigest()
+    assert digest_engine.geometry_hashes(country="de") == {
+        geom_id: hashlib.md5(fake_wkb(geom_id)).hexdigest()
+        for geom_id in ("de0", "debe", "beci")
+    }
+
+
+def test_changed_since(digest_engine, monkeypatch):
+    """Test that only changed and removed geometries are reported."""
+    scans = []
+
+    def scan(ids, expr):
+        scans.append(list(ids))
+        return []
+
+    monkeypatch.setattr(digest_engine, "_scan_wkb", scan)
+    hashes = {
+        geom_id: hashlib.md5(fake_wkb(geom_id)).hexdigest()
+        for geom_id in ("us0", "usca", "laci")
+    }
+    hashes["usca"] = "0" * 32
+    hashes["gone"] = "1" * 32
+
+    df = digest_engine.root().changed_since(hashes)
+    assert list(df["id"]) == ["usca", "gone"]
+    assert list(df["change"]) == ["changed", "removed"]
+    assert df["geometry_hash"][0] == hashlib.md5(fake_wkb("usca")).hexdigest()
+    assert df["geometry_size"][0] == len(fake_wkb("usca"))
+    # Only the id missing from the metadata went to the geometry source
+    assert scans == [["gone"]]
+
+    with pytest.raises(AttributeError, match="only available at the root level"):
+        digest_engine.root().us.changed_since(hashes)
+
+
+def test_digests_from_cache_and_scan(engine, monkeypatch):
+    """Test that digests are derived from cached WKB or scanned once and cached."""
+    scans = []
+
+    def scan(ids, expr):
+        scans.append(list(ids))
+        return [(geom_id, "f" * 32, 42) for geom_id in ids]
+
+    monkeypatch.setattr(engine, "_scan_wkb", scan)
+    engine.geometry_cache().put("laci", b"cached wkb")
+
+    root = engine.root()
+    expected = hashlib.md5(b"cached wkb").hexdigest()
+    assert root.us.ca.losangeles.geometry_hash() == expected
+    assert scans == []
+
+    assert engine.geometry_digests(["sfci", "laci"]) == {
+        "sfci": ("f" * 32, 42),
+        "laci": (expected, len(b"cached wkb")),
+    }
+    assert engine.geometry_digests(["sfci"]) == {"sfci": ("f" * 32, 42)}
+    assert scans == [["sfci"]]
@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+
+from wkls.core import Wkl
+
+CHAINS = [
+    ["us"],
+    ["de"],
+    ["us", "ca"],
+    ["us", "ny"],
+    ["de", "be"],
+    ["us", "ca", "sanfrancisco"],
+    ["us", "ca", "losangeles"],
+    ["us", "ny", "cityofnewyork"],
+    ["de", "be", "berlin"],
+    ["us", "ca", "nowhere"],
+]
+
+
+def test_engine_uses_own_connection(engine):
+    """Test that the engine does not create tables on DuckDB's default connection."""
+    root = engine.root()
+    assert len(root.countries()) == 2
+    assert len(root.us.regions()) == 2
+
+    tables = duckdb.sql(
+        "SELECT count(*) FROM duckdb_tables() WHERE table_name = 'wkls'"
+    ).fetchone()[0]
+    assert tables == 0
+
+
+def test_chained_objects_keep_engine(engine):
+    """Test that chaining from an engine's root stays on that engine."""
+    sf = engine.root().us.ca.sanfrancisco
+    assert sf._engine is engine
+    assert sorted(sf["subtype"]) == ["county", "locality"]
+    assert len(engine.root().us.ca.cities()) == 2
+
+
+def test_concurrent_lookups(engine):
+    """Stress test: lookups from many threads return the same rows as sequential ones."""
+    expected = {
+        tuple(chain): Wkl(chain, engine).resolve()["id"].tolist() for chain in CHAINS
+    }
+
+    def lookup(i):
+        chain = CHAINS[i % len(CHAINS)]
+        return tuple(chain), Wkl(chain, engine).resolve()["id"].tolist()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lookup, range(2000)))
+
+    for chain, ids in results:
+        assert ids == expected[chain]
+
+
+def test_resolution_is_memoized(engine):
+    """Test that equivalent chains share one cached resolution."""
+    root = engine.root()
+    engine.resolve_cache_clear()
+
+    first = Wkl(["us", "ca", "sanfrancisco"], engine).resolve()
+    second = Wkl(["US", "CA", "San Francisco"], engine).resolve()
+    assert first.equals(second)
+
+    info = root.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+    root.cache_clear()
+    assert root.cache_info().currsize == 0
+
+
+def test_negative_chain_cache(engine):
+    """Test that chains that did not resolve are answered from the negative cache."""
+    engine.resolve_cache_clear()
+    root = engine.root()
+    assert len(root.us.ca.nowhere) == 0
+    assert len(root.us.ca.nowhere) == 0
+    assert engine.fetch_info().negative_hits >= 1
+
+    engine.resolve_cache_clear()
+    before = engine.fetch_info().negative_hits
+    assert len(root.us.ca.nowhere) == 0
+    assert engine.fetch_info().negative_hits == before
+
+
+def test_concurrent_fetches_are_coalesced(engine, monkeypatch):
+    """Test that threads asking for the same ids share a single scan."""
+    scans = []
+    started = threading.Event()
+
+    def slow_scan(ids):
+        scans.append(list(ids))
+        started.set()
+        time.sleep(0.2)
+        return [(geom_id, b"wkb") for geom_id in ids if geom_id != "missing"]
+
+    monkeypatch.setattr(engine, "_scan_wkb", slow_scan)
+    engine.configure_cache(enabled=False)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(engine.fetch_wkb_many, ["a", "missing"])
+        started.wait()
+        followers = [
+            pool.submit(engine.fetch_wkb_many, ["a", "missing"]) for _ in range(3)
+        ]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert scans == [["a", "missing"]]
+    assert all(r == {"a": b"wkb"} for r in results)
+    assert engine.fetch_info().coalesced == 6
+
+    # The missing id is now remembered and not scanned again
+    assert engine.fetch_wkb_many(["missing"]) == {}
+    assert len(scans) == 1
+    assert engine.fetch_info().negative_hits >= 1
+
+
+def test_geometries_accepts_a_generator(engine, monkeypatch):
+    """Test that bulk lookups read every item of a one-shot iterable."""
+    monkeypatch.setattr(
+        engine,
+        "_scan_wkb",
+        lambda ids: [(geom_id, f"wkb-{geom_id}".encode()) for geom_id in ids],
+    )
+    items = (item for item in ["us.ca.losangeles", "sfci", "us.ca.nowhere"])
+    df = engine.root().geometries(items)
+    assert list(df["id"][:2]) == ["laci", "sfci"]
+    assert list(df["geometry"][:2]) == [b"wkb-laci", b"wkb-sfci"]
+    assert df["error"][2] == "No result found for: us.ca.nowhere"
@@ -84,11 +84,22 @@ def test_subtypes_chaining_error():
     assert "wkls.subtypes()" in str(exc_info.value)
 
 
-def test_too_many_chained_attributes():
-    """Test that too many chained attributes raise an error."""
-    with pytest.raises(ValueError) as exc_info:
-        wkls.us.ca.sanfrancisco.somethingelse
-    assert "Too many chained attributes (max = 3)" in str(exc_info.value)
+def test_deeper_chain_without_match():
+    """Test that a level below a place without a matching descendant is empty."""
+    result = wkls.us.ca.sanfrancisco.somethingelse
+    assert len(result) == 0
+    with pytest.raises(ValueError, match="No result found"):
+        result.wkt()
+
+
+def test_deeper_chain(linked_engine):
+    """Test that chains below a place resolve through the division hierarchy."""
+    root = linked_engine.root()
+    mission = root.us.ca.sanfrancisco.missiondistrict
+    assert list(mission["id"]) == ["mission"]
+    assert list(mission["subtype"]) == ["neighborhood"]
+    rincon = root["us"]["ca"]["sanfrancisco"]["southofmarket"]["rinconhill"].resolve()
+    assert list(rincon["id"]) == ["rincon"]
 
 
 def test_nonexistent_location_errors():
@@ -150,7 +161,7 @@ if __name__ == "__main__":
     test_counties_chaining_errors()
     test_cities_chaining_errors()
     test_subtypes_chaining_error()
-    test_too_many_chained_attributes()
+    test_deeper_chain_without_match()
     test_nonexistent_location_errors()
     test_geometry_methods_on_empty_results()
     test_chainable_dataframe_error_propagation()
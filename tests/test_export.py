@@ -0,0 +1,56 @@
+import json
+
+import duckdb
+import pytest
+
+from wkls.cli import main
+from wkls.export import export_format
+
+
+def test_export_format_inference():
+    """Test that the export format follows the file extension unless given."""
+    assert export_format("out.parquet") == "parquet"
+    assert export_format("out.FGB") == "flatgeobuf"
+    assert export_format("out.ndjson") == "geojsonseq"
+    assert export_format("out.bin", "parquet") == "parquet"
+    with pytest.raises(ValueError, match="Cannot infer"):
+        export_format("out.bin")
+    with pytest.raises(ValueError, match="Unknown export format"):
+        export_format("out.parquet", "shapefile")
+
+
+def test_export_region_to_geoparquet(local_engine, tmp_path):
+    """Test that a region's divisions are exported with their geometries."""
+    output = str(tmp_path / "ca.parquet")
+    reports = []
+    count = local_engine.root().us.ca.export(
+        output, subtypes=["locality"], progress=reports.append
+    )
+    assert count == 2
+    rows = duckdb.sql(f"SELECT id, name FROM '{output}' ORDER BY id").fetchall()
+    assert rows == [("laci", "Los Angeles"), ("sfci", "San Francisco")]
+    assert reports[-1] == 100.0
+
+
+def test_export_country_to_geojsonseq(local_engine, tmp_path):
+    """Test newline-delimited GeoJSON output for a whole country."""
+    output = tmp_path / "de.ndjson"
+    assert local_engine.root().de.export(str(output)) == 3
+    features = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(f["properties"]["id"] for f in features) == ["beci", "de0", "debe"]
+    assert all(f["geometry"]["type"] == "Polygon" for f in features)
+
+
+def test_export_requires_chain(engine, tmp_path):
+    """Test that the root object cannot export everything at once."""
+    with pytest.raises(ValueError, match="requires a chain"):
+        engine.root().export(str(tmp_path / "all.parquet"))
+
+
+def test_export_cli(metadata_path, division_area_dir, tmp_path):
+    """Test the `wkls export` command line entry point."""
+    output = tmp_path / "us.fgb"
+    args = ["export", "us", "-o", str(output), "--subtypes", "county,locality"]
+    args += ["--source", division_area_dir, "--metadata", metadata_path, "-q"]
+    assert main(args) == 0
+    assert output.stat().st_size > 0
@@ -0,0 +1,62 @@
+import pytest
+
+from wkls.hierarchy import Hierarchy
+
+
+def test_fallback_hierarchy(engine):
+    """Test that without parent links places hang off their region and country."""
+    root = engine.root()
+    assert sorted(root.us.children()["id"]) == ["usca", "usny"]
+    assert sorted(root.us.ca.children("locality")["id"]) == ["laci", "sfci"]
+    assert list(root.de.be.berlin.parents()["id"]) == ["debe"]
+    assert list(root.de.be.berlin.ancestors()["id"]) == ["debe", "de0"]
+    assert list(root.us.descendants()["id"])[:2] == ["usca", "usny"]
+    assert len(root.us.descendants()) == 6
+    assert list(root.us.ca.counties()["id"]) == ["sfco"]
+    assert list(root.us.ca.cities()["id"]) == ["sfci", "laci"]
+
+
+def test_parent_links(linked_engine):
+    """Test that parent_division_id links are followed below localities."""
+    root = linked_engine.root()
+    assert list(root.us.ca.losangeles.parents()["id"]) == ["usca"]
+    # sanfrancisco matches both the county and the locality inside it
+    assert sorted(root.us.ca.sanfrancisco.children()["id"]) == [
+        "mission",
+        "sfci",
+        "soma",
+    ]
+    assert list(root.us.ca.sanfrancisco.descendants("neighborhood")["id"]) == [
+        "mission",
+        "rincon",
+    ]
+
+    rincon = root.us.ca.sanfrancisco.rinconhill
+    assert list(rincon["id"]) == ["rincon"]
+    assert list(rincon.ancestors()["id"]) == ["soma", "sfci", "sfco", "usca", "us0"]
+    assert list(root.us.ca.sanfrancisco.southofmarket.rinconhill["id"]) == ["rincon"]
+    assert len(root.us.ca.sanfrancisco.nowhere) == 0
+
+
+def test_navigation_errors(engine):
+    """Test that navigation needs a chain that resolves."""
+    with pytest.raises(ValueError, match="needs a chain"):
+        engine.root().children()
+    with pytest.raises(ValueError, match="No result found"):
+        engine.root().zz.children()
+
+
+def test_walks_stay_in_subtree():
+    """Test that descendant walks only visit the subtree."""
+    columns = ["id", "country", "region", "subtype", "name", "division_id"]
+    rows = [("c", "XX", None, "country", "X", "c")]
+    rows += [(f"r{i}", "XX", f"XX-{i}", "region", f"R{i}", f"r{i}") for i in range(3)]
+    rows += [
+        (f"p{i}{j}", "XX", f"XX-{i}", "locality", f"P{j}", f"p{i}{j}")
+        for i in range(3)
+        for j in range(100)
+    ]
+    hierarchy = Hierarchy(columns, rows)
+    assert len(hierarchy.descendant_divisions(["r1"])) == 100
+    assert hierarchy.find_descendants(["c"], "p7") == ["p07", "p17", "p27"]
+    assert hierarchy.ancestor_divisions(["p15"]) == ["r1", "c"]
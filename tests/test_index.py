@@ -0,0 +1,98 @@
+import duckdb
+import pytest
+
+from wkls.core import CITY_QUERY, COUNTRY_QUERY, REGION_QUERY, Wkl
+from wkls.engine import WklsEngine
+from wkls.index import normalize_name
+
+from .conftest import METADATA_ROWS
+
+# Names whose lowercase forms depend on how case is mapped
+UNICODE_ROWS = [
+    ("stci", "DE", "DE-BE", "locality", "Straße", "stcid"),
+    ("isci", "TR", "TR-34", "locality", "İstanbul", "iscid"),
+    ("odci", "GR", "GR-I", "locality", "ΟΔΟΣ", "odcid"),
+]
+
+
+def sql_lookup(engine, chain):
+    country_iso = chain[0].upper()
+    if len(chain) == 1:
+        return engine.sql(COUNTRY_QUERY, (country_iso,)).fetchall()
+    region_iso = country_iso + "-" + chain[1].upper()
+    if len(chain) == 2:
+        return engine.sql(REGION_QUERY, (country_iso, region_iso)).fetchall()
+    return engine.sql(CITY_QUERY, (country_iso, region_iso, chain[2])).fetchall()
+
+
+@pytest.mark.parametrize(
+    "chain",
+    [
+        ["us"],
+        ["US"],
+        ["zz"],
+        ["us", "ca"],
+        ["us", "zz"],
+        ["us", "ca", "sanfrancisco"],
+        ["us", "ca", "San Francisco"],
+        ["us", "ca", "LOSANGELES"],
+        ["us", "ny", "cityofnewyork"],
+        ["de", "be", "berlin"],
+        ["us", "ca", "nowhere"],
+    ],
+)
+def test_index_matches_sql(engine, chain):
+    """Test that index lookups return the same rows as the SQL queries."""
+    assert engine.index().lookup(chain) == sql_lookup(engine, chain)
+
+
+@pytest.fixture
+def unicode_engine(tmp_path):
+    """An engine whose metadata has names with special case mappings."""
+    path = tmp_path / "unicode_metadata.parquet"
+    conn = duckdb.connect()
+    conn.execute(
+        "CREATE TABLE m (id VARCHAR, country VARCHAR, region VARCHAR, "
+        "subtype VARCHAR, name VARCHAR, division_id VARCHAR)"
+    )
+    conn.executemany(
+        "INSERT INTO m VALUES (?, ?, ?, ?, ?, ?)", METADATA_ROWS + UNICODE_ROWS
+    )
+    conn.execute(f"COPY m TO '{path}' (FORMAT parquet)")
+    conn.close()
+    return WklsEngine(metadata_path=str(path), cache_dir=str(tmp_path / "cache"))
+
+
+@pytest.mark.parametrize(
+    ("chain", "found"),
+    [
+        (["de", "be", "straße"], True),
+        (["de", "be", "STRAẞE"], True),
+        (["de", "be", "strasse"], False),
+        (["tr", "34", "istanbul"], True),
+        (["tr", "34", "İSTANBUL"], True),
+        (["tr", "34", "i̇stanbul"], False),
+        (["gr", "i", "οδοσ"], True),
+        (["gr", "i", "οδος"], False),
+    ],
+)
+def test_index_matches_sql_for_non_ascii_names(unicode_engine, chain, found):
+    """Test that non-ASCII names match in the index exactly when ILIKE matches."""
+    rows = unicode_engine.index().lookup(chain)
+    assert rows == sql_lookup(unicode_engine, chain)
+    assert bool(rows) == found
+
+
+def test_wildcards_fall_back_to_sql(engine):
+    """Test that LIKE patterns are not answered from the index."""
+    assert engine.index().lookup(["us", "ca", "%sanfran%"]) is None
+    result = Wkl(["us", "ca", "%sanfran%"], engine).resolve()
+    assert sorted(result["id"]) == ["sfci", "sfco"]
+
+
+def test_normalize_name():
+    assert normalize_name("San Francisco") == "sanfrancisco"
+    assert normalize_name("City of New York") == "cityofnewyork"
+    assert normalize_name("Straße") == "straße"
+    assert normalize_name("İstanbul") == "istanbul"
+    assert normalize_name("ΟΔΟΣ") == "οδοσ"
@@ -0,0 +1,69 @@
+import duckdb
+import pandas as pd
+import pytest
+
+from wkls.join import spatial_join
+
+from .conftest import BOXES, box_wkt
+
+POINTS = pd.DataFrame(
+    {
+        "event": ["sf", "la", "ocean", "berlin"],
+        "lon": [-122.45, -118.4, 0.0, 13.4],
+        "lat": [37.77, 34.0, 0.0, 52.5],
+    }
+)
+
+
+def test_spatial_join_points(local_engine, monkeypatch):
+    """Test that points are tagged with the locality containing them, in one fetch."""
+    fetched = []
+    fetch_wkb_many = local_engine.fetch_wkb_many
+
+    def fetch(ids, *args, **kwargs):
+        fetched.append(sorted(ids))
+        return fetch_wkb_many(ids, *args, **kwargs)
+
+    monkeypatch.setattr(local_engine, "fetch_wkb_many", fetch)
+    df = local_engine.root().spatial_join(POINTS, level="locality", country="us")
+    # Every input row is kept, with NULLs where no locality matched
+    assert sorted(df["event"]) == sorted(POINTS["event"])
+    tagged = df.dropna(subset=["locality_id"])
+    assert dict(zip(tagged["event"], tagged["locality_id"])) == {
+        "sf": "sfci",
+        "la": "laci",
+    }
+    assert df.loc[df["event"] == "sf", "locality_region"].item() == "US-CA"
+    # Only the US localities overlapping the extent of the input were fetched
+    assert fetched == [["laci", "nyci", "sfci"]]
+
+
+def test_spatial_join_geometries_to_parquet(local_engine, tmp_path):
+    """Test that geometries are tagged by intersection and streamed to a file."""
+    source = tmp_path / "shapes.parquet"
+    xmin, ymin, xmax, ymax = BOXES["sfco"]
+    shapes = pd.DataFrame(
+        {
+            "shape": ["bay", "berlin"],
+            "geometry": [box_wkt(xmin, ymin, xmax, ymax), "POINT (13.4 52.5)"],
+        }
+    )
+    conn = duckdb.connect()
+    conn.register("shapes", shapes)
+    conn.execute(f"COPY shapes TO '{source}' (FORMAT parquet)")
+
+    output = tmp_path / "tagged.parquet"
+    count = spatial_join(local_engine, str(source), level="county", output=str(output))
+    rows = conn.execute(
+        f"SELECT shape, county_id FROM '{output}' ORDER BY shape"
+    ).fetchall()
+    assert count == 2
+    assert rows == [("bay", "sfco"), ("berlin", None)]
+
+
+def test_spatial_join_errors(engine):
+    """Test that unknown levels and chained calls are rejected."""
+    with pytest.raises(ValueError, match="Unknown level: state"):
+        spatial_join(engine, POINTS, level="state")
+    with pytest.raises(AttributeError, match="only available at the root level"):
+        engine.root().us.spatial_join(POINTS)
@@ -0,0 +1,168 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import duckdb
+
+from wkls.cli import main
+from wkls.engine import WklsEngine, resolve_geometry_source, sql_string
+from wkls.extract import extract_division_area
+
+
+def test_resolve_geometry_source(tmp_path, monkeypatch):
+    """Test how configured geometry sources map to parquet_scan paths."""
+    monkeypatch.delenv("WKLS_GEOMETRY_SOURCE", raising=False)
+    assert resolve_geometry_source(None, "2025-05-21.0").startswith(
+        "s3://overturemaps-us-west-2/release/2025-05-21.0/"
+    )
+    assert resolve_geometry_source(str(tmp_path)) == f"{tmp_path}/*.parquet"
+    assert resolve_geometry_source(f"file://{tmp_path}") == f"{tmp_path}/*.parquet"
+    assert resolve_geometry_source("file:///data/*.parquet") == "/data/*.parquet"
+    assert resolve_geometry_source("s3://mirror/division_area/") == (
+        "s3://mirror/division_area/*"
+    )
+
+    monkeypatch.setenv("WKLS_GEOMETRY_SOURCE", str(tmp_path))
+    assert resolve_geometry_source(None) == f"{tmp_path}/*.parquet"
+
+
+def test_geometry_from_local_source(local_engine):
+    """Test that geometries are read from a local division_area directory."""
+    root = local_engine.root()
+    assert root.us.ca.losangeles.wkt().startswith("POLYGON ((-118.7 33.7")
+    assert root.de.be.berlin.wkb() == local_engine.fetch_wkb("beci")
+
+    batch = root.geometries(["us.ny", "de", "us.ca.nowhere"], fmt="wkt")
+    assert batch["geometry"].notna().tolist() == [True, True, False]
+
+
+def test_switching_source_forgets_misses(engine, tmp_path, monkeypatch):
+    """Test that ids missing from one source are looked up again in the next."""
+    partial, full = tmp_path / "partial", tmp_path / "full"
+    contents = {
+        resolve_geometry_source(str(partial)): {},
+        resolve_geometry_source(str(full)): {"sfci": b"wkb-sfci"},
+    }
+    monkeypatch.setattr(
+        engine,
+        "_scan_wkb",
+        lambda ids: [
+            (geom_id, wkb)
+            for geom_id, wkb in contents[engine.geometry_source].items()
+            if geom_id in ids
+        ],
+    )
+    engine.configure_cache(enabled=False)
+    engine.configure_source(str(partial))
+    assert engine.fetch_wkb_many(["sfci"]) == {}
+
+    engine.configure_source(str(full))
+    assert engine.fetch_wkb_many(["sfci"]) == {"sfci": b"wkb-sfci"}
+
+
+def test_extract(local_engine, metadata_path, tmp_path):
+    """Test that an extract keeps only the chosen countries, sorted by id."""
+    output = tmp_path / "us.parquet"
+    count = extract_division_area(local_engine, ["us"], str(output))
+    assert count == 7
+
+    ids = [row[0] for row in duckdb.sql(f"SELECT id FROM '{output}'").fetchall()]
+    assert ids == sorted(ids)
+    assert "beci" not in ids
+
+    # The extract can be used as a geometry source on its own
+    engine = WklsEngine(
+        metadata_path=metadata_path,
+        geometry_source=f"file://{output}",
+        cache_enabled=False,
+    )
+    assert engine.root().us.ca.sanfrancisco.wkt().startswith("POLYGON")
+
+
+def test_quoted_paths(metadata_path, tmp_path):
+    """Test that paths containing single quotes are quoted, not spliced into SQL."""
+    assert sql_string("/data/O'Brien/out.parquet") == "'/data/O''Brien/out.parquet'"
+    directory = tmp_path / "O'Brien"
+    directory.mkdir()
+    shutil.copy(metadata_path, directory / "metadata.parquet")
+    engine = WklsEngine(
+        metadata_path=str(directory / "metadata.parquet"),
+        geometry_source=str(directory),
+        cache_enabled=False,
+    )
+    assert list(engine.root().de.be.berlin["id"]) == ["beci"]
+
+
+def test_extract_to_quoted_path(local_engine, metadata_path, tmp_path):
+    """Test that an extract is written to and read back from a quoted path."""
+    directory = tmp_path / "O'Brien"
+    directory.mkdir()
+    output = directory / "de.parquet"
+    assert extract_division_area(local_engine, ["de"], str(output)) == 3
+
+    engine = WklsEngine(
+        metadata_path=metadata_path,
+        geometry_source=str(output),
+        cache_enabled=False,
+    )
+    assert set(engine.fetch_wkb_many(["beci", "us0"])) == {"beci"}
+
+
+def test_extract_cli(division_area_dir, tmp_path):
+    """Test the `wkls extract` command line entry point."""
+    output = tmp_path / "de.parquet"
+    args = ["extract", "de", "-o", str(output), "--source", division_area_dir]
+    assert main(args) == 0
+    count = duckdb.sql(f"SELECT count(*) FROM '{output}'").fetchone()[0]
+    assert count == 3
+
+
+def build_rowgroup_index(source, metadata, output):
+    script = Path(__file__).parent.parent / "scripts" / "build_rowgroup_index.py"
+    subprocess.run(
+        [sys.executable, str(script), "--source", source, "--metadata", metadata]
+        + ["--output", output],
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_rowgroup_index(metadata_path, division_area_dir, tmp_path):
+    """Test that lookups through the row-group index match full scans."""
+    index = str(tmp_path / "rowgroups.parquet")
+    build_rowgroup_index(division_area_dir, metadata_path, index)
+    files = duckdb.sql(f"SELECT DISTINCT file FROM '{index}' ORDER BY file").fetchall()
+    assert files == [("part-0.parquet",), ("part-1.parquet",)]
+
+    indexed = WklsEngine(
+        metadata_path=metadata_path,
+        geometry_source=division_area_dir,
+        rowgroup_index=index,
+        cache_enabled=False,
+    )
+    full = WklsEngine(
+        metadata_path=metadata_path,
+        geometry_source=division_area_dir,
+        cache_enabled=False,
+    )
+    ids = ["us0", "sfci", "beci", "missing"]
+    assert indexed.fetch_wkb_many(ids) == full.fetch_wkb_many(ids)
+    assert set(indexed.fetch_wkb_many(ids)) == {"us0", "sfci", "beci"}
+
+
+def test_rowgroup_index_wrong_layout(metadata_path, division_area_dir, tmp_path):
+    """Test that an index that does not match the source falls back to a scan."""
+    index = str(tmp_path / "rowgroups.parquet")
+    build_rowgroup_index(division_area_dir, metadata_path, index)
+
+    extract = str(tmp_path / "extract.parquet")
+    engine = WklsEngine(
+        metadata_path=metadata_path,
+        geometry_source=division_area_dir,
+        cache_enabled=False,
+    )
+    extract_division_area(engine, ["us", "de"], extract)
+
+    engine.configure_source(extract, rowgroup_index=index)
+    assert set(engine.fetch_wkb_many(["us0", "beci"])) == {"us0", "beci"}
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from wkls.locate import locate_points
+
+
+def test_locate_point(local_engine):
+    """Test that a point resolves to every division containing it, outermost first."""
+    df = local_engine.root().locate(-122.45, 37.77)
+    assert list(df["id"]) == ["us0", "usca", "sfco", "sfci"]
+    assert "point" not in df.columns
+
+
+def test_locate_many(local_engine):
+    """Test that points are located in bulk and reported by input position."""
+    df = locate_points(
+        local_engine, [-122.45, 0.0, 13.4, -118.4], [37.77, 0.0, 52.5, 34.0]
+    )
+    located = df.groupby("point")["id"].apply(list).to_dict()
+    assert located == {
+        0: ["us0", "usca", "sfco", "sfci"],
+        2: ["de0", "debe", "beci"],
+        3: ["us0", "usca", "laci"],
+    }
+
+
+def test_locate_many_chunks_and_dataframe(local_engine):
+    """Test that chunked runs and DataFrame input give the same rows."""
+    points = pd.DataFrame({"lon": [13.4, -74.0, -122.45], "lat": [52.5, 40.7, 37.77]})
+    whole = local_engine.root().locate_many(points)
+    chunked = local_engine.root().locate_many(
+        points["lon"].to_numpy(), points["lat"].to_numpy(), chunk_size=1
+    )
+    pd.testing.assert_frame_equal(whole, chunked)
+    assert sorted(whole[whole["subtype"] == "locality"]["id"]) == [
+        "beci",
+        "nyci",
+        "sfci",
+    ]
+
+
+def test_locate_rejects_mismatched_lengths(engine):
+    """Test that lons and lats must pair up."""
+    with pytest.raises(ValueError, match="same length"):
+        locate_points(engine, [1.0, 2.0], [1.0])
+
+
+def test_locate_is_root_only(engine):
+    """Test that locate() cannot be called on chained objects."""
+    with pytest.raises(AttributeError, match="only available at the root level"):
+        engine.root().us.locate(0.0, 0.0)
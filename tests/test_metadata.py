@@ -0,0 +1,46 @@
+import pytest
+
+from wkls.engine import METADATA_COLUMNS, WklsEngine
+
+
+@pytest.fixture
+def spatial_engine(spatial_metadata_path, tmp_path):
+    return WklsEngine(
+        metadata_path=spatial_metadata_path, cache_dir=str(tmp_path / "cache")
+    )
+
+
+def test_bbox_and_centroid(spatial_engine):
+    """Test that bbox() and centroid() are answered from the metadata table."""
+    root = spatial_engine.root()
+    assert root.de.be.bbox() == (13.0, 52.0, 13.8, 52.7)
+    assert root.us.ca.losangeles.centroid() == pytest.approx((-118.4, 34.0))
+    assert root["us"]["ny"].bbox() == (-80.0, 40.0, -72.0, 45.0)
+
+
+def test_within_bbox(spatial_engine):
+    """Test that divisions are filtered by bounding box without geometry reads."""
+    root = spatial_engine.root()
+    df = root.within_bbox(-125.0, 32.0, -114.0, 42.0)
+    assert sorted(df["id"]) == ["laci", "sfci", "sfco", "usca"]
+
+    df = root.within_bbox(-125.0, 32.0, -114.0, 42.0, subtypes=["locality"])
+    assert sorted(df["id"]) == ["laci", "sfci"]
+
+    df = root.within_bbox(-122.5, 37.75, -122.4, 37.8, intersects=True)
+    assert sorted(df["id"]) == ["sfci", "sfco", "us0", "usca"]
+
+
+def test_metadata_without_spatial_columns(engine):
+    """Test that older metadata keeps its columns and gives clear errors."""
+    df = engine.root().us.ca.sanfrancisco
+    assert list(df.columns) == list(METADATA_COLUMNS)
+    assert list(engine.root().us.regions().columns) == list(METADATA_COLUMNS)
+    assert list(engine.root().us.ca.cities().columns) == list(METADATA_COLUMNS)
+    assert not engine.has_spatial_metadata()
+    with pytest.raises(ValueError, match=r"metadata_path='metadata.parquet'\)"):
+        df.bbox()
+    with pytest.raises(ValueError, match="build_metadata.py"):
+        df.centroid()
+    with pytest.raises(ValueError, match="build_metadata.py"):
+        engine.root().within_bbox(0, 0, 1, 1)
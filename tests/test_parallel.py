@@ -0,0 +1,79 @@
+import os
+
+import duckdb
+import pytest
+
+from wkls.engine import WklsEngine
+from wkls.parallel import candidate_files, fetch_parallel, partition_files
+
+
+def test_partition_files():
+    """Test that files are split into disjoint sets with balanced id counts."""
+    files = {"a": ["1"] * 6, "b": ["2"] * 3, "c": ["3"] * 2, "d": ["4"] * 2}
+    partitions = partition_files(files, 2)
+    assert sorted(file for part in partitions for file, _ in part) == list("abcd")
+    assert sorted(sum(len(ids) for _, ids in part) for part in partitions) == [6, 7]
+    assert len(partition_files(files, 8)) == 4
+
+
+def test_candidate_files(metadata_path, tmp_path):
+    """Test that ids are assigned to the files whose id statistics cover them."""
+    source = tmp_path / "division_area"
+    source.mkdir()
+    for name, start, stop in (("a", 0, 5000), ("b", 4000, 9000)):
+        duckdb.execute(
+            f"COPY (SELECT lpad(range::VARCHAR, 5, '0') AS id FROM range({start}, {stop})) "
+            f"TO '{source}/{name}.parquet' (FORMAT parquet, ROW_GROUP_SIZE 2048)"
+        )
+    engine = WklsEngine(metadata_path=metadata_path, geometry_source=str(source))
+    files = candidate_files(engine, ["00001", "04500", "08500", "99999"])
+    assert {os.path.basename(f): sorted(ids) for f, ids in files.items()} == {
+        "a.parquet": ["00001", "04500"],
+        "b.parquet": ["04500", "08500"],
+    }
+
+
+def test_cached_ids_skip_workers(engine):
+    """Test that cached geometries are served without starting worker processes."""
+    engine.geometry_cache().put("sfci", b"wkb-sfci")
+    engine.geometry_cache().put("laci", b"wkb-laci")
+    results = dict(engine.root().fetch_parallel(["sfci", "laci", "sfci"]))
+    assert results == {"sfci": b"wkb-sfci", "laci": b"wkb-laci"}
+    assert engine.fetch_info().hits == 2
+
+    with pytest.raises(ValueError, match="Unknown geometry format"):
+        engine.root().fetch_parallel(["sfci"], fmt="kml")
+
+
+def test_uncovered_ids_are_misses(metadata_path, tmp_path):
+    """Test that ids no file can hold are recorded as misses without any worker."""
+    source = tmp_path / "division_area"
+    source.mkdir()
+    duckdb.execute(
+        f"COPY (SELECT 'aaa' AS id) TO '{source}/a.parquet' (FORMAT parquet)"
+    )
+    engine = WklsEngine(
+        metadata_path=metadata_path,
+        geometry_source=str(source),
+        cache_dir=str(tmp_path / "cache"),
+    )
+    assert list(fetch_parallel(engine, ["zzz"])) == []
+    assert engine.fetch_info().misses == 1
+    assert list(fetch_parallel(engine, ["zzz"])) == []
+    assert engine.fetch_info().negative_hits == 1
+    assert engine.is_known_missing("zzz")
+
+    with pytest.raises(ValueError, match="Unknown fetch counter: hit"):
+        engine.count_fetches("hit")
+
+
+def test_fetch_parallel_matches_serial(local_engine):
+    """Test that worker processes return the same geometries as a serial fetch."""
+    ids = ["us0", "de0", "usca", "debe", "sfci", "beci", "missing"]
+    local_engine.configure_cache(enabled=False)
+    results = dict(local_engine.root().fetch_parallel(ids, workers=2))
+    assert results == local_engine.fetch_wkb_many(ids)
+    assert "missing" not in results
+
+    wkts = dict(local_engine.root().fetch_parallel(ids[:2], workers=2, fmt="wkt"))
+    assert wkts["de0"].startswith("POLYGON")
@@ -0,0 +1,66 @@
+import duckdb
+
+from wkls.diff import diff_releases
+from wkls.engine import OVERTURE_VERSION, WklsEngine, default_engine, release_engine
+
+
+def test_release_engines_are_separate(metadata_path):
+    """Test that each release gets its own long-lived engine."""
+    assert release_engine(OVERTURE_VERSION) is default_engine()
+
+    engine = release_engine("2099-01-01.0", metadata_path=metadata_path)
+    assert engine is release_engine("2099-01-01.0")
+    assert engine is not default_engine()
+    assert engine.version == "2099-01-01.0"
+    assert "2099-01-01.0" in engine.geometry_source
+
+    root = engine.root()
+    assert root.overture_version() == "2099-01-01.0"
+    assert sorted(root.us.ca.sanfrancisco["id"]) == ["sfci", "sfco"]
+
+
+def test_diff_releases(local_engine, metadata_path, division_area_dir, tmp_path):
+    """Test that added, removed and changed ids are found from geometry digests."""
+    new_metadata = str(tmp_path / "metadata.parquet")
+    new_source = str(tmp_path / "division_area.parquet")
+    conn = duckdb.connect()
+    conn.execute("INSTALL spatial")
+    conn.load_extension("spatial")
+    conn.execute(f"""
+        COPY (
+            SELECT * FROM '{metadata_path}' WHERE id != 'laci'
+            UNION ALL
+            SELECT 'moci', 'DE', 'DE-BE', 'locality', 'Mitte', 'mocid'
+        ) TO '{new_metadata}' (FORMAT parquet)
+    """)
+    conn.execute(f"""
+        COPY (
+            SELECT * REPLACE (
+                CASE WHEN id = 'sfci' THEN ST_Buffer(geometry, 0.01) ELSE geometry END
+                AS geometry
+            )
+            FROM read_parquet('{division_area_dir}/*.parquet')
+            WHERE id != 'laci'
+            UNION ALL
+            SELECT * REPLACE ('moci' AS id)
+            FROM read_parquet('{division_area_dir}/*.parquet')
+            WHERE id = 'beci'
+        ) TO '{new_source}' (FORMAT parquet)
+    """)
+    conn.close()
+
+    new = WklsEngine(
+        version="next",
+        metadata_path=new_metadata,
+        geometry_source=new_source,
+        cache_enabled=False,
+    )
+    rows = diff_releases(local_engine, new)
+    assert [(row[0], row[1]) for row in rows] == [
+        ("moci", "added"),
+        ("sfci", "changed"),
+        ("laci", "removed"),
+    ]
+    assert diff_releases(local_engine, new, country="de") == [
+        ("moci", "added", "DE", "locality", "Mitte"),
+    ]
@@ -0,0 +1,113 @@
+import subprocess
+import sys
+
+import pyarrow as pa
+import pytest
+
+from wkls.core import ChainableTable
+from wkls.engine import WklsEngine
+from wkls.results import GEOARROW_WKB_METADATA, resolve_backend
+
+
+@pytest.fixture
+def arrow_engine(metadata_path, tmp_path):
+    return WklsEngine(
+        metadata_path=metadata_path,
+        cache_dir=str(tmp_path / "cache"),
+        backend="arrow",
+    )
+
+
+def test_resolve_backend(monkeypatch):
+    """Test backend selection from the argument and the environment."""
+    assert resolve_backend("arrow") == "arrow"
+    monkeypatch.setenv("WKLS_BACKEND", "arrow")
+    assert resolve_backend() == "arrow"
+    with pytest.raises(ValueError, match="Unknown result backend"):
+        resolve_backend("polars")
+
+
+def test_arrow_chaining(arrow_engine):
+    """Test that chained lookups return chainable pyarrow tables."""
+    sf = arrow_engine.root().us.ca.sanfrancisco
+    assert isinstance(sf, ChainableTable)
+    assert isinstance(pa.table(sf), pa.Table)
+    assert sf.num_rows == 2
+    assert sorted(sf["subtype"].to_pylist()) == ["county", "locality"]
+    assert sf._first_id() == "sfco"
+
+    # Chaining keeps working from table results
+    ca = arrow_engine.root().us.ca
+    assert ca.sanfrancisco.num_rows == 2
+    assert ca["losangeles"].resolve().column("id").to_pylist() == ["laci"]
+
+
+def test_arrow_listings(arrow_engine):
+    """Test that listing methods return pyarrow tables straight from DuckDB."""
+    root = arrow_engine.root()
+    countries = root.countries()
+    assert isinstance(countries, pa.Table)
+    assert sorted(countries.column("id").to_pylist()) == ["de0", "us0"]
+    assert isinstance(root.us.ca.cities(), pa.Table)
+    assert root.us.ca.cities().num_rows == 2
+
+
+def test_arrow_geometries_schema(arrow_engine):
+    """Test that bulk WKB results are tagged as GeoArrow WKB."""
+    table = arrow_engine.root().geometries(["us.ca.nowhere"])
+    field = table.schema.field("geometry")
+    assert field.type == pa.binary()
+    assert field.metadata == GEOARROW_WKB_METADATA
+    assert table.column("error").to_pylist() == ["No result found for: us.ca.nowhere"]
+
+
+def test_works_without_pandas(metadata_path):
+    """Test that wkls imports and chains with the arrow backend when pandas is missing."""
+    snippet = f"""
+import sys
+
+
+class NoPandas:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] == "pandas":
+            raise ModuleNotFoundError(name)
+
+
+sys.meta_path.insert(0, NoPandas())
+from wkls.engine import WklsEngine
+engine = WklsEngine(metadata_path={metadata_path!r}, cache_enabled=False)
+print(engine.backend, engine.root().us.ca.sanfrancisco.num_rows)
+"""
+    out = subprocess.run(
+        [sys.executable, "-c", snippet], check=True, capture_output=True, text=True
+    )
+    assert out.stdout.strip() == "arrow 2"
+
+
+def test_imports_without_any_backend(metadata_path):
+    """Test that wkls imports without pandas and pyarrow and fails on first result."""
+    snippet = f"""
+import sys
+
+
+class NoBackend:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in ("pandas", "pyarrow"):
+            raise ModuleNotFoundError(name)
+
+
+sys.meta_path.insert(0, NoBackend())
+import wkls
+from wkls.engine import WklsEngine
+engine = WklsEngine(metadata_path={metadata_path!r}, cache_enabled=False)
+try:
+    engine.root().us.ca.sanfrancisco
+except ValueError as e:
+    print(e)
+"""
+    out = subprocess.run(
+        [sys.executable, "-c", snippet], check=True, capture_output=True, text=True
+    )
+    assert out.stdout.strip() == (
+        "wkls results need pandas or pyarrow. Install wkls[pandas] or wkls[arrow]."
+    )
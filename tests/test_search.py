@@ -0,0 +1,85 @@
+import pytest
+
+from wkls.search import SUBTYPE_RANK, SearchIndex, search_key
+
+COLUMNS = ["id", "country", "region", "subtype", "name", "division_id"]
+
+
+def test_search_key():
+    """Test that search keys ignore case, accents, spaces and punctuation."""
+    assert search_key("São Paulo") == "saopaulo"
+    assert search_key("SAO-PAULO") == "saopaulo"
+    assert search_key("Straße") == "strasse"
+    assert search_key("Łódź") == "lodz"
+
+
+def test_accent_and_prefix_search():
+    """Test that accent-free prefixes find accented names."""
+    rows = [
+        ("sp", "BR", "BR-SP", "locality", "São Paulo", "spd"),
+        ("spr", "BR", "BR-SP", "region", "São Paulo", "sprd"),
+        ("sa", "BR", "BR-SP", "locality", "Santos", "sad"),
+    ]
+    index = SearchIndex(COLUMNS, rows)
+    # Regions rank ahead of localities with the same name
+    assert [row[0] for row, _ in index.search("sao paulo")] == ["spr", "sp"]
+    assert [row[0] for row, _ in index.search("sa", limit=1)] == ["sa"]
+
+
+class CountingList(list):
+    """A list that counts the items read from it."""
+
+    reads = 0
+
+    def __getitem__(self, i):
+        CountingList.reads += 1
+        return super().__getitem__(i)
+
+
+def test_short_prefix_search_is_bounded():
+    """Test that a short prefix shared by many rows reads few of them."""
+    subtypes = ["locality", "county", "neighborhood", "region"]
+    rows = [
+        (f"id{n}", "US" if n % 3 else "FR", None, subtypes[n % 4], f"S{n}", None)
+        for n in range(100_000)
+    ]
+    index = SearchIndex(COLUMNS, rows)
+    keyed = [(search_key(row[4]), row) for row in rows]
+
+    def expected(prefix, country, limit):
+        matches = sorted(
+            (len(key), SUBTYPE_RANK[row[3]], key, row[0])
+            for key, row in keyed
+            if key.startswith(prefix) and country in (None, row[1])
+        )
+        return [match[-1] for match in matches[:limit]]
+
+    index.keys = CountingList(index.keys)
+    index.rows = CountingList(index.rows)
+    for prefix, country in (("s", None), ("s1", None), ("s", "fr"), ("s99", "us")):
+        CountingList.reads = 0
+        found = [row[0] for row, _ in index.search(prefix, country=country)]
+        assert found == expected(prefix, country and country.upper(), 10)
+        assert CountingList.reads < 500
+
+
+def test_engine_search(engine):
+    """Test ranking, typo tolerance and the country filter through wkls.search()."""
+    root = engine.root()
+    df = root.search("san fran")
+    assert sorted(df["id"]) == ["sfci", "sfco"]
+    assert list(df["subtype"]) == ["locality", "county"]
+
+    df = root.search("los angles")
+    assert list(df["id"]) == ["laci"]
+    assert df["score"].iloc[0] < 0.5
+
+    assert list(root.search("berlin", country="de")["id"]) == ["debe", "beci"]
+    assert root.search("berlin", country="us").empty
+    assert len(root.search("new", limit=1)) == 1
+
+
+def test_search_is_root_only(engine):
+    """Test that search() cannot be called on chained objects."""
+    with pytest.raises(AttributeError, match="only available at the root level"):
+        engine.root().us.search("x")
@@ -0,0 +1,64 @@
+import pytest
+
+from wkls.engine import LEVELS_OF_DETAIL, simplify_params
+
+
+def test_simplify_params():
+    """Test that levels of detail map to tolerances and options are validated."""
+    assert simplify_params() == (None, None)
+    assert simplify_params(lod="low") == (LEVELS_OF_DETAIL["low"], None)
+    assert simplify_params(tolerance=0.5, precision=3) == (0.5, 3)
+    assert simplify_params(tolerance=0) == (None, None)
+    with pytest.raises(ValueError, match="either tolerance or lod"):
+        simplify_params(tolerance=0.1, lod="low")
+    with pytest.raises(ValueError, match="Unknown level of detail"):
+        simplify_params(lod="tiny")
+    with pytest.raises(ValueError, match="precision"):
+        simplify_params(precision=-1)
+
+
+def test_simplified_variants_are_cached(local_engine):
+    """Test that simplified variants are cached apart from the full geometry."""
+    sf = local_engine.root().us.ca.sanfrancisco
+    # The synthetic boxes have no vertices to drop
+    assert sf.wkt(lod="low") == sf.wkt()
+    assert sf.wkt(precision=1).startswith("POLYGON")
+
+    cache = local_engine.geometry_cache()
+    assert cache.get("sfco") is not None
+    assert cache.get(f"sfco|tolerance={LEVELS_OF_DETAIL['low']}|precision=None")
+    assert cache.get("sfco|tolerance=None|precision=1") is not None
+
+    batch = local_engine.root().geometries(
+        ["us.ca.sanfrancisco"], fmt="wkt", lod="low", precision=1
+    )
+    assert batch["geometry"][0] == sf.wkt(lod="low", precision=1)
+
+
+def test_batch_simplification_is_validated_and_cached(engine, monkeypatch):
+    """Test that bulk lookups check options before fetching and cache variants."""
+    scans = []
+    converts = []
+
+    def scan(ids):
+        scans.append(list(ids))
+        return [(geom_id, f"wkb-{geom_id}".encode()) for geom_id in ids]
+
+    def convert(wkbs, expr):
+        converts.append(expr)
+        return [b"simplified-" + wkb for wkb in wkbs]
+
+    monkeypatch.setattr(engine, "_scan_wkb", scan)
+    monkeypatch.setattr(engine, "convert_wkb_many", convert)
+    root = engine.root()
+    with pytest.raises(ValueError, match="Unknown level of detail"):
+        root.geometries(["us.ca.losangeles"], lod="tiny")
+    assert scans == []
+
+    for _ in range(2):
+        df = root.geometries(["us.ca.losangeles"], lod="low")
+        assert df["geometry"][0] == b"simplified-wkb-laci"
+    assert scans == [["laci"]]
+    assert len(converts) == 1
+    key = f"laci|tolerance={LEVELS_OF_DETAIL['low']}|precision=None"
+    assert engine.geometry_cache().get(key) == b"simplified-wkb-laci"
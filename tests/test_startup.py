@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+
+def run_python(snippet):
+    out = subprocess.run(
+        [sys.executable, "-c", snippet], check=True, capture_output=True, text=True
+    )
+    return out.stdout.strip()
+
+
+def test_import_is_lazy():
+    """Test that importing wkls does not load the metadata table or extensions."""
+    snippet = """
+import wkls
+from wkls.engine import default_engine
+engine = default_engine()
+print(engine._conn is None, engine._table_ready, engine._spatial_ready, engine._index)
+"""
+    assert run_python(snippet) == "True False False None"
+
+
+def test_import_time():
+    """Guard against import-time regressions: importing wkls should be quick."""
+    snippet = """
+import time
+start = time.perf_counter()
+import wkls
+print(time.perf_counter() - start)
+"""
+    assert float(run_python(snippet)) < 2.0
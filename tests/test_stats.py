@@ -0,0 +1,58 @@
+from wkls.stats import NULL_SPAN, profile_totals
+
+
+def test_disabled_by_default(engine, monkeypatch):
+    """Test that nothing is recorded and profiling stays off unless enabled."""
+    monkeypatch.delenv("WKLS_STATS", raising=False)
+    assert engine.instrumentation.span("resolve") is NULL_SPAN
+    root = engine.root()
+    root["us"]["ca"]["sanfrancisco"].resolve()
+    root.countries()
+    stats = root.stats()
+    assert all(phase.calls == 0 for phase in stats.phases.values())
+    assert stats.resolve_cache.misses == 1
+
+
+def test_phases_and_hooks(engine):
+    """Test that resolutions and listings are timed and passed to hooks."""
+    events = []
+    root = engine.root()
+    root.configure_stats(hooks=[events.append])
+    root["us"]["ca"]["sanfrancisco"].resolve()
+    root["us"]["ca"].cities()
+    root["xx"].resolve()
+
+    assert [event.phase for event in events] == ["resolve", "list", "resolve"]
+    assert events[0].rows == 2
+    assert events[1].rows == 2
+    assert all(event.seconds >= 0 and event.error is None for event in events)
+
+    stats = root.stats(reset=True)
+    assert stats.phases["resolve"].calls == 2
+    assert stats.phases["resolve"].rows == 2
+    assert stats.phases["list"].calls == 1
+    assert stats.phases["fetch"].calls == 0
+    assert root.stats().phases["resolve"].calls == 0
+
+    root.configure_stats(enabled=False)
+    root["us"].resolve()
+    assert len(events) == 3
+
+
+def test_profile_totals(engine, metadata_path):
+    """Test that bytes and files read are taken from DuckDB query profiles."""
+    engine.configure_stats()
+    with engine.instrumentation.span("fetch") as span:
+        cursor = engine.cursor()
+        cursor.execute(f"SELECT * FROM read_parquet('{metadata_path}')").fetchall()
+        engine.instrumentation.add_profile(cursor)
+    assert span.bytes_read > 0
+
+    profile = {
+        "total_bytes_read": 2048,
+        "children": [
+            {"extra_info": {"Total Files Read": "2"}, "children": []},
+            {"extra_info": {}, "children": [{"extra_info": {"Total Files Read": "1"}}]},
+        ],
+    }
+    assert profile_totals(profile) == (2048, 3)
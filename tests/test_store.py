@@ -0,0 +1,87 @@
+import pytest
+
+from wkls.engine import WklsEngine
+from wkls.store import MetadataStore, write_store
+
+
+def build_store(metadata_path, path):
+    """Write the store of a metadata parquet the way the build script does."""
+    result = WklsEngine(metadata_path=metadata_path).sql("SELECT * FROM wkls")
+    columns = [d[0] for d in result.description]
+    rows = result.fetchall()
+    write_store(path, columns, rows)
+    return columns, rows
+
+
+@pytest.fixture
+def store_engine(metadata_path, tmp_path):
+    """An engine answering lookups and listings from a metadata store."""
+    path = str(tmp_path / "metadata.wklsmeta")
+    build_store(metadata_path, path)
+    return WklsEngine(
+        metadata_path=metadata_path,
+        metadata_store=path,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+
+def test_store_round_trip(spatial_metadata_path, tmp_path):
+    """Test that every row and column reads back as stored, NULLs included."""
+    path = str(tmp_path / "spatial.wklsmeta")
+    columns, rows = build_store(spatial_metadata_path, path)
+    store = MetadataStore(path)
+    assert store.columns == columns
+    assert len(store) == len(rows)
+    assert [store.row(i) for i in range(len(rows))] == rows
+    assert store.subtypes() == (
+        ["subtype"],
+        [("country",), ("county",), ("locality",), ("region",)],
+    )
+
+
+def test_store_matches_table(store_engine, engine, monkeypatch):
+    """Test that lookups and listings match the DuckDB table without loading it."""
+    chains = [
+        ["us"],
+        ["us", "ca"],
+        ["us", "ca", "sanfrancisco"],
+        ["US", "Ca", "San Francisco"],
+        ["de", "be", "berlin"],
+        ["us", "tx"],
+        ["fr"],
+    ]
+    expected = {tuple(chain): engine.resolve(chain) for chain in chains}
+    root = engine.root()
+    listings = {
+        "countries": root.countries(),
+        "regions": root.us.regions(),
+        "cities": root.us.ca.cities(),
+        "counties": root.us.ca.counties(),
+    }
+
+    monkeypatch.setattr(store_engine, "initialize_table", pytest.fail)
+    for chain in chains:
+        assert store_engine.resolve(chain) == expected[tuple(chain)]
+    store_root = store_engine.root()
+    assert sorted(store_root.countries()["id"]) == sorted(listings["countries"]["id"])
+    assert list(store_root.us.regions()["id"]) == list(listings["regions"]["id"])
+    assert list(store_root.us.ca.cities()["id"]) == list(listings["cities"]["id"])
+    assert list(store_root.us.ca.counties()["id"]) == list(listings["counties"]["id"])
+    assert list(store_root.subtypes()["subtype"]) == [
+        "country",
+        "county",
+        "locality",
+        "region",
+    ]
+
+
+def test_store_falls_back_to_table(store_engine):
+    """Test that name patterns still go through the DuckDB table."""
+    df = store_engine.root().us.ca["san%"]
+    assert list(df["id"]) == ["sfco", "sfci"]
+
+
+def test_not_a_store(metadata_path):
+    """Test that a file that isn't a metadata store is rejected."""
+    with pytest.raises(ValueError, match="Not a wkls metadata store"):
+        MetadataStore(metadata_path)
@@ -48,3 +48,25 @@ def test_overture_version():
     print(
         "Correctly blocked chained access: wkls.us does not have overture_version method"
     )
+
+
+def test_geometries_batch():
+    """Test bulk geometry lookup keeps input order and reports misses."""
+    sf_id = wkls.us.ca.sanfrancisco.iloc[0]["id"]
+    result = wkls.geometries(
+        ["us.ca.sanfrancisco", "us.ca.nonexistentcity", sf_id, wkls.us.ny],
+        fmt="wkt",
+    )
+
+    assert result["input"].tolist()[:2] == [
+        "us.ca.sanfrancisco",
+        "us.ca.nonexistentcity",
+    ]
+    assert result.loc[0, "geometry"].startswith(
+        "MULTIPOLYGON (((-122.9915659 37.7672733"
+    )
+    assert result.loc[1, "geometry"] is None
+    assert "No result found for: us.ca.nonexistentcity" in result.loc[1, "error"]
+    assert result.loc[2, "id"] == sf_id
+    assert result.loc[2, "geometry"] == result.loc[0, "geometry"]
+    assert result.loc[3, "input"] == "us.ny"
@@ -1,4 +1,5 @@
 import sys
+from . import cli  # noqa: F401 (registers wkls.cli before the module is replaced)
 from .core import Wkl
 
 # Create the main instance
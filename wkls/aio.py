@@ -0,0 +1,51 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Default number of threads running blocking lookups for asyncio callers
+DEFAULT_ASYNC_WORKERS = 4
+
+
+class AsyncExecutor:
+    """Runs blocking wkls calls for asyncio code on a bounded thread pool.
+
+    Each worker thread queries DuckDB through its own engine cursor. Calls made
+    with a key are coalesced: concurrent callers on the same event loop asking
+    for the same key await a single in-flight call. Cancelling one caller (or
+    hitting its timeout) does not cancel the shared call for the others.
+    """
+
+    def __init__(self, max_workers=DEFAULT_ASYNC_WORKERS):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="wkls"
+        )
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    async def call(self, fn, *args):
+        """Run fn(*args) on the pool and return its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, fn, *args)
+
+    async def call_shared(self, key, fn, *args):
+        """Run fn(*args) on the pool, sharing the call with concurrent callers of key."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None or future.get_loop() is not loop:
+                future = asyncio.ensure_future(
+                    loop.run_in_executor(self._pool, fn, *args)
+                )
+                self._inflight[key] = future
+                future.add_done_callback(lambda f: self._forget(key, f))
+        return await asyncio.shield(future)
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads."""
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,288 @@
+import os
+import sqlite3
+import threading
+import time
+import warnings
+
+# Default upper bound for the on-disk geometry cache (512 MiB)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Default number of seconds a lookup miss is remembered
+DEFAULT_NEGATIVE_TTL = 300
+
+# Cache hits are read-only; their access times are written in batches, once
+# this many are pending or this many seconds after the previous batch
+RECENCY_BATCH_SIZE = 256
+RECENCY_INTERVAL = 5.0
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS geometries (
+        version TEXT NOT NULL,
+        id TEXT NOT NULL,
+        wkb BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        accessed REAL NOT NULL,
+        PRIMARY KEY (version, id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS geometries_accessed ON geometries (accessed)",
+    # Running total of the cached bytes, kept up to date by every write
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    """,
+    # Cache files written before the total was tracked start from their sum
+    """
+    INSERT OR IGNORE INTO meta
+    SELECT 'total_size', COALESCE(SUM(size), 0) FROM geometries
+    """,
+]
+
+
+def default_cache_dir():
+    """Return the cache directory, honouring WKLS_CACHE_DIR and XDG_CACHE_HOME."""
+    directory = os.environ.get("WKLS_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "wkls")
+
+
+def default_max_bytes():
+    """Return the cache size limit, honouring WKLS_CACHE_MAX_BYTES."""
+    value = os.environ.get("WKLS_CACHE_MAX_BYTES")
+    return int(value) if value else DEFAULT_MAX_BYTES
+
+
+class GeometryCache:
+    """An LRU cache of raw WKB geometries stored in a SQLite file on disk.
+
+    Entries are keyed by (Overture version, GERS id). SQLite's file locking
+    makes the cache safe to share between several worker processes, and each
+    thread gets its own connection. Each version only sees its own entries,
+    so engines for several releases can share the cache file; entries of a
+    release that is no longer used are never read again and are the first to
+    be evicted.
+
+    Hits only read the file, so readers in different processes never wait on
+    each other. Their access times are buffered and written in batches (see
+    RECENCY_BATCH_SIZE), at the latest with the next put(). The total size is
+    kept in a meta row updated in the same transaction as each write, so
+    eviction does not sum the whole table.
+
+    A cache directory or file that cannot be used (read-only home, locked or
+    corrupt file) makes the cache unavailable rather than failing lookups: a
+    warning is issued once, get() then returns None and put() does nothing.
+    """
+
+    def __init__(self, version, directory=None, max_bytes=None):
+        self.version = version
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = default_max_bytes() if max_bytes is None else max_bytes
+        self.path = os.path.join(self.directory, "geometries.sqlite")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._touched = {}
+        self._flushed = time.monotonic()
+        self.available = True
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._connect()
+        except (OSError, sqlite3.Error) as e:
+            self._disable(e)
+
+    def _disable(self, error):
+        if self.available:
+            self.available = False
+            warnings.warn(
+                f"The geometry cache at {self.path} cannot be used ({error}); "
+                "geometries are fetched without it.",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with _Transaction(conn):
+                for statement in SCHEMA:
+                    conn.execute(statement)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._connect())
+
+    def get(self, geom_id):
+        """Return the cached WKB for an id, or None if it is not cached."""
+        if not self.available:
+            return None
+        try:
+            return self._get(geom_id)
+        except (OSError, sqlite3.Error) as e:
+            self._disable(e)
+            return None
+
+    def _get(self, geom_id):
+        row = (
+            self._connect()
+            .execute(
+                "SELECT wkb FROM geometries WHERE version = ? AND id = ?",
+                (self.version, geom_id),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        with self._lock:
+            self._touched[geom_id] = time.time()
+            due = (
+                len(self._touched) >= RECENCY_BATCH_SIZE
+                or time.monotonic() - self._flushed >= RECENCY_INTERVAL
+            )
+        if due:
+            with self._transaction() as conn:
+                self._write_recency(conn)
+        return bytes(row[0])
+
+    def _write_recency(self, conn):
+        """Write the buffered access times of cache hits."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            self._flushed = time.monotonic()
+        conn.executemany(
+            "UPDATE geometries SET accessed = ? WHERE version = ? AND id = ?",
+            [
+                (accessed, self.version, geom_id)
+                for geom_id, accessed in touched.items()
+            ],
+        )
+
+    def put(self, geom_id, wkb):
+        """Store the WKB for an id, evicting least recently used entries."""
+        if not self.available:
+            return
+        try:
+            self._put(geom_id, wkb)
+        except (OSError, sqlite3.Error) as e:
+            self._disable(e)
+
+    def _put(self, geom_id, wkb):
+        size = len(wkb)
+        if size > self.max_bytes:
+            return
+        with self._transaction() as conn:
+            self._write_recency(conn)
+            old = conn.execute(
+                "SELECT size FROM geometries WHERE version = ? AND id = ?",
+                (self.version, geom_id),
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO geometries VALUES (?, ?, ?, ?, ?)",
+                (self.version, geom_id, bytes(wkb), size, time.time()),
+            )
+            self._add_size(conn, size - (old[0] if old else 0))
+            self._evict(conn)
+
+    def _add_size(self, conn, delta):
+        conn.execute(
+            "UPDATE meta SET value = value + ? WHERE key = 'total_size'", (delta,)
+        )
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT value FROM meta WHERE key = 'total_size'")
+        excess = total.fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        freed = 0
+        for rowid, size in conn.execute(
+            "SELECT rowid, size FROM geometries ORDER BY accessed"
+        ):
+            victims.append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM geometries WHERE rowid = ?", victims)
+        self._add_size(conn, -freed)
+
+    def size(self):
+        """Return the number of WKB bytes currently cached for this version."""
+        return (
+            self._connect()
+            .execute(
+                "SELECT COALESCE(SUM(size), 0) FROM geometries WHERE version = ?",
+                (self.version,),
+            )
+            .fetchone()[0]
+        )
+
+    def clear(self):
+        """Remove every cached geometry of this version."""
+        with self._lock:
+            self._touched.clear()
+        with self._transaction() as conn:
+            self._add_size(conn, -self.size())
+            conn.execute("DELETE FROM geometries WHERE version = ?", (self.version,))
+
+
+class NegativeCache:
+    """Remembers keys that did not resolve, for a limited time.
+
+    Lets repeated lookups of a misspelled place or an id without geometry fail
+    fast instead of triggering a new scan each time. At most max_entries keys
+    are kept; the oldest are dropped first.
+    """
+
+    def __init__(self, ttl=DEFAULT_NEGATIVE_TTL, max_entries=100_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._expiry = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        expiry = self._expiry.get(key)
+        if expiry is None:
+            return False
+        if expiry < time.monotonic():
+            with self._lock:
+                self._expiry.pop(key, None)
+            return False
+        return True
+
+    def add(self, key):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._expiry.pop(key, None)
+            self._expiry[key] = time.monotonic() + self.ttl
+            while len(self._expiry) > self.max_entries:
+                del self._expiry[next(iter(self._expiry))]
+
+    def clear(self):
+        with self._lock:
+            self._expiry.clear()
+
+
+class _Transaction:
+    """Run a block of statements in an immediate SQLite transaction."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
@@ -0,0 +1,112 @@
+import argparse
+import sys
+
+from .engine import WklsEngine, sql_string
+from .export import EXPORT_FORMATS, export_divisions
+from .extract import EXTRACT_ROW_GROUP_SIZE, extract_division_area
+
+
+def extract_command(args):
+    engine = WklsEngine(geometry_source=args.source, cache_enabled=False)
+    countries = [c for part in args.countries for c in part.split(",") if c]
+    count = extract_division_area(
+        engine, countries, args.output, row_group_size=args.row_group_size
+    )
+    print(f"Wrote {count} division_area rows to {args.output}", file=sys.stderr)
+
+
+def export_command(args):
+    engine = WklsEngine(
+        metadata_path=args.metadata, geometry_source=args.source, cache_enabled=False
+    )
+    if args.memory_limit:
+        engine.cursor().execute(f"SET memory_limit = {sql_string(args.memory_limit)}")
+    chain = args.chain.lower().split(".")
+    subtypes = [s for part in args.subtypes or [] for s in part.split(",") if s]
+
+    def progress(percent):
+        print(f"\rExporting {args.chain}: {percent:5.1f}%", end="", file=sys.stderr)
+
+    count = export_divisions(
+        engine,
+        chain,
+        args.output,
+        subtypes=subtypes,
+        fmt=args.format,
+        progress=None if args.quiet else progress,
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Wrote {count} divisions to {args.output}", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="wkls", description="Well-Known Locations command line tools"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract = commands.add_parser(
+        "extract",
+        help="copy the division_area rows of some countries into a local GeoParquet file",
+    )
+    extract.add_argument(
+        "countries", nargs="+", help="ISO 3166-1 alpha-2 country codes, e.g. US DE"
+    )
+    extract.add_argument("-o", "--output", required=True, help="output parquet path")
+    extract.add_argument(
+        "--source", help="division_area location to read from (default: S3 release)"
+    )
+    extract.add_argument(
+        "--row-group-size",
+        type=int,
+        default=EXTRACT_ROW_GROUP_SIZE,
+        help=f"rows per parquet row group (default: {EXTRACT_ROW_GROUP_SIZE})",
+    )
+    extract.set_defaults(func=extract_command)
+
+    export = commands.add_parser(
+        "export",
+        help="write the divisions under a chain, with geometries, to a file",
+    )
+    export.add_argument("chain", help="dotted chain, e.g. us or us.ca")
+    export.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="output path (.parquet, .fgb or .ndjson)",
+    )
+    export.add_argument(
+        "--subtypes", nargs="+", help="subtypes to export, e.g. county locality"
+    )
+    export.add_argument(
+        "--format",
+        choices=list(EXPORT_FORMATS),
+        help="output format (default: inferred from the output extension)",
+    )
+    export.add_argument(
+        "--source", help="division_area location to read from (default: S3 release)"
+    )
+    export.add_argument("--metadata", help="metadata parquet (default: packaged)")
+    export.add_argument(
+        "--memory-limit", help="DuckDB memory limit for the export, e.g. 2GB"
+    )
+    export.add_argument(
+        "-q", "--quiet", action="store_true", help="do not report progress"
+    )
+    export.set_defaults(func=export_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except ValueError as e:
+        print(f"wkls: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
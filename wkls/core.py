@@ -1,156 +1,370 @@
-import duckdb
-import importlib.resources
-from . import data
-import pandas as pd
-
-# Overture Maps dataset version
-OVERTURE_VERSION = "2025-05-21.0"
-S3_PARQUET_PATH = f"s3://overturemaps-us-west-2/release/{OVERTURE_VERSION}/theme=divisions/type=division_area/*"
-
-COUNTRY_QUERY = """
-    SELECT * FROM wkls
-    WHERE country = ?
-      AND subtype = 'country'
-"""
-
-REGION_QUERY = """
-    SELECT * FROM wkls
-    WHERE country = ?
-      AND region = ?
-      AND subtype = 'region'
-"""
-
-CITY_QUERY = """
-    SELECT * FROM wkls
-    WHERE country = ?
-      AND region = ?
-      AND subtype IN ('county', 'locality', 'localadmin')
-      AND REPLACE(name, ' ', '') ILIKE REPLACE(?, ' ', '')
-"""
-
-
-def _initialize_table():
-    """Initialize the wkls table if it doesn't exist. Called once per module import."""
-    # Install and load the spatial extension
-    duckdb.sql("INSTALL spatial")
-    duckdb.load_extension("spatial")
-    duckdb.sql(f"""
-        CREATE TABLE IF NOT EXISTS wkls AS
-        SELECT id, country, region, subtype, name, division_id
-        FROM '{importlib.resources.files(data)}/overture_zstd22.parquet'
-    """)
-
-
-# Initialize the table when the module is imported
-_initialize_table()
-
-
-class ChainableDataFrame(pd.DataFrame):
-    """A DataFrame that maintains chaining capability for the wkls library."""
+import asyncio
 
-    _metadata = ["_chain"]
+from .diff import DIFF_COLUMNS, diff_releases
+from .engine import (
+    BATCH_CHUNK_SIZE,
+    # Queries and settings that used to live here, still importable from wkls.core
+    CITY_QUERY,  # noqa: F401
+    COUNTRY_QUERY,  # noqa: F401
+    OVERTURE_VERSION,  # noqa: F401
+    REGION_QUERY,  # noqa: F401
+    S3_PARQUET_PATH,  # noqa: F401
+    SPATIAL_COLUMNS,
+    default_engine,
+    release_engine,
+    simplify_params,
+)
+from .export import export_divisions
+from .join import spatial_join
+from .locate import LOCATE_CHUNK_SIZE, locate_points
+from .parallel import fetch_parallel
+from .results import fetch, from_rows, pd, with_geoarrow_wkb
 
-    def __init__(self, data, chain=None):
-        super().__init__(data)
-        object.__setattr__(self, "_chain", chain or [])
+GEOMETRY_FORMATS = {
+    "wkt": "ST_AsText(geometry)",
+    "wkb": "ST_AsWKB(geometry)",
+    "hexwkb": "ST_AsHEXWKB(geometry)",
+    "geojson": "ST_AsGeoJSON(geometry)",
+    "svg": "ST_AsSVG(geometry)",
+}
 
-    def __getattr__(self, attr):
-        # Avoid infinite recursion for pandas internal attributes
-        if attr.startswith("_") or attr in ["_chain"]:
-            raise AttributeError(
-                f"'{self.__class__.__name__}' object has no attribute '{attr}'"
-            )
+# Methods that only make sense on the root wkls object
+ROOT_ONLY_METHODS = {
+    "overture_version",
+    "configure_cache",
+    "clear_cache",
+    "geometries",
+    "warmup",
+    "cache_info",
+    "cache_clear",
+    "configure_source",
+    "aget",
+    "fetch_info",
+    "locate",
+    "locate_many",
+    "within_bbox",
+    "configure_backend",
+    "search",
+    "release",
+    "diff",
+    "changed_since",
+    "stats",
+    "configure_stats",
+    "fetch_parallel",
+    "spatial_join",
+}
 
-        # Block root-level only methods
-        if attr == "overture_version":
-            raise AttributeError(
-                f"'{attr}' is only available at the root level. Use wkls.{attr}(), not on chained objects."
-            )
+BBOX_COLUMNS = ["xmin", "ymin", "xmax", "ymax"]
+CENTROID_COLUMNS = ["centroid_lon", "centroid_lat"]
+CHANGE_COLUMNS = ["id", "change", "geometry_hash", "geometry_size"]
 
-        # Continue chaining
-        new_wkl = Wkl(self._chain + [attr.lower()])
-        # Validate chain length immediately
-        if len(new_wkl.chain) > 3:
-            raise ValueError("Too many chained attributes (max = 3)")
-        if len(new_wkl.chain) <= 3:
-            df = new_wkl.resolve()
-            return ChainableDataFrame(df, new_wkl.chain)
-        return new_wkl
 
-    def __getitem__(self, key):
-        # If it's a regular pandas indexing operation, use parent class
-        if isinstance(key, (str, list, slice)) and not (
-            isinstance(key, str) and "%" in key
-        ):
-            return super().__getitem__(key)
+class ChainMethods:
+    """Geometry, listing and export methods of chained results.
 
-        # Otherwise, handle chaining with search patterns
-        new_wkl = Wkl(self._chain + [key.lower()])
-        # Validate chain length immediately
-        if len(new_wkl.chain) > 3 and "%" not in str(key):
-            raise ValueError("Too many chained attributes (max = 3)")
-        if "%" in str(key):
-            return new_wkl.resolve()
-        return new_wkl
+    Shared by ChainableDataFrame and ChainableTable, which provide _chain,
+    _engine, _first_id() and _first_row().
+    """
 
-    def wkt(self):
+    def wkt(self, tolerance=None, lod=None, precision=None):
         """Get WKT geometry for the first result."""
-        wkl = Wkl(self._chain)
-        return wkl.wkt()
+        wkl = Wkl(self._chain, self._engine)
+        return wkl._get_geom_expr(
+            GEOMETRY_FORMATS["wkt"], self._first_id(), tolerance, lod, precision
+        )
 
-    def wkb(self):
+    def wkb(self, tolerance=None, lod=None, precision=None):
         """Get WKB geometry for the first result."""
-        wkl = Wkl(self._chain)
-        return wkl.wkb()
+        wkl = Wkl(self._chain, self._engine)
+        return wkl._get_geom_expr(
+            GEOMETRY_FORMATS["wkb"], self._first_id(), tolerance, lod, precision
+        )
 
-    def hexwkb(self):
+    def hexwkb(self, tolerance=None, lod=None, precision=None):
         """Get HEX WKB geometry for the first result."""
-        wkl = Wkl(self._chain)
-        return wkl.hexwkb()
+        wkl = Wkl(self._chain, self._engine)
+        return wkl._get_geom_expr(
+            GEOMETRY_FORMATS["hexwkb"], self._first_id(), tolerance, lod, precision
+        )
 
-    def geojson(self):
+    def geojson(self, tolerance=None, lod=None, precision=None):
         """Get GeoJSON geometry for the first result."""
-        wkl = Wkl(self._chain)
-        return wkl.geojson()
+        wkl = Wkl(self._chain, self._engine)
+        return wkl._get_geom_expr(
+            GEOMETRY_FORMATS["geojson"], self._first_id(), tolerance, lod, precision
+        )
 
-    def svg(self):
+    def svg(self, tolerance=None, lod=None, precision=None):
         """Get SVG geometry for the first result."""
-        wkl = Wkl(self._chain)
-        return wkl.svg()
+        wkl = Wkl(self._chain, self._engine)
+        return wkl._get_geom_expr(
+            GEOMETRY_FORMATS["svg"], self._first_id(), tolerance, lod, precision
+        )
+
+    def children(self, subtype=None):
+        """Get the divisions directly below the current chain."""
+        wkl = Wkl(self._chain, self._engine)
+        return wkl.children(subtype)
+
+    def parents(self):
+        """Get the divisions directly above the current chain."""
+        wkl = Wkl(self._chain, self._engine)
+        return wkl.parents()
+
+    def ancestors(self):
+        """Get every division above the current chain, nearest first."""
+        wkl = Wkl(self._chain, self._engine)
+        return wkl.ancestors()
+
+    def descendants(self, subtype=None):
+        """Get every division below the current chain, level by level."""
+        wkl = Wkl(self._chain, self._engine)
+        return wkl.descendants(subtype)
+
+    def geometry_hash(self):
+        """Get the MD5 hex digest of the WKB geometry of the first result."""
+        return self._engine.geometry_digest(self._first_id())[0]
+
+    def geometry_size(self):
+        """Get the size in bytes of the WKB geometry of the first result."""
+        return self._engine.geometry_digest(self._first_id())[1]
+
+    def export(self, path, subtypes=None, fmt=None, progress=None):
+        """Export the divisions under the current chain to a file."""
+        wkl = Wkl(self._chain, self._engine)
+        return wkl.export(path, subtypes, fmt, progress)
+
+    def bbox(self):
+        """Get the bounding box (xmin, ymin, xmax, ymax) of the first result."""
+        wkl = Wkl(self._chain, self._engine)
+        return wkl._first_values(BBOX_COLUMNS, self._first_row())
+
+    def centroid(self):
+        """Get a representative (lon, lat) point of the first result."""
+        wkl = Wkl(self._chain, self._engine)
+        return wkl._first_values(CENTROID_COLUMNS, self._first_row())
 
     def countries(self):
         """Get all countries."""
-        wkl = Wkl(self._chain)
+        wkl = Wkl(self._chain, self._engine)
         return wkl.countries()
 
     def regions(self):
         """Get regions for the current chain."""
-        wkl = Wkl(self._chain)
+        wkl = Wkl(self._chain, self._engine)
         return wkl.regions()
 
     def counties(self):
         """Get counties for the current chain."""
-        wkl = Wkl(self._chain)
+        wkl = Wkl(self._chain, self._engine)
         return wkl.counties()
 
     def cities(self):
         """Get cities for the current chain."""
-        wkl = Wkl(self._chain)
+        wkl = Wkl(self._chain, self._engine)
         return wkl.cities()
 
     def subtypes(self):
         """Get all subtypes."""
-        wkl = Wkl(self._chain)
+        wkl = Wkl(self._chain, self._engine)
         return wkl.subtypes()
 
+    async def awkt(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of wkt(), run on the engine's async executor."""
+        wkl = Wkl(self._chain, self._engine)
+        expr = GEOMETRY_FORMATS["wkt"]
+        return await wkl._aget_geom_expr(
+            expr, self._first_id(), timeout, tolerance, lod, precision
+        )
+
+    async def awkb(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of wkb(), run on the engine's async executor."""
+        wkl = Wkl(self._chain, self._engine)
+        expr = GEOMETRY_FORMATS["wkb"]
+        return await wkl._aget_geom_expr(
+            expr, self._first_id(), timeout, tolerance, lod, precision
+        )
+
+    async def ahexwkb(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of hexwkb(), run on the engine's async executor."""
+        wkl = Wkl(self._chain, self._engine)
+        expr = GEOMETRY_FORMATS["hexwkb"]
+        return await wkl._aget_geom_expr(
+            expr, self._first_id(), timeout, tolerance, lod, precision
+        )
+
+    async def ageojson(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of geojson(), run on the engine's async executor."""
+        wkl = Wkl(self._chain, self._engine)
+        expr = GEOMETRY_FORMATS["geojson"]
+        return await wkl._aget_geom_expr(
+            expr, self._first_id(), timeout, tolerance, lod, precision
+        )
+
+    async def asvg(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of svg(), run on the engine's async executor."""
+        wkl = Wkl(self._chain, self._engine)
+        expr = GEOMETRY_FORMATS["svg"]
+        return await wkl._aget_geom_expr(
+            expr, self._first_id(), timeout, tolerance, lod, precision
+        )
+
+    async def acountries(self, timeout=None):
+        """Coroutine variant of countries()."""
+        wkl = Wkl(self._chain, self._engine)
+        return await wkl.acountries(timeout)
+
+    async def aregions(self, timeout=None):
+        """Coroutine variant of regions()."""
+        wkl = Wkl(self._chain, self._engine)
+        return await wkl.aregions(timeout)
+
+    async def acounties(self, timeout=None):
+        """Coroutine variant of counties()."""
+        wkl = Wkl(self._chain, self._engine)
+        return await wkl.acounties(timeout)
+
+    async def acities(self, timeout=None):
+        """Coroutine variant of cities()."""
+        wkl = Wkl(self._chain, self._engine)
+        return await wkl.acities(timeout)
+
+    async def asubtypes(self, timeout=None):
+        """Coroutine variant of subtypes()."""
+        wkl = Wkl(self._chain, self._engine)
+        return await wkl.asubtypes(timeout)
+
+
+# Without pandas the class still exists (for isinstance checks) but is never built
+_DataFrame = pd.DataFrame if pd is not None else object
+
+
+class ChainableDataFrame(ChainMethods, _DataFrame):
+    """A DataFrame that maintains chaining capability for the wkls library."""
+
+    _metadata = ["_chain", "_engine"]
+
+    def __init__(self, data, chain=None, engine=None):
+        super().__init__(data)
+        object.__setattr__(self, "_chain", chain or [])
+        object.__setattr__(self, "_engine", engine)
+
+    def __getattr__(self, attr):
+        # Avoid infinite recursion for pandas internal attributes
+        if attr.startswith("_") or attr in ["_chain", "_engine"]:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{attr}'"
+            )
+
+        # Block root-level only methods
+        if attr in ROOT_ONLY_METHODS:
+            raise AttributeError(
+                f"'{attr}' is only available at the root level. Use wkls.{attr}(), not on chained objects."
+            )
+
+        # Continue chaining
+        new_wkl = Wkl(self._chain + [attr.lower()], self._engine)
+        return new_wkl._chained()
+
+    def __getitem__(self, key):
+        # If it's a regular pandas indexing operation, use parent class
+        if isinstance(key, (str, list, slice)) and not (
+            isinstance(key, str) and "%" in key
+        ):
+            return super().__getitem__(key)
+
+        # Otherwise, handle chaining with search patterns
+        new_wkl = Wkl(self._chain + [key.lower()], self._engine)
+        if "%" in str(key):
+            return new_wkl.resolve()
+        return new_wkl
+
+    def _first_id(self):
+        """Return the id of the first row, or None if there is nothing to reuse."""
+        if "id" in self.columns and len(self):
+            return self["id"].iloc[0]
+        return None
+
+    def _first_row(self):
+        """Return the first row as a dict, or None if the frame is empty."""
+        if len(self):
+            return self.iloc[0].to_dict()
+        return None
+
     @property
     def _constructor(self):
         return ChainableDataFrame
 
 
+class ChainableTable(ChainMethods):
+    """A pyarrow Table of resolved rows that keeps the chaining API.
+
+    Returned by chained lookups with the arrow backend. Table attributes such
+    as num_rows, column() or to_pylist() are forwarded to the underlying
+    table, which is also available as .table and through the Arrow C stream
+    interface (so pyarrow.table() or polars.from_arrow() take it without a
+    copy). Any other attribute continues the chain.
+    """
+
+    def __init__(self, table, chain=None, engine=None):
+        self.table = table
+        self._chain = chain or []
+        self._engine = engine
+
+    def __arrow_c_stream__(self, requested_schema=None):
+        return self.table.__arrow_c_stream__(requested_schema)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def __repr__(self):
+        return repr(self.table)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{attr}'"
+            )
+
+        # Block root-level only methods
+        if attr in ROOT_ONLY_METHODS:
+            raise AttributeError(
+                f"'{attr}' is only available at the root level. Use wkls.{attr}(), not on chained objects."
+            )
+
+        if hasattr(self.table, attr):
+            return getattr(self.table, attr)
+
+        # Continue chaining
+        new_wkl = Wkl(self._chain + [attr.lower()], self._engine)
+        return new_wkl._chained()
+
+    def __getitem__(self, key):
+        # Column names and positions index the table, anything else chains
+        if isinstance(key, int) or key in self.table.column_names:
+            return self.table[key]
+        new_wkl = Wkl(self._chain + [key.lower()], self._engine)
+        if "%" in key:
+            return new_wkl.resolve()
+        return new_wkl
+
+    def _first_id(self):
+        """Return the id of the first row, or None if there is nothing to reuse."""
+        if "id" in self.table.column_names and self.table.num_rows:
+            return self.table.column("id")[0].as_py()
+        return None
+
+    def _first_row(self):
+        """Return the first row as a dict, or None if the table is empty."""
+        if self.table.num_rows:
+            return self.table.slice(0, 1).to_pylist()[0]
+        return None
+
+
 class Wkl:
-    def __init__(self, chain=None):
+    def __init__(self, chain=None, engine=None):
         self.chain = chain or []
+        self.engine = engine or default_engine()
 
     def overture_version(self):
         """Return the version of the Overture Maps dataset being used.
@@ -162,24 +376,535 @@ class Wkl:
             raise ValueError(
                 "overture_version() is only available at the root level. Use wkls.overture_version(), not wkls.us.overture_version()."
             )
-        return OVERTURE_VERSION
+        return self.engine.version
+
+    def warmup(self):
+        """Load the spatial extension and the metadata table up front.
+
+        wkls loads both lazily on first use; services that prefer to pay the
+        startup cost before serving requests can call wkls.warmup() instead.
+        """
+        if self.chain:
+            raise ValueError(
+                "warmup() is only available at the root level. Use wkls.warmup()."
+            )
+        self.engine.warmup()
+
+    def configure_source(self, geometry_source=None):
+        """Configure where geometries are read from.
+
+        This method is only available at the root level. The source may be a
+        local directory of division_area parquet files (e.g. one written by
+        `wkls extract`), a file:// path or glob, or a mirror URL. Pass None to
+        go back to $WKLS_GEOMETRY_SOURCE or the Overture release on S3.
+        """
+        if self.chain:
+            raise ValueError(
+                "configure_source() is only available at the root level. Use wkls.configure_source()."
+            )
+        self.engine.configure_source(geometry_source)
+
+    def configure_backend(self, backend=None):
+        """Choose the result type of lookups and listings: "pandas" or "arrow".
+
+        With "arrow", chained lookups return ChainableTable objects wrapping a
+        pyarrow Table, listings return pyarrow Tables straight from DuckDB and
+        bulk WKB geometries are tagged as GeoArrow WKB. Without an argument,
+        $WKLS_BACKEND or the default (pandas when installed) is restored.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "configure_backend() is only available at the root level. Use wkls.configure_backend()."
+            )
+        self.engine.configure_backend(backend)
+
+    def configure_cache(self, directory=None, max_bytes=None, enabled=True):
+        """Configure the local on-disk geometry cache.
+
+        This method is only available at the root level. By default geometries
+        are cached under ~/.cache/wkls (or $WKLS_CACHE_DIR) up to 512 MiB.
+        """
+        if self.chain:
+            raise ValueError(
+                "configure_cache() is only available at the root level. Use wkls.configure_cache()."
+            )
+        self.engine.configure_cache(
+            directory=directory, max_bytes=max_bytes, enabled=enabled
+        )
+
+    def cache_info(self):
+        """Return hit/miss statistics of the in-memory chain resolution cache.
+
+        Resolved chains are memoized per normalized chain in a bounded LRU, so
+        repeated lookups of the same place skip resolution entirely.
+        """
+        if self.chain:
+            raise ValueError(
+                "cache_info() is only available at the root level. Use wkls.cache_info()."
+            )
+        return self.engine.resolve_cache_info()
+
+    def cache_clear(self):
+        """Empty the in-memory chain resolution and negative caches."""
+        if self.chain:
+            raise ValueError(
+                "cache_clear() is only available at the root level. Use wkls.cache_clear()."
+            )
+        self.engine.resolve_cache_clear()
+
+    def fetch_info(self):
+        """Return geometry fetch counters: hits, misses, coalesced and negative_hits.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "fetch_info() is only available at the root level. Use wkls.fetch_info()."
+            )
+        return self.engine.fetch_info()
+
+    def stats(self, reset=False):
+        """Return a snapshot of per-phase timings and cache counters.
+
+        The result has three fields: phases maps "resolve", "fetch",
+        "convert" and "list" to their calls, wall time in seconds, rows
+        returned, bytes and files read from the geometry source and errors;
+        fetch holds the geometry cache counters of fetch_info(); and
+        resolve_cache the chain resolution cache statistics. Phases are only
+        recorded after wkls.configure_stats() (or with WKLS_STATS=1). reset
+        zeroes the phase totals after the snapshot.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "stats() is only available at the root level. Use wkls.stats()."
+            )
+        return self.engine.stats(reset)
+
+    def configure_stats(self, enabled=True, hooks=None):
+        """Turn per-phase instrumentation on or off.
+
+        While enabled, every resolution, geometry fetch, format conversion and
+        listing is timed, and queries reading the geometry source report the
+        bytes and files DuckDB read. hooks, if given, replace the callables
+        that receive each finished phase as a wkls.stats.Event, e.g. to
+        export it to OpenTelemetry or Prometheus. Disabled, the only cost is a
+        flag check per phase.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "configure_stats() is only available at the root level. Use wkls.configure_stats()."
+            )
+        self.engine.configure_stats(enabled, hooks)
+
+    def clear_cache(self):
+        """Remove every geometry from the local on-disk cache."""
+        if self.chain:
+            raise ValueError(
+                "clear_cache() is only available at the root level. Use wkls.clear_cache()."
+            )
+        cache = self.engine.geometry_cache()
+        if cache is not None:
+            cache.clear()
+
+    def geometries(
+        self,
+        items,
+        fmt="wkb",
+        chunk_size=BATCH_CHUNK_SIZE,
+        tolerance=None,
+        lod=None,
+        precision=None,
+    ):
+        """Fetch geometries for many chains or GERS ids in bulk.
+
+        Each item may be a dotted chain ("us.ca.sanfrancisco"), a list of chain
+        parts, a chained wkls object or a GERS id. Chains are resolved against
+        the in-memory metadata table, ids are deduplicated and all geometries
+        are read with one division_area scan per chunk of ids.
+
+        Returns a DataFrame with one row per input, in input order, with
+        columns input, id, geometry and error. Inputs that could not be
+        resolved have a null geometry and the reason in the error column.
+        tolerance, lod and precision simplify the geometries as in wkt().
+        """
+        if self.chain:
+            raise ValueError(
+                "geometries() is only available at the root level. Use wkls.geometries()."
+            )
+        if fmt not in GEOMETRY_FORMATS:
+            raise ValueError(
+                f"Unknown geometry format: {fmt}. Use one of {', '.join(GEOMETRY_FORMATS)}."
+            )
+        tolerance, precision = simplify_params(tolerance, lod, precision)
+        # items is read twice; a generator would be exhausted by the first pass
+        items = list(items)
+
+        # Strings without dots may be GERS ids rather than country codes
+        candidates = [
+            item for item in items if isinstance(item, str) and "." not in item
+        ]
+        known_ids = set()
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start : start + chunk_size]
+            placeholders = ", ".join("?" for _ in chunk)
+            query = f"SELECT id FROM wkls WHERE id IN ({placeholders})"
+            known_ids.update(
+                row[0] for row in self.engine.sql(query, params=chunk).fetchall()
+            )
+
+        resolved = {}
+        rows = []
+        for item in items:
+            if isinstance(item, str) and item in known_ids:
+                rows.append([item, item, None])
+                continue
+            if isinstance(item, (Wkl, ChainableDataFrame, ChainableTable)):
+                chain = item.chain if isinstance(item, Wkl) else item._chain
+            elif isinstance(item, str):
+                chain = item.lower().split(".")
+            else:
+                chain = [str(part).lower() for part in item]
+            key = tuple(chain)
+            if key not in resolved:
+                try:
+                    geom_id = Wkl(list(chain), self.engine)._first_resolved_id()
+                    resolved[key] = (geom_id, None)
+                except ValueError as e:
+                    resolved[key] = (None, str(e))
+            rows.append([".".join(chain), *resolved[key]])
+
+        ids = [geom_id for _, geom_id, _ in rows if geom_id is not None]
+        # Simplified variants are cached apart from the full geometries
+        wkbs = self.engine.fetch_wkb_simplified_many(
+            ids, tolerance, precision, chunk_size=chunk_size
+        )
+        if fmt == "wkb":
+            converted = wkbs
+        else:
+            values = self.engine.convert_wkb_many(
+                list(wkbs.values()), GEOMETRY_FORMATS[fmt]
+            )
+            converted = dict(zip(wkbs, values))
+
+        records = []
+        for label, geom_id, error in rows:
+            geometry = converted.get(geom_id) if geom_id is not None else None
+            if geom_id is not None and geom_id not in converted:
+                error = f"No geometry found for ID: {geom_id}"
+            records.append((label, geom_id, geometry, error))
+        columns = ["input", "id", "geometry", "error"]
+        if self.engine.backend != "arrow":
+            return pd.DataFrame(records, columns=columns)
+        if fmt != "wkb":
+            return from_rows(columns, records, "arrow")
+        table = from_rows(columns, records, "arrow", binary_columns=["geometry"])
+        return with_geoarrow_wkb(table)
+
+    def fetch_parallel(
+        self,
+        ids,
+        workers=None,
+        fmt="wkb",
+        chunk_size=BATCH_CHUNK_SIZE,
+        memory_limit=None,
+    ):
+        """Fetch many geometries by GERS id on a pool of worker processes.
+
+        Returns an iterator of (id, geometry) pairs in completion order. Ids
+        are grouped by the division_area files that can contain them, and each
+        of the `workers` processes (one per core by default) reads a disjoint
+        set of files on its own DuckDB connection, optionally capped by a
+        DuckDB memory_limit such as "2GB". Meant for large batch jobs against
+        a local mirror:
+
+            ids = wkls.us.ca.cities()["id"]
+            for geom_id, wkb in wkls.fetch_parallel(ids, workers=8):
+                ...
+
+        Workers are spawned, so scripts must guard their entry point with
+        `if __name__ == "__main__":`. This method is only available at the
+        root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "fetch_parallel() is only available at the root level. Use wkls.fetch_parallel()."
+            )
+        if fmt not in GEOMETRY_FORMATS:
+            raise ValueError(
+                f"Unknown geometry format: {fmt}. Use one of {', '.join(GEOMETRY_FORMATS)}."
+            )
+        return fetch_parallel(
+            self.engine,
+            list(ids),
+            workers=workers,
+            expr=GEOMETRY_FORMATS[fmt],
+            chunk_size=chunk_size,
+            memory_limit=memory_limit,
+        )
+
+    def locate(self, lon, lat):
+        """Return the divisions (country, region, county, locality) containing a point.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "locate() is only available at the root level. Use wkls.locate()."
+            )
+        df = locate_points(self.engine, [lon], [lat])
+        return df.drop(columns="point")
+
+    def locate_many(self, lons, lats=None, chunk_size=LOCATE_CHUNK_SIZE):
+        """Reverse geocode many points at once.
+
+        Takes arrays of longitudes and latitudes, or a DataFrame or table with
+        lon and lat columns. Returns one row per (point, containing division), where
+        point is the position of the point in the input.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "locate_many() is only available at the root level. Use wkls.locate_many()."
+            )
+        if lats is None:
+            try:
+                lons, lats = lons["lon"], lons["lat"]
+            except (KeyError, TypeError, IndexError) as e:
+                raise ValueError(
+                    "locate_many() takes lons and lats, or a table with lon and lat columns."
+                ) from e
+        return locate_points(self.engine, lons, lats, chunk_size=chunk_size)
+
+    def spatial_join(
+        self,
+        data,
+        level="county",
+        country=None,
+        lon="lon",
+        lat="lat",
+        geometry=None,
+        output=None,
+        prefix=None,
+    ):
+        """Tag the rows of a table with the boundaries of one level they fall in.
+
+        data is a DataFrame, a pyarrow Table or a Parquet path with lon and
+        lat columns (points) or a geometry column (WKB, WKT or GEOMETRY). The
+        id, name and region of each matching boundary are added as
+        county_id, county_name and county_region for level="county":
+
+            tagged = wkls.spatial_join(events, level="county", country="US")
+            wkls.spatial_join("events/*.parquet", output="tagged.parquet")
+
+        The join runs in DuckDB against only the boundaries overlapping the
+        input; with output, it is streamed to a Parquet file and the number
+        of rows written is returned.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "spatial_join() is only available at the root level. Use wkls.spatial_join()."
+            )
+        return spatial_join(
+            self.engine,
+            data,
+            level=level,
+            country=country,
+            lon=lon,
+            lat=lat,
+            geometry=geometry,
+            output=output,
+            prefix=prefix,
+        )
+
+    def release(self, version, metadata_path=None, geometry_source=None):
+        """Return a root wkls object bound to another Overture release.
+
+        Each release has its own engine, metadata table, geometry source and
+        geometry cache namespace, so several releases can be served side by
+        side. Without packaged metadata for the release, metadata_path can
+        point at it; otherwise it is read from the release's division_area.
+
+            old = wkls.release("2025-04-23.0")
+            old.us.ca.sanfrancisco.wkt()
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "release() is only available at the root level. Use wkls.release()."
+            )
+        return release_engine(version, metadata_path, geometry_source).root()
+
+    def diff(self, old, new=None, country=None):
+        """Report ids added, removed or with a changed geometry between two releases.
+
+        old and new are version strings or root objects from wkls.release();
+        new defaults to this object's release. Geometries are compared by
+        MD5 digests computed inside DuckDB. country optionally restricts the
+        comparison to one country. Returns rows with id, change ("added",
+        "removed" or "changed"), country, subtype and name.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "diff() is only available at the root level. Use wkls.diff()."
+            )
+        engines = [
+            side.engine if isinstance(side, Wkl) else release_engine(side)
+            for side in (old, self if new is None else new)
+        ]
+        rows = diff_releases(*engines, country=country)
+        return from_rows(DIFF_COLUMNS, rows, self.engine.backend)
+
+    def changed_since(self, hashes, chunk_size=BATCH_CHUNK_SIZE):
+        """Report which geometries changed since their digests were recorded.
+
+        hashes maps GERS ids to the geometry_hash() values seen earlier (a
+        dict or (id, digest) pairs). Current digests come from the metadata
+        table, the local cache or a scan that digests geometries inside
+        DuckDB, so unchanged geometries are never fetched. Returns rows with
+        id, change ("changed" or "removed"), and the current geometry_hash
+        and geometry_size; unchanged ids are left out.
+
+            changed = wkls.changed_since(previous)
+            wkls.geometries(list(changed["id"]))
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "changed_since() is only available at the root level. Use wkls.changed_since()."
+            )
+        hashes = dict(hashes)
+        current = self.engine.geometry_digests(hashes, chunk_size=chunk_size)
+        rows = []
+        for geom_id, digest in hashes.items():
+            if geom_id not in current:
+                rows.append((geom_id, "removed", None, None))
+            elif current[geom_id][0] != digest:
+                rows.append((geom_id, "changed", *current[geom_id]))
+        return from_rows(
+            CHANGE_COLUMNS, rows, self.engine.backend, int_columns=["geometry_size"]
+        )
+
+    def search(self, q, country=None, limit=10):
+        """Search places by name, for autocomplete and typo-tolerant lookups.
+
+        Names are compared without case, accents, spaces or punctuation, so
+        "sao paulo" finds "São Paulo". Prefix matches come first, followed by
+        fuzzy (trigram) matches when there are not enough of them. Results are
+        ranked by match quality and then by subtype, countries and regions
+        first. Returns the matching metadata rows with a score column.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "search() is only available at the root level. Use wkls.search()."
+            )
+        columns, rows = self.engine.search(q, country=country, limit=limit)
+        float_columns = SPATIAL_COLUMNS + ("score",)
+        return from_rows(
+            columns,
+            rows,
+            self.engine.backend,
+            float_columns,
+            int_columns=["geometry_size"],
+        )
+
+    def within_bbox(self, xmin, ymin, xmax, ymax, subtypes=None, intersects=False):
+        """List the divisions whose bounding box lies within a box.
+
+        With intersects=True, divisions whose bounding box merely overlaps the
+        box are included as well. subtypes optionally restricts the result,
+        e.g. ["locality"]. Answered from the local metadata table, without
+        reading any geometry.
+
+        This method is only available at the root level.
+        """
+        if self.chain:
+            raise ValueError(
+                "within_bbox() is only available at the root level. Use wkls.within_bbox()."
+            )
+        self._require_spatial_metadata()
+        if intersects:
+            condition = "xmax >= ? AND xmin <= ? AND ymax >= ? AND ymin <= ?"
+        else:
+            condition = "xmin >= ? AND xmax <= ? AND ymin >= ? AND ymax <= ?"
+        params = [xmin, xmax, ymin, ymax]
+        query = f"SELECT * FROM wkls WHERE {condition}"
+        if subtypes:
+            query += f" AND subtype IN ({', '.join('?' for _ in subtypes)})"
+            params.extend(subtypes)
+        return fetch(self.engine.sql(query, params=params), self.engine.backend)
+
+    def _require_spatial_metadata(self):
+        if not self.engine.has_spatial_metadata():
+            raise ValueError(
+                "The metadata table has no bbox columns; this metadata file does "
+                "not include them. Build them with scripts/build_metadata.py "
+                "--source <division_area> --output metadata.parquet and load the file "
+                "with wkls.release(wkls.overture_version(), "
+                "metadata_path='metadata.parquet')."
+            )
+
+    def _first_values(self, columns, row=None):
+        if row is None:
+            names, rows = self.engine.resolve(self.chain)
+            if not rows:
+                raise ValueError(f"No result found for: {'.'.join(self.chain)}")
+            row = dict(zip(names, rows[0]))
+        self._require_spatial_metadata()
+        return tuple(float(row[column]) for column in columns)
+
+    async def aget(
+        self, chain, fmt="wkt", timeout=None, tolerance=None, lod=None, precision=None
+    ):
+        """Fetch a geometry from asyncio code without blocking the event loop.
+
+        Resolution and the geometry fetch run on the engine's bounded executor,
+        and concurrent requests for the same geometry share a single fetch:
+
+            geojson = await wkls.aget("us.ca.sanfrancisco", "geojson", timeout=5)
+        """
+        if self.chain:
+            raise ValueError(
+                "aget() is only available at the root level. Use await wkls.aget()."
+            )
+        if fmt not in GEOMETRY_FORMATS:
+            raise ValueError(
+                f"Unknown geometry format: {fmt}. Use one of {', '.join(GEOMETRY_FORMATS)}."
+            )
+        if isinstance(chain, str):
+            chain = chain.lower().split(".")
+        else:
+            chain = [str(part).lower() for part in chain]
+        wkl = Wkl(chain, self.engine)
+        return await wkl._aget_geom_expr(
+            GEOMETRY_FORMATS[fmt], None, timeout, tolerance, lod, precision
+        )
 
     def __getattr__(self, attr):
-        new_wkl = Wkl(self.chain + [attr.lower()])
-        # Validate chain length immediately
-        if len(new_wkl.chain) > 3:
-            raise ValueError("Too many chained attributes (max = 3)")
-
-        if len(new_wkl.chain) <= 3:
-            df = new_wkl.resolve()
-            return ChainableDataFrame(df, new_wkl.chain)
-        return new_wkl
+        # Dunder lookups (e.g. from the import system or copy) are not places
+        if attr.startswith("__"):
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{attr}'"
+            )
+        new_wkl = Wkl(self.chain + [attr.lower()], self.engine)
+        return new_wkl._chained()
 
     def __getitem__(self, key):
-        new_wkl = Wkl(self.chain + [key.lower()])
-        # Validate chain length immediately
-        if len(new_wkl.chain) > 3 and "%" not in key:
-            raise ValueError("Too many chained attributes (max = 3)")
+        new_wkl = Wkl(self.chain + [key.lower()], self.engine)
         # If this looks like a search pattern (contains %), return DataFrame directly
         if "%" in key:
             return new_wkl.resolve()
@@ -193,65 +918,257 @@ class Wkl:
             raise ValueError(
                 "No attributes in the chain. Use wkls.country or wkls.country.region, etc."
             )
-        elif len(self.chain) == 1:
-            country_iso = self.chain[0].upper()
-            query = COUNTRY_QUERY
-            params = (country_iso,)
-        elif len(self.chain) == 2:
-            country_iso = self.chain[0].upper()
-            region_iso = country_iso + "-" + self.chain[1].upper()
-            query = REGION_QUERY
-            params = (country_iso, region_iso)
-        elif len(self.chain) == 3:
+
+        columns, rows = self.engine.resolve(self.chain)
+        return self._metadata_result(columns, rows)
+
+    def _chained(self):
+        """Resolve the chain into a chainable DataFrame or Table."""
+        table = self.resolve()
+        if self.engine.backend == "arrow":
+            return ChainableTable(table, self.chain, self.engine)
+        return ChainableDataFrame(table, self.chain, self.engine)
+
+    def _first_resolved_id(self):
+        columns, rows = self.engine.resolve(self.chain)
+        if not rows:
+            raise ValueError(f"No result found for: {'.'.join(self.chain)}")
+        return rows[0][columns.index("id")]
+
+    def _get_geom_expr(
+        self, expr: str, geom_id=None, tolerance=None, lod=None, precision=None
+    ):
+        tolerance, precision = simplify_params(tolerance, lod, precision)
+        if geom_id is None:
+            geom_id = self._first_resolved_id()
+        wkb = self.engine.fetch_wkb_simplified(geom_id, tolerance, precision)
+        # Derive the requested format locally from the (possibly cached) WKB
+        query = f"SELECT {expr} FROM (SELECT ST_GeomFromWKB(?) AS geometry)"
+        with self.engine.instrumentation.span("convert") as span:
+            value = self.engine.spatial_sql(query, params=(wkb,)).fetchone()[0]
+            span.add(rows=1)
+        return value
+
+    def _list(self, query):
+        with self.engine.instrumentation.span("list") as span:
+            result = fetch(self.engine.sql(query), self.engine.backend)
+            span.add(rows=len(result))
+        return result
+
+    def _list_stored(self, listing, *args):
+        """List rows of the memory-mapped metadata store (see wkls.store)."""
+        with self.engine.instrumentation.span("list") as span:
+            columns, rows = getattr(self.engine.store(), listing)(*args)
+            result = self._metadata_result(columns, rows)
+            span.add(rows=len(rows))
+        return result
+
+    def _list_region(self, subtypes):
+        """List the places of some subtypes in the chain's region, from memory."""
+        with self.engine.instrumentation.span("list") as span:
+            source = self.engine.store()
+            if source is None:
+                source = self.engine.hierarchy()
             country_iso = self.chain[0].upper()
             region_iso = country_iso + "-" + self.chain[1].upper()
-            query = CITY_QUERY
-            params = (country_iso, region_iso, self.chain[2])
-        return duckdb.sql(query, params=params).df()
+            rows = source.in_region(country_iso, region_iso, subtypes)
+            result = self._metadata_result(source.columns, rows)
+            span.add(rows=len(rows))
+        return result
+
+    def _metadata_result(self, columns, rows):
+        return from_rows(
+            columns,
+            rows,
+            self.engine.backend,
+            SPATIAL_COLUMNS,
+            int_columns=["geometry_size"],
+        )
 
-    def _get_geom_expr(self, expr: str):
-        df = self.resolve()
-        if df.empty:
+    def _related(self, relation, subtype=None):
+        if not self.chain:
+            raise ValueError(
+                f"{relation}() needs a chain. Use wkls.country.{relation}() or deeper."
+            )
+        if not self.engine.resolve(self.chain)[1]:
             raise ValueError(f"No result found for: {'.'.join(self.chain)}")
+        columns, rows = self.engine.related(self.chain, relation, subtype)
+        return self._metadata_result(columns, rows)
 
-        geom_id = df.iloc[0]["id"]
-        query = f"""
-            SELECT {expr}
-            FROM parquet_scan('{S3_PARQUET_PATH}')
-            WHERE id = '{geom_id}'
+    def children(self, subtype=None):
+        """List the divisions directly below this one.
+
+        subtype restricts the result to one subtype or a list of them, e.g.
+        wkls.us.ca.sanfrancisco.children("neighborhood"). Parent links come
+        from the metadata's parent_division_id column when present; otherwise
+        places are children of their region and regions of their country.
         """
-        result_df = duckdb.sql(query).df()
-        if result_df.empty:
-            raise ValueError(f"No geometry found for ID: {geom_id}")
-        return result_df.iloc[0, 0]
+        return self._related("children", subtype)
+
+    def parents(self):
+        """List the divisions directly above this one."""
+        return self._related("parents")
+
+    def ancestors(self):
+        """List every division above this one, nearest first."""
+        return self._related("ancestors")
 
-    def wkt(self):
-        return self._get_geom_expr("ST_AsText(geometry)")
+    def descendants(self, subtype=None):
+        """List every division below this one, level by level.
+
+        The walk only visits the subtree, so its cost grows with the number
+        of descendants rather than with the size of the metadata table.
+        """
+        return self._related("descendants", subtype)
 
-    def wkb(self):
-        return self._get_geom_expr("ST_AsWKB(geometry)")
+    def wkt(self, tolerance=None, lod=None, precision=None):
+        expr = GEOMETRY_FORMATS["wkt"]
+        return self._get_geom_expr(expr, None, tolerance, lod, precision)
 
-    def hexwkb(self):
-        return self._get_geom_expr("ST_AsHEXWKB(geometry)")
+    def wkb(self, tolerance=None, lod=None, precision=None):
+        expr = GEOMETRY_FORMATS["wkb"]
+        return self._get_geom_expr(expr, None, tolerance, lod, precision)
 
-    def geojson(self):
-        return self._get_geom_expr("ST_AsGeoJSON(geometry)")
+    def hexwkb(self, tolerance=None, lod=None, precision=None):
+        expr = GEOMETRY_FORMATS["hexwkb"]
+        return self._get_geom_expr(expr, None, tolerance, lod, precision)
 
-    def svg(self):
-        return self._get_geom_expr("ST_AsSVG(geometry)")
+    def geojson(self, tolerance=None, lod=None, precision=None):
+        expr = GEOMETRY_FORMATS["geojson"]
+        return self._get_geom_expr(expr, None, tolerance, lod, precision)
+
+    def svg(self, tolerance=None, lod=None, precision=None):
+        expr = GEOMETRY_FORMATS["svg"]
+        return self._get_geom_expr(expr, None, tolerance, lod, precision)
+
+    def bbox(self):
+        return self._first_values(BBOX_COLUMNS)
+
+    def geometry_hash(self):
+        """Return the MD5 hex digest of the WKB geometry, as returned by wkb().
+
+        Digests come from the metadata table when it carries them, so
+        comparing them is much cheaper than fetching geometries.
+        """
+        return self.engine.geometry_digest(self._first_resolved_id())[0]
+
+    def geometry_size(self):
+        """Return the size in bytes of the WKB geometry, as returned by wkb()."""
+        return self.engine.geometry_digest(self._first_resolved_id())[1]
+
+    def export(self, path, subtypes=None, fmt=None, progress=None):
+        """Export the divisions under this chain, with geometries, to a file.
+
+        fmt is "parquet" (GeoParquet), "flatgeobuf" or "geojsonseq"
+        (newline-delimited GeoJSON); by default it is inferred from the file
+        extension. subtypes restricts the export, e.g. ["county"]. The rows
+        are streamed to the file in one division_area scan. progress, if
+        given, is called with the completion percentage. Returns the number
+        of rows written.
+
+            wkls.us.ca.export("ca_counties.fgb", subtypes=["county"])
+        """
+        return export_divisions(self.engine, self.chain, path, subtypes, fmt, progress)
+
+    def centroid(self):
+        return self._first_values(CENTROID_COLUMNS)
+
+    async def _aget_geom_expr(
+        self,
+        expr: str,
+        geom_id=None,
+        timeout=None,
+        tolerance=None,
+        lod=None,
+        precision=None,
+    ):
+        tolerance, precision = simplify_params(tolerance, lod, precision)
+        executor = self.engine.async_executor()
+
+        async def fetch(geom_id):
+            if geom_id is None:
+                geom_id = await executor.call(self._first_resolved_id)
+            # Concurrent requests for the same geometry share one fetch
+            key = (expr, geom_id, tolerance, precision)
+            return await executor.call_shared(
+                key, self._get_geom_expr, expr, geom_id, tolerance, None, precision
+            )
+
+        return await asyncio.wait_for(fetch(geom_id), timeout)
+
+    async def awkt(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of wkt(), run on the engine's async executor."""
+        expr = GEOMETRY_FORMATS["wkt"]
+        return await self._aget_geom_expr(
+            expr, None, timeout, tolerance, lod, precision
+        )
+
+    async def awkb(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of wkb(), run on the engine's async executor."""
+        expr = GEOMETRY_FORMATS["wkb"]
+        return await self._aget_geom_expr(
+            expr, None, timeout, tolerance, lod, precision
+        )
+
+    async def ahexwkb(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of hexwkb(), run on the engine's async executor."""
+        expr = GEOMETRY_FORMATS["hexwkb"]
+        return await self._aget_geom_expr(
+            expr, None, timeout, tolerance, lod, precision
+        )
+
+    async def ageojson(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of geojson(), run on the engine's async executor."""
+        expr = GEOMETRY_FORMATS["geojson"]
+        return await self._aget_geom_expr(
+            expr, None, timeout, tolerance, lod, precision
+        )
+
+    async def asvg(self, timeout=None, tolerance=None, lod=None, precision=None):
+        """Coroutine variant of svg(), run on the engine's async executor."""
+        expr = GEOMETRY_FORMATS["svg"]
+        return await self._aget_geom_expr(
+            expr, None, timeout, tolerance, lod, precision
+        )
+
+    async def _acall(self, method, timeout=None):
+        executor = self.engine.async_executor()
+        return await asyncio.wait_for(executor.call(method), timeout)
+
+    async def acountries(self, timeout=None):
+        """Coroutine variant of countries()."""
+        return await self._acall(self.countries, timeout)
+
+    async def aregions(self, timeout=None):
+        """Coroutine variant of regions()."""
+        return await self._acall(self.regions, timeout)
+
+    async def acounties(self, timeout=None):
+        """Coroutine variant of counties()."""
+        return await self._acall(self.counties, timeout)
+
+    async def acities(self, timeout=None):
+        """Coroutine variant of cities()."""
+        return await self._acall(self.cities, timeout)
+
+    async def asubtypes(self, timeout=None):
+        """Coroutine variant of subtypes()."""
+        return await self._acall(self.subtypes, timeout)
 
     def countries(self):
         if self.chain:
             raise ValueError(
                 "countries() can only be called on the root object. Use wkls.countries() instead of chaining."
             )
+        if self.engine.store() is not None:
+            return self._list_stored("countries")
 
         query = """
             SELECT DISTINCT id, country, subtype, name, division_id
             FROM wkls
             WHERE subtype = 'country'
         """
-        df = duckdb.sql(query).df()
+        df = self._list(query)
         return df
 
     def regions(self):
@@ -261,12 +1178,14 @@ class Wkl:
             )
         if len(self.chain) == 1:
             country_iso = self.chain[0].upper()
+            if self.engine.store() is not None:
+                return self._list_stored("regions", country_iso)
             query = f"""
                 SELECT * FROM wkls
                 WHERE country = '{country_iso}'
                     AND subtype = 'region'
             """
-            df = duckdb.sql(query).df()
+            df = self._list(query)
             return df
 
     def counties(self):
@@ -279,16 +1198,7 @@ class Wkl:
                 "counties() cannot be called on a country alone. Use wkls.country.region.counties() to get counties for a region."
             )
         if len(self.chain) == 2:
-            country_iso = self.chain[0].upper()
-            region_iso = country_iso + "-" + self.chain[1].upper()
-            query = f"""
-                SELECT * FROM wkls
-                WHERE country = '{country_iso}'
-                  AND region = '{region_iso}'
-                  AND subtype = 'county'
-            """
-            df = duckdb.sql(query).df()
-            return df
+            return self._list_region(["county"])
 
     def cities(self):
         if not self.chain:
@@ -308,25 +1218,18 @@ class Wkl:
                 "cities() requires exactly two levels of chaining. Use wkls.country.region.cities() to get cities for a region."
             )
         if len(self.chain) == 2:
-            country_iso = self.chain[0].upper()
-            region_iso = country_iso + "-" + self.chain[1].upper()
-            query = f"""
-                SELECT * FROM wkls
-                WHERE country = '{country_iso}'
-                  AND region = '{region_iso}'
-                  AND subtype IN ('locality', 'localadmin')
-            """
-            df = duckdb.sql(query).df()
-            return df
+            return self._list_region(["locality", "localadmin"])
 
     def subtypes(self):
         if self.chain:
             raise ValueError(
                 "subtypes() can only be called on the root object. Use wkls.subtypes() instead of chaining."
             )
+        if self.engine.store() is not None:
+            return self._list_stored("subtypes")
 
         query = """
             SELECT DISTINCT subtype FROM wkls
         """
-        df = duckdb.sql(query).df()
+        df = self._list(query)
         return df
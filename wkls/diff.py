@@ -0,0 +1,42 @@
+# Columns of the result of diff_releases()
+DIFF_COLUMNS = ["id", "change", "country", "subtype", "name"]
+
+
+def _metadata(engine, country):
+    query = "SELECT id, country, subtype, name FROM wkls"
+    params = []
+    if country:
+        query += " WHERE country = ?"
+        params.append(country.upper())
+    return {row[0]: row[1:] for row in engine.sql(query, params=params).fetchall()}
+
+
+def diff_releases(old, new, country=None):
+    """Compare the divisions of two release engines.
+
+    Ids only in the new metadata are "added", ids only in the old one
+    "removed", and ids in both whose geometry digests differ "changed". The
+    geometries themselves never leave DuckDB: each release is scanned once
+    for (id, MD5 of WKB) pairs and the digests are compared in Python.
+    Returns a list of (id, change, country, subtype, name) rows.
+    """
+    old_rows = _metadata(old, country)
+    new_rows = _metadata(new, country)
+    rows = [
+        (geom_id, "added", *new_rows[geom_id])
+        for geom_id in new_rows.keys() - old_rows.keys()
+    ]
+    rows += [
+        (geom_id, "removed", *old_rows[geom_id])
+        for geom_id in old_rows.keys() - new_rows.keys()
+    ]
+
+    old_hashes = old.geometry_hashes(country)
+    new_hashes = new.geometry_hashes(country)
+    rows += [
+        (geom_id, "changed", *new_rows[geom_id])
+        for geom_id in new_rows.keys() & old_rows.keys()
+        if old_hashes.get(geom_id) != new_hashes.get(geom_id)
+    ]
+    rows.sort(key=lambda row: (row[1], row[0]))
+    return rows
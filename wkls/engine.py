@@ -0,0 +1,986 @@
+import functools
+import hashlib
+import importlib.resources
+import os
+import posixpath
+import threading
+from collections import defaultdict, namedtuple
+
+import duckdb
+
+from . import data
+from .aio import DEFAULT_ASYNC_WORKERS, AsyncExecutor
+from .cache import DEFAULT_NEGATIVE_TTL, GeometryCache, NegativeCache
+from .flight import SingleFlight
+from .hierarchy import Hierarchy
+from .index import MetadataIndex, normalize_name
+from .locate import LOCATE_SUBTYPES
+from .results import resolve_backend
+from .search import SearchIndex
+from .stats import Instrumentation
+from .store import MetadataStore
+
+# Overture Maps dataset version
+OVERTURE_VERSION = "2025-05-21.0"
+
+
+FetchInfo = namedtuple("FetchInfo", ["hits", "misses", "coalesced", "negative_hits"])
+
+Stats = namedtuple("Stats", ["phases", "fetch", "resolve_cache"])
+
+
+def release_parquet_path(version):
+    """Return the S3 glob of the division_area files of an Overture release."""
+    return f"s3://overturemaps-us-west-2/release/{version}/theme=divisions/type=division_area/*"
+
+
+S3_PARQUET_PATH = release_parquet_path(OVERTURE_VERSION)
+
+# Columns of the packaged metadata parquet
+METADATA_COLUMNS = ("id", "country", "region", "subtype", "name", "division_id")
+
+# Optional columns derived from division_area (see scripts/build_metadata.py):
+# bounding box, a representative point inside the division and its area in m²
+SPATIAL_COLUMNS = (
+    "xmin",
+    "ymin",
+    "xmax",
+    "ymax",
+    "centroid_lon",
+    "centroid_lat",
+    "area",
+)
+
+# Optional columns holding the MD5 hex digest and byte size of each WKB
+# geometry, so that changes can be detected without fetching geometries
+DIGEST_COLUMNS = ("geometry_hash", "geometry_size")
+
+# Optional column linking each division to its parent division
+HIERARCHY_COLUMNS = ("parent_division_id",)
+
+# Columns read from the geometry source to digest geometries
+DIGEST_EXPR = "md5(ST_AsWKB(geometry)), octet_length(ST_AsWKB(geometry))"
+
+# Named simplification tolerances, in degrees
+LEVELS_OF_DETAIL = {"high": 0.0001, "medium": 0.001, "low": 0.01}
+
+# Maximum number of ids per division_area scan in batch lookups
+BATCH_CHUNK_SIZE = 1000
+
+# Number of resolved chains memoized per engine
+RESOLVE_CACHE_SIZE = 4096
+
+COUNTRY_QUERY = """
+    SELECT * FROM wkls
+    WHERE country = ?
+      AND subtype = 'country'
+"""
+
+REGION_QUERY = """
+    SELECT * FROM wkls
+    WHERE country = ?
+      AND region = ?
+      AND subtype = 'region'
+"""
+
+CITY_QUERY = """
+    SELECT * FROM wkls
+    WHERE country = ?
+      AND region = ?
+      AND subtype IN ('county', 'locality', 'localadmin')
+      AND REPLACE(name, ' ', '') ILIKE REPLACE(?, ' ', '')
+"""
+
+
+def sql_string(value):
+    """Return a path or other value as a SQL string literal.
+
+    COPY targets and table functions such as parquet_scan take their paths
+    inline, so quotes in the path are doubled rather than passed as a
+    parameter.
+    """
+    return "'" + os.fspath(value).replace("'", "''") + "'"
+
+
+def resolve_geometry_source(source=None, version=OVERTURE_VERSION):
+    """Turn a configured geometry source into a path or glob for parquet_scan.
+
+    The source may be a local directory of division_area parquet files, a
+    local file or glob (optionally prefixed with file://), or the URL of a
+    mirror such as s3://bucket/prefix/ or https://host/file.parquet. Without a
+    source, $WKLS_GEOMETRY_SOURCE is used, falling back to the Overture release
+    on S3.
+    """
+    source = source or os.environ.get("WKLS_GEOMETRY_SOURCE")
+    if not source:
+        return release_parquet_path(version)
+    if source.startswith("file://"):
+        source = source[len("file://") :]
+    elif "://" in source:
+        return source + "*" if source.endswith("/") else source
+    if os.path.isdir(source):
+        return os.path.join(source, "*.parquet")
+    return source
+
+
+def simplify_params(tolerance=None, lod=None, precision=None):
+    """Validate simplification options and return (tolerance, precision).
+
+    lod names one of LEVELS_OF_DETAIL and is an alternative to an explicit
+    tolerance in degrees. precision is the number of decimal places that
+    coordinates are snapped to.
+    """
+    if lod is not None:
+        if tolerance is not None:
+            raise ValueError("Pass either tolerance or lod, not both.")
+        if lod not in LEVELS_OF_DETAIL:
+            raise ValueError(
+                f"Unknown level of detail: {lod}. Use one of {', '.join(LEVELS_OF_DETAIL)}."
+            )
+        tolerance = LEVELS_OF_DETAIL[lod]
+    if tolerance is not None:
+        tolerance = float(tolerance)
+        if tolerance < 0:
+            raise ValueError("tolerance must not be negative.")
+        if tolerance == 0:
+            tolerance = None
+    if precision is not None:
+        precision = int(precision)
+        if precision < 0:
+            raise ValueError("precision must not be negative.")
+    return tolerance, precision
+
+
+def simplify_expr(tolerance=None, precision=None):
+    """Return the SQL expression that simplifies the geometry column."""
+    expr = "geometry"
+    if tolerance is not None:
+        expr = f"ST_SimplifyPreserveTopology({expr}, {tolerance!r})"
+    if precision is not None:
+        expr = f"ST_ReducePrecision({expr}, {10.0**-precision!r})"
+    return expr
+
+
+def packaged_metadata_path(version=OVERTURE_VERSION):
+    """Return the path of the metadata parquet shipped for a release, if any.
+
+    The package ships the metadata of OVERTURE_VERSION; metadata of other
+    releases can be added as data/overture-<version>.parquet.
+    """
+    if version == OVERTURE_VERSION:
+        return f"{importlib.resources.files(data)}/overture_zstd22.parquet"
+    path = importlib.resources.files(data) / f"overture-{version}.parquet"
+    return str(path) if path.is_file() else None
+
+
+def packaged_rowgroup_index_path(version=OVERTURE_VERSION):
+    """Return the packaged id -> file/row group index for a release, if shipped."""
+    path = (
+        importlib.resources.files(data) / f"division_area_rowgroups-{version}.parquet"
+    )
+    return str(path) if path.is_file() else None
+
+
+class WklsEngine:
+    """Owns a DuckDB database holding the wkls metadata table.
+
+    The metadata table is loaded once into the engine's own in-memory database
+    and shared by every thread. Each thread queries it through its own cursor,
+    so concurrent lookups neither serialize on nor interfere with DuckDB's
+    global default connection. Both the table and the spatial extension are
+    loaded lazily on first use.
+
+    With a metadata store (metadata_store= or $WKLS_METADATA_STORE), chain
+    lookups and listings read a memory-mapped file shared by every process
+    instead, and the table is only loaded for the queries that need it.
+    """
+
+    def __init__(
+        self,
+        version=OVERTURE_VERSION,
+        metadata_path=None,
+        geometry_source=None,
+        cache_dir=None,
+        cache_max_bytes=None,
+        cache_enabled=True,
+        resolve_cache_size=RESOLVE_CACHE_SIZE,
+        rowgroup_index=None,
+        async_workers=DEFAULT_ASYNC_WORKERS,
+        negative_ttl=DEFAULT_NEGATIVE_TTL,
+        backend=None,
+        instrumentation=None,
+        metadata_store=None,
+    ):
+        self.version = version
+        self.metadata_path = metadata_path or packaged_metadata_path(version)
+        # $WKLS_METADATA_STORE is a copy of the packaged metadata, so it only
+        # applies to engines reading the packaged metadata
+        if not metadata_store and not metadata_path and version == OVERTURE_VERSION:
+            metadata_store = os.environ.get("WKLS_METADATA_STORE")
+        self.metadata_store_path = metadata_store
+        # A read-only mapping can be shared with forked workers, so it is not
+        # reset after a fork like the DuckDB database
+        self._store = None
+        self._cache_settings = {
+            "enabled": cache_enabled,
+            "directory": cache_dir,
+            "max_bytes": cache_max_bytes,
+        }
+        self.async_workers = async_workers
+        self.negative_ttl = negative_ttl
+        # Checked against the installed libraries on first use, so that
+        # importing wkls works before pandas or pyarrow is installed
+        self._backend_choice = backend
+        self._backend = None
+        self._counters = dict.fromkeys(FetchInfo._fields, 0)
+        self.instrumentation = instrumentation or Instrumentation()
+        self._lock = threading.Lock()
+        self._resolve_cached = functools.lru_cache(maxsize=resolve_cache_size)(
+            self._resolve_uncached
+        )
+        self._reset()
+        self.configure_source(geometry_source, rowgroup_index)
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._conn = None
+        self._local = threading.local()
+        self._table_ready = False
+        self._table_columns = frozenset()
+        self._spatial_ready = False
+        self._bbox_ready = False
+        self._spatial_metadata = None
+        self._digest_metadata = None
+        self._geometry_cache = None
+        self._index = None
+        self._search_index = None
+        self._hierarchy = None
+        self._async_executor = None
+        self._flight = SingleFlight()
+        self._negative = NegativeCache(self.negative_ttl)
+
+    def _connection(self):
+        # A DuckDB database must not be shared with a forked child process
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self._conn = duckdb.connect(":memory:")
+        return self._conn
+
+    def cursor(self):
+        """Return the calling thread's cursor on the engine's database."""
+        conn = self._connection()
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = conn.cursor()
+            self._local.cursor = cursor
+            self._local.profiling = False
+        # Query profiles are only collected while instrumentation is enabled
+        if self._local.profiling != self.instrumentation.enabled:
+            self._local.profiling = self.instrumentation.enabled
+            if self._local.profiling:
+                cursor.execute("PRAGMA enable_profiling = 'no_output'")
+            else:
+                cursor.execute("PRAGMA disable_profiling")
+        return cursor
+
+    def load_spatial(self):
+        """Install and load the spatial extension. Called once, on first geometry use."""
+        if self._spatial_ready:
+            return
+        conn = self._connection()
+        with self._lock:
+            if not self._spatial_ready:
+                conn.execute("INSTALL spatial")
+                conn.load_extension("spatial")
+                self._spatial_ready = True
+
+    def _metadata_relation(self):
+        if self.metadata_path:
+            return sql_string(self.metadata_path)
+        # Without packaged metadata, derive it from the release's division_area
+        return f"""(
+            SELECT id, country, region, subtype, names.primary AS name, division_id
+            FROM parquet_scan({sql_string(self.geometry_source)})
+        )"""
+
+    def initialize_table(self):
+        """Initialize the wkls table if it doesn't exist. Called once, on first use."""
+        if self._table_ready:
+            return
+        conn = self._connection()
+        relation = self._metadata_relation()
+        with self._lock:
+            if not self._table_ready:
+                available = {
+                    row[0]
+                    for row in conn.execute(
+                        f"DESCRIBE SELECT * FROM {relation}"
+                    ).fetchall()
+                }
+                # Optional columns are only kept when the metadata has them, so
+                # that results have the columns of the metadata file
+                optional = SPATIAL_COLUMNS + DIGEST_COLUMNS + HIERARCHY_COLUMNS
+                columns = list(METADATA_COLUMNS) + [
+                    name for name in optional if name in available
+                ]
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS wkls AS
+                    SELECT {", ".join(columns)}
+                    FROM {relation}
+                """)
+                self._table_columns = frozenset(columns)
+                self._table_ready = True
+
+    def has_spatial_metadata(self):
+        """Return whether the metadata table carries bbox, centroid and area values."""
+        if self._spatial_metadata is None:
+            self.initialize_table()
+            self._spatial_metadata = (
+                self._table_columns.issuperset(SPATIAL_COLUMNS)
+                and self.sql("SELECT count(xmin) > 0 FROM wkls").fetchone()[0]
+            )
+        return self._spatial_metadata
+
+    def has_digest_metadata(self):
+        """Return whether the metadata table carries geometry digests."""
+        if self._digest_metadata is None:
+            self.initialize_table()
+            self._digest_metadata = (
+                self._table_columns.issuperset(DIGEST_COLUMNS)
+                and self.sql("SELECT count(geometry_hash) > 0 FROM wkls").fetchone()[0]
+            )
+        return self._digest_metadata
+
+    def initialize_bboxes(self):
+        """Load the bounding boxes used to pick reverse geocoding candidates.
+
+        They come from the metadata table when it carries bbox columns.
+        Otherwise only the id, subtype and bbox columns of the geometry source
+        are read, for the divisions of the metadata table that locate() can
+        return.
+        """
+        if self._bbox_ready:
+            return
+        self.initialize_table()
+        spatial_metadata = self.has_spatial_metadata()
+        conn = self._connection()
+        subtypes = ", ".join(f"'{s}'" for s in LOCATE_SUBTYPES)
+        with self._lock:
+            if not self._bbox_ready:
+                if spatial_metadata:
+                    conn.execute(f"""
+                        CREATE OR REPLACE TABLE wkls_bbox AS
+                        SELECT id, xmin, ymin, xmax, ymax
+                        FROM wkls
+                        WHERE subtype IN ({subtypes})
+                          AND xmin IS NOT NULL
+                    """)
+                else:
+                    conn.execute(f"""
+                        CREATE OR REPLACE TABLE wkls_bbox AS
+                        SELECT id, bbox.xmin AS xmin, bbox.ymin AS ymin,
+                               bbox.xmax AS xmax, bbox.ymax AS ymax
+                        FROM parquet_scan({sql_string(self.geometry_source)})
+                        WHERE subtype IN ({subtypes})
+                          AND id IN (SELECT id FROM wkls)
+                    """)
+                self._bbox_ready = True
+
+    def index(self):
+        """Return the in-memory lookup index over the metadata table."""
+        if self._index is None:
+            self.initialize_table()
+            cursor = self._connection().cursor()
+            with self._lock:
+                if self._index is None:
+                    self._index = MetadataIndex.from_cursor(cursor)
+            cursor.close()
+        return self._index
+
+    def search_index(self):
+        """Return the in-memory name search index over the metadata table."""
+        if self._search_index is None:
+            self.initialize_table()
+            cursor = self._connection().cursor()
+            with self._lock:
+                if self._search_index is None:
+                    self._search_index = SearchIndex.from_cursor(cursor)
+            cursor.close()
+        return self._search_index
+
+    def store(self):
+        """Return the memory-mapped metadata store, or None if none is configured.
+
+        The store (see wkls.store) answers chain lookups and listings without
+        loading the metadata table into DuckDB; queries it cannot answer,
+        such as name patterns, search or spatial filters, still load the
+        table on first use.
+        """
+        if self._store is None and self.metadata_store_path:
+            with self._lock:
+                if self._store is None:
+                    self._store = MetadataStore(self.metadata_store_path)
+        return self._store
+
+    def lookup_index(self):
+        """Return what answers exact chain lookups: the store, or the in-memory index."""
+        store = self.store()
+        return self.index() if store is None else store
+
+    def hierarchy(self):
+        """Return the in-memory parent/child adjacency of the metadata table."""
+        if self._hierarchy is None:
+            self.initialize_table()
+            cursor = self._connection().cursor()
+            with self._lock:
+                if self._hierarchy is None:
+                    self._hierarchy = Hierarchy.from_cursor(cursor)
+            cursor.close()
+        return self._hierarchy
+
+    def related(self, chain, relation, subtypes=None):
+        """Return (columns, rows) of the children, parents, ancestors or
+        descendants of the divisions a chain resolves to.
+        """
+        columns, rows = self.resolve(chain)
+        hierarchy = self.hierarchy()
+        divisions = list(dict.fromkeys(hierarchy.division_of(row) for row in rows))
+        walk = {
+            "children": hierarchy.child_divisions,
+            "parents": hierarchy.parent_divisions,
+            "ancestors": hierarchy.ancestor_divisions,
+            "descendants": hierarchy.descendant_divisions,
+        }[relation]
+        related = walk(divisions)
+        if relation in ("ancestors", "descendants"):
+            # Keep the walk order: nearest ancestors or shallowest levels first
+            return columns, [
+                row
+                for division_id in related
+                for row in hierarchy.rows_of([division_id], subtypes)
+            ]
+        return columns, hierarchy.rows_of(related, subtypes)
+
+    def search(self, query, country=None, limit=10):
+        """Search place names, returning (columns, rows) with a trailing score column."""
+        index = self.search_index()
+        matches = index.search(query, country=country, limit=limit)
+        return index.columns + ["score"], [row + (score,) for row, score in matches]
+
+    def resolve(self, chain):
+        """Return (columns, rows) matching a chain.
+
+        Results are memoized per normalized chain: the country and region
+        codes are uppercased and place names are space-stripped and
+        lowercased, exactly as the SQL queries compare them. Levels below the
+        third match the nearest descendants with that name in the hierarchy.
+        """
+        key = [chain[0].upper()]
+        if len(chain) > 1:
+            key.append(chain[1].upper())
+        key.extend(normalize_name(part) for part in chain[2:])
+        key = tuple(key)
+        with self.instrumentation.span("resolve") as span:
+            # Chains that recently failed to resolve are answered without a lookup
+            if ("chain", key) in self._negative:
+                self._count("negative_hits")
+                return self.lookup_index().columns, ()
+            columns, rows = self._resolve_cached(key)
+            if not rows:
+                self._negative.add(("chain", key))
+            span.add(rows=len(rows))
+        return columns, rows
+
+    def _resolve_uncached(self, chain):
+        if len(chain) > 3:
+            columns, rows = self._resolve_cached(chain[:3])
+            hierarchy = self.hierarchy()
+            divisions = list(dict.fromkeys(hierarchy.division_of(row) for row in rows))
+            for name in chain[3:]:
+                divisions = hierarchy.find_descendants(divisions, name)
+            return columns, tuple(hierarchy.rows_of(divisions))
+        index = self.lookup_index()
+        # Exact lookups are answered from the store or the in-memory index
+        rows = index.lookup(chain)
+        if rows is None:
+            # Name patterns with LIKE wildcards still go through DuckDB
+            country_iso = chain[0]
+            region_iso = country_iso + "-" + chain[1]
+            params = (country_iso, region_iso, chain[2])
+            rows = self.sql(CITY_QUERY, params=params).fetchall()
+        return index.columns, tuple(rows)
+
+    def resolve_cache_info(self):
+        """Return the hit/miss statistics of the chain resolution cache."""
+        return self._resolve_cached.cache_info()
+
+    def resolve_cache_clear(self):
+        """Empty the chain resolution cache and forget remembered misses."""
+        self._resolve_cached.cache_clear()
+        self._negative.clear()
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def count_fetches(self, name, n=1):
+        """Add n to one of the fetch_info() counters, for fetches made elsewhere."""
+        if name not in self._counters:
+            raise ValueError(f"Unknown fetch counter: {name}")
+        self._count(name, n)
+
+    def is_known_missing(self, geom_id):
+        """Return whether an id is remembered as missing, counting a negative hit."""
+        if geom_id in self._negative:
+            self._count("negative_hits")
+            return True
+        return False
+
+    def record_missing(self, geom_ids):
+        """Remember ids the geometry source has no geometry for."""
+        for geom_id in geom_ids:
+            self._negative.add(geom_id)
+
+    def fetch_info(self):
+        """Return geometry fetch counters.
+
+        hits are geometries served from the local cache, misses geometries
+        fetched from the geometry source, coalesced requests that waited for
+        another caller's in-flight fetch, and negative_hits chains or ids
+        answered from the negative cache.
+        """
+        with self._lock:
+            return FetchInfo(**self._counters)
+
+    def stats(self, reset=False):
+        """Return per-phase timings with the fetch and resolve cache counters.
+
+        reset zeroes the phase totals after taking the snapshot; the cache
+        counters keep counting.
+        """
+        return Stats(
+            self.instrumentation.snapshot(reset),
+            self.fetch_info(),
+            self.resolve_cache_info(),
+        )
+
+    def configure_stats(self, enabled=True, hooks=None):
+        """Turn per-phase instrumentation on or off and set the hooks it calls."""
+        self.instrumentation.configure(enabled, hooks)
+
+    def warmup(self):
+        """Load the spatial extension, the metadata table and its indexes up front.
+
+        With a metadata store, only the store is opened: the table and the
+        hierarchy are still loaded on first use by the queries that need them.
+        """
+        self.load_spatial()
+        self.lookup_index()
+        if self.store() is None:
+            self.hierarchy()
+
+    def sql(self, query, params=None):
+        """Run a query against the wkls metadata table, loading it if needed."""
+        self.initialize_table()
+        return self.cursor().execute(query, params)
+
+    def spatial_sql(self, query, params=None):
+        """Run a query that uses spatial functions, loading the extension if needed."""
+        self.load_spatial()
+        return self.cursor().execute(query, params)
+
+    def configure_source(self, geometry_source=None, rowgroup_index=None):
+        """Point geometry lookups at another division_area location.
+
+        The row-group index maps each id to the file and row group holding it
+        (see scripts/build_rowgroup_index.py). It defaults to
+        $WKLS_ROWGROUP_INDEX, or to the packaged index when reading the
+        Overture release itself.
+        """
+        self.geometry_source = resolve_geometry_source(geometry_source, self.version)
+        rowgroup_index = rowgroup_index or os.environ.get("WKLS_ROWGROUP_INDEX")
+        if not rowgroup_index and self.geometry_source == release_parquet_path(
+            self.version
+        ):
+            rowgroup_index = packaged_rowgroup_index_path(self.version)
+        self.rowgroup_index = rowgroup_index
+        self._bbox_ready = False
+        # Ids missing from the old source may well be in the new one
+        self._negative.clear()
+
+    @property
+    def backend(self):
+        """The result backend, "pandas" or "arrow" (see resolve_backend())."""
+        if self._backend is None:
+            self._backend = resolve_backend(self._backend_choice)
+        return self._backend
+
+    def configure_backend(self, backend=None):
+        """Choose whether results are pandas DataFrames or pyarrow Tables."""
+        self._backend = resolve_backend(backend)
+        self._backend_choice = backend
+
+    def configure_cache(self, directory=None, max_bytes=None, enabled=True):
+        """Configure the local on-disk geometry cache."""
+        with self._lock:
+            self._cache_settings.update(
+                enabled=enabled, directory=directory, max_bytes=max_bytes
+            )
+            self._geometry_cache = None
+
+    def async_executor(self):
+        """Return the bounded thread pool that runs lookups for asyncio callers."""
+        if self._async_executor is None:
+            with self._lock:
+                if self._async_executor is None:
+                    self._async_executor = AsyncExecutor(self.async_workers)
+        return self._async_executor
+
+    def geometry_cache(self):
+        """Return the engine's geometry cache, or None if it is disabled or unusable."""
+        if self._geometry_cache is None and self._cache_settings["enabled"]:
+            with self._lock:
+                if self._geometry_cache is None:
+                    self._geometry_cache = GeometryCache(
+                        self.version,
+                        directory=self._cache_settings["directory"],
+                        max_bytes=self._cache_settings["max_bytes"],
+                    )
+        # A cache that cannot be used has warned once; fetch without it
+        if self._geometry_cache is not None and not self._geometry_cache.available:
+            return None
+        return self._geometry_cache
+
+    def geometry_hashes(self, country=None):
+        """Return a dict of GERS id to the MD5 digest of its WKB geometry.
+
+        Digests come from the metadata table when it carries them. Otherwise
+        they are computed by DuckDB while scanning the geometry source, so
+        only ids and 32-character hex digests are pulled into Python. country
+        optionally restricts the result to one ISO country code.
+        """
+        if self.has_digest_metadata():
+            query = "SELECT id, geometry_hash FROM wkls WHERE geometry_hash IS NOT NULL"
+            params = []
+            if country:
+                query += " AND country = ?"
+                params.append(country.upper())
+            return dict(self.sql(query, params=params).fetchall())
+
+        params = []
+        condition = "d.id IN (SELECT id FROM wkls)"
+        if country:
+            condition += " AND d.country = ?"
+            params.append(country.upper())
+        self.initialize_table()
+        query = f"""
+            SELECT d.id, md5(ST_AsWKB(d.geometry))
+            FROM parquet_scan({sql_string(self.geometry_source)}) d
+            WHERE {condition}
+        """
+        return dict(self.spatial_sql(query, params=params).fetchall())
+
+    def geometry_digest(self, geom_id):
+        """Return (MD5 hex digest, size in bytes) of the WKB geometry of a GERS id."""
+        digest = self.geometry_digests([geom_id]).get(geom_id)
+        if digest is None:
+            raise ValueError(f"No geometry found for ID: {geom_id}")
+        return digest
+
+    def geometry_digests(self, geom_ids, chunk_size=BATCH_CHUNK_SIZE):
+        """Return a dict of GERS id to (MD5 hex digest, size in bytes) of its WKB.
+
+        Digests are read from the metadata table when it carries them, or
+        computed from WKB already in the local cache. The remaining ids are
+        digested by DuckDB while scanning the geometry source, without pulling
+        geometries into Python, and the digests are cached. Ids without a
+        geometry are left out of the result.
+        """
+        geom_ids = list(dict.fromkeys(geom_ids))
+        result = {}
+        if self.has_digest_metadata():
+            for start in range(0, len(geom_ids), chunk_size):
+                chunk = geom_ids[start : start + chunk_size]
+                placeholders = ", ".join("?" for _ in chunk)
+                query = f"""
+                    SELECT id, geometry_hash, geometry_size FROM wkls
+                    WHERE id IN ({placeholders}) AND geometry_hash IS NOT NULL
+                """
+                for geom_id, digest, size in self.sql(query, params=chunk).fetchall():
+                    result[geom_id] = (digest, size)
+
+        cache = self.geometry_cache()
+        pending = []
+        for geom_id in geom_ids:
+            if geom_id in result:
+                continue
+            if geom_id in self._negative:
+                self._count("negative_hits")
+                continue
+            wkb = cache.get(geom_id) if cache is not None else None
+            if wkb is not None:
+                result[geom_id] = (hashlib.md5(wkb).hexdigest(), len(wkb))
+                continue
+            cached = cache.get(f"{geom_id}|digest") if cache is not None else None
+            if cached is not None:
+                digest, size = cached.decode().split(":")
+                result[geom_id] = (digest, int(size))
+            else:
+                pending.append(geom_id)
+
+        with self.instrumentation.span("fetch") as span:
+            for start in range(0, len(pending), chunk_size):
+                chunk = pending[start : start + chunk_size]
+                rows = self._scan_wkb(chunk, DIGEST_EXPR)
+                span.add(rows=len(rows))
+                for geom_id, digest, size in rows:
+                    result[geom_id] = (digest, size)
+                    if cache is not None:
+                        cache.put(f"{geom_id}|digest", f"{digest}:{size}".encode())
+                for geom_id in chunk:
+                    if geom_id not in result:
+                        self._negative.add(geom_id)
+        return result
+
+    def fetch_wkb(self, geom_id):
+        """Return the raw WKB for a GERS id, reading through the local cache."""
+        wkb = self.fetch_wkb_many([geom_id]).get(geom_id)
+        if wkb is None:
+            raise ValueError(f"No geometry found for ID: {geom_id}")
+        return wkb
+
+    def fetch_wkb_simplified(self, geom_id, tolerance=None, precision=None):
+        """Return the WKB for a GERS id, simplified and snapped to a precision grid.
+
+        Simplified variants are cached next to the full-resolution WKB under
+        their own key, so each tier is computed once.
+        """
+        if tolerance is None and precision is None:
+            return self.fetch_wkb(geom_id)
+        wkb = self.fetch_wkb_simplified_many([geom_id], tolerance, precision).get(
+            geom_id
+        )
+        if wkb is None:
+            raise ValueError(f"No geometry found for ID: {geom_id}")
+        return wkb
+
+    def fetch_wkb_simplified_many(
+        self, geom_ids, tolerance=None, precision=None, chunk_size=BATCH_CHUNK_SIZE
+    ):
+        """Return a dict of GERS id to simplified WKB, like fetch_wkb_simplified().
+
+        Variants already cached are returned as is; the others are simplified
+        from the full-resolution WKB in one DuckDB query and cached. Ids
+        without a geometry are left out of the result.
+        """
+        if tolerance is None and precision is None:
+            return self.fetch_wkb_many(geom_ids, chunk_size=chunk_size)
+        cache = self.geometry_cache()
+        suffix = f"|tolerance={tolerance}|precision={precision}"
+        result = {}
+        pending = []
+        for geom_id in dict.fromkeys(geom_ids):
+            wkb = cache.get(geom_id + suffix) if cache is not None else None
+            if wkb is None:
+                pending.append(geom_id)
+            else:
+                result[geom_id] = wkb
+        if not pending:
+            return result
+
+        wkbs = self.fetch_wkb_many(pending, chunk_size=chunk_size)
+        expr = f"ST_AsWKB({simplify_expr(tolerance, precision)})"
+        values = self.convert_wkb_many(list(wkbs.values()), expr)
+        for geom_id, value in zip(wkbs, values):
+            wkb = bytes(value)
+            result[geom_id] = wkb
+            if cache is not None:
+                cache.put(geom_id + suffix, wkb)
+        return result
+
+    def fetch_wkb_many(self, geom_ids, chunk_size=BATCH_CHUNK_SIZE):
+        """Return a dict of GERS id to raw WKB, scanning S3 once per chunk of ids.
+
+        Ids without a geometry are left out of the result.
+        """
+        with self.instrumentation.span("fetch") as span:
+            result = self._fetch_wkb_many(geom_ids, chunk_size)
+            span.add(rows=len(result))
+        return result
+
+    def _fetch_wkb_many(self, geom_ids, chunk_size):
+        cache = self.geometry_cache()
+        result = {}
+        pending = []
+        for geom_id in dict.fromkeys(geom_ids):
+            if geom_id in self._negative:
+                self._count("negative_hits")
+                continue
+            wkb = cache.get(geom_id) if cache is not None else None
+            if wkb is None:
+                pending.append(geom_id)
+            else:
+                self._count("hits")
+                result[geom_id] = wkb
+
+        # Ids another thread is already fetching are awaited, not fetched again
+        claimed, waiting = self._flight.claim(pending)
+        if waiting:
+            self._count("coalesced", len(waiting))
+        fetched = {}
+        try:
+            for start in range(0, len(claimed), chunk_size):
+                chunk = claimed[start : start + chunk_size]
+                for geom_id, wkb in self._scan_wkb(chunk):
+                    wkb = bytes(wkb)
+                    fetched[geom_id] = wkb
+                    if cache is not None:
+                        cache.put(geom_id, wkb)
+        except BaseException as e:
+            self._flight.fail(e, claimed)
+            raise
+        self._flight.resolve(fetched, claimed)
+        self._count("misses", len(claimed))
+        for geom_id in claimed:
+            if geom_id not in fetched:
+                self._negative.add(geom_id)
+
+        result.update(fetched)
+        for geom_id, future in waiting.items():
+            wkb = future.result()
+            if wkb is not None:
+                result[geom_id] = wkb
+        return result
+
+    def _scan_wkb(self, geom_ids, expr="ST_AsWKB(geometry)"):
+        """Return (id, wkb) rows for some ids read from the geometry source.
+
+        expr selects other columns than the WKB, such as DIGEST_EXPR.
+        """
+        rows = self._scan_wkb_indexed(geom_ids, expr) if self.rowgroup_index else []
+        found = {row[0] for row in rows}
+        rest = [geom_id for geom_id in geom_ids if geom_id not in found]
+        if rest:
+            placeholders = ", ".join("?" for _ in rest)
+            query = f"""
+                SELECT id, {expr}
+                FROM parquet_scan({sql_string(self.geometry_source)})
+                WHERE id IN ({placeholders})
+            """
+            rows += self.spatial_sql(query, params=rest).fetchall()
+            self.instrumentation.add_profile(self.cursor())
+        return rows
+
+    def _scan_wkb_indexed(self, geom_ids, expr="ST_AsWKB(geometry)"):
+        """Read ids through the row-group index, touching one row group per id.
+
+        Ids are grouped by the file and row group that hold them, and each
+        group is read with a file_row_number range that DuckDB uses to skip
+        every other row group of the file.
+        """
+        placeholders = ", ".join("?" for _ in geom_ids)
+        located = (
+            self.cursor()
+            .execute(
+                f"""
+                SELECT id, file, first_row, num_rows
+                FROM read_parquet({sql_string(self.rowgroup_index)})
+                WHERE id IN ({placeholders})
+                """,
+                geom_ids,
+            )
+            .fetchall()
+        )
+        groups = defaultdict(list)
+        for geom_id, file, first_row, num_rows in located:
+            groups[(file, first_row, num_rows)].append(geom_id)
+        if not groups:
+            return []
+
+        base = posixpath.dirname(self.geometry_source)
+        parts = []
+        params = []
+        for (file, first_row, num_rows), ids in groups.items():
+            placeholders = ", ".join("?" for _ in ids)
+            parts.append(f"""
+                SELECT id, {expr}
+                FROM read_parquet({sql_string(f"{base}/{file}")}, file_row_number = true)
+                WHERE file_row_number BETWEEN {first_row} AND {first_row + num_rows - 1}
+                  AND id IN ({placeholders})
+            """)
+            params.extend(ids)
+        try:
+            rows = self.spatial_sql(" UNION ALL ".join(parts), params=params).fetchall()
+        except duckdb.IOException:
+            # The source does not have the indexed file layout; scan it instead
+            return []
+        self.instrumentation.add_profile(self.cursor())
+        return rows
+
+    def convert_wkb_many(self, wkbs, expr):
+        """Apply a geometry expression such as ST_AsText(geometry) to WKB values."""
+        if not wkbs:
+            return []
+        query = f"""
+            SELECT i, {expr}
+            FROM (
+                SELECT i, ST_GeomFromWKB(wkb) AS geometry
+                FROM (SELECT UNNEST(range(len($1))) AS i, UNNEST($1) AS wkb)
+            )
+            ORDER BY i
+        """
+        with self.instrumentation.span("convert") as span:
+            rows = self.spatial_sql(query, params=[wkbs]).fetchall()
+            span.add(rows=len(rows))
+        return [value for _, value in rows]
+
+    def root(self):
+        """Return a root wkls object that runs its lookups on this engine."""
+        from .core import Wkl
+
+        return Wkl(engine=self)
+
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+
+def default_engine():
+    """Return the process-wide engine used by the root wkls object."""
+    global _default_engine
+    if _default_engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                _default_engine = WklsEngine()
+    return _default_engine
+
+
+_release_engines = {}
+
+
+def release_engine(version, metadata_path=None, geometry_source=None):
+    """Return the process-wide engine of an Overture release.
+
+    The default release shares the default engine. Other releases get an
+    engine of their own, with its own metadata table, geometry source and
+    cache namespace, created on first use; metadata_path and geometry_source
+    only apply when the engine is created.
+    """
+    engine = default_engine()
+    if version == engine.version and not (metadata_path or geometry_source):
+        return engine
+    with _default_engine_lock:
+        engine = _release_engines.get(version)
+        if engine is None:
+            engine = WklsEngine(
+                version=version,
+                metadata_path=metadata_path,
+                geometry_source=geometry_source,
+            )
+            _release_engines[version] = engine
+    return engine
@@ -0,0 +1,114 @@
+import os
+import threading
+
+from .engine import sql_string
+
+# COPY options per export format
+EXPORT_FORMATS = {
+    "parquet": "FORMAT parquet, COMPRESSION zstd",
+    "flatgeobuf": "FORMAT gdal, DRIVER 'FlatGeobuf', SRS 'EPSG:4326'",
+    "geojsonseq": "FORMAT gdal, DRIVER 'GeoJSONSeq', SRS 'EPSG:4326'",
+}
+
+# Export format implied by an output file extension
+EXPORT_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".geoparquet": "parquet",
+    ".fgb": "flatgeobuf",
+    ".ndjson": "geojsonseq",
+    ".geojsonl": "geojsonseq",
+    ".geojsons": "geojsonseq",
+}
+
+# Seconds between two progress reports
+PROGRESS_INTERVAL = 0.5
+
+
+def export_format(path, fmt=None):
+    """Return the export format to use for path, inferred from its extension."""
+    if fmt is None:
+        fmt = EXPORT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(
+                f"Cannot infer the export format of {path}. "
+                f"Pass fmt as one of {', '.join(EXPORT_FORMATS)}."
+            )
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unknown export format: {fmt}. Use one of {', '.join(EXPORT_FORMATS)}."
+        )
+    return fmt
+
+
+def export_divisions(engine, chain, path, subtypes=None, fmt=None, progress=None):
+    """Write the divisions under a chain, with their geometries, to a file.
+
+    The metadata rows selected by the chain (and optionally restricted to
+    some subtypes) are joined to division_area in a single scan and streamed
+    by DuckDB straight into the output file, so the result is never held in
+    memory. progress, if given, is called with the completion percentage
+    while the export runs. Returns the number of rows written.
+    """
+    fmt = export_format(path, fmt)
+    if not chain:
+        raise ValueError(
+            "export() requires a chain. Use wkls.country.export() or wkls.country.region.export()."
+        )
+    country_iso = chain[0].upper()
+    conditions = ["d.country = ?"]
+    params = [country_iso]
+    if len(chain) == 1:
+        conditions.append("w.country = ?")
+        params.append(country_iso)
+    elif len(chain) == 2:
+        conditions.append("w.region = ?")
+        params.append(country_iso + "-" + chain[1].upper())
+    else:
+        _, rows = engine.resolve(chain)
+        if not rows:
+            raise ValueError(f"No result found for: {'.'.join(chain)}")
+        conditions.append(f"w.id IN ({', '.join('?' for _ in rows)})")
+        params.extend(row[0] for row in rows)
+    if subtypes:
+        conditions.append(f"w.subtype IN ({', '.join('?' for _ in subtypes)})")
+        params.extend(subtypes)
+
+    query = f"""
+        COPY (
+            SELECT w.id, w.country, w.region, w.subtype, w.name, w.division_id,
+                   d.geometry
+            FROM parquet_scan({sql_string(engine.geometry_source)}) d
+            JOIN wkls w ON w.id = d.id
+            WHERE {" AND ".join(conditions)}
+        ) TO {sql_string(path)} ({EXPORT_FORMATS[fmt]})
+    """
+    engine.initialize_table()
+    engine.load_spatial()
+    if progress is None:
+        return engine.cursor().execute(query, params).fetchone()[0]
+    return _run_with_progress(engine.cursor(), query, params, progress)
+
+
+def _run_with_progress(cursor, query, params, progress):
+    # query_progress() only reports while the progress bar is enabled
+    cursor.execute("SET enable_progress_bar = true")
+    cursor.execute("SET enable_progress_bar_print = false")
+    done = threading.Event()
+
+    def report():
+        while not done.wait(PROGRESS_INTERVAL):
+            percent = cursor.query_progress()
+            if percent >= 0:
+                progress(percent)
+
+    reporter = threading.Thread(target=report, name="wkls-export-progress")
+    reporter.start()
+    try:
+        count = cursor.execute(query, params).fetchone()[0]
+    finally:
+        done.set()
+        reporter.join()
+        cursor.execute("RESET enable_progress_bar")
+        cursor.execute("RESET enable_progress_bar_print")
+    progress(100.0)
+    return count
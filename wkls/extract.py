@@ -0,0 +1,28 @@
+from .engine import sql_string
+
+# Small row groups let id lookups on the sorted extract prune to one row group
+EXTRACT_ROW_GROUP_SIZE = 2048
+
+
+def extract_division_area(engine, countries, output, row_group_size=None):
+    """Copy the division_area rows of some countries into a local GeoParquet file.
+
+    Rows are read from the engine's geometry source, sorted by id and written
+    with small row groups, so that id lookups against the extract only touch
+    the row group whose min/max statistics contain the id. Returns the number
+    of rows written.
+    """
+    countries = [c.upper() for c in countries]
+    if not countries:
+        raise ValueError("extract requires at least one country code, e.g. US.")
+    row_group_size = row_group_size or EXTRACT_ROW_GROUP_SIZE
+    placeholders = ", ".join("?" for _ in countries)
+    query = f"""
+        COPY (
+            SELECT *
+            FROM parquet_scan({sql_string(engine.geometry_source)})
+            WHERE country IN ({placeholders})
+            ORDER BY id
+        ) TO {sql_string(output)} (FORMAT parquet, COMPRESSION zstd, ROW_GROUP_SIZE {row_group_size})
+    """
+    return engine.spatial_sql(query, params=countries).fetchone()[0]
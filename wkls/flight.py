@@ -0,0 +1,41 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Deduplicates concurrent fetches of the same keys across threads.
+
+    A caller claims the keys nobody is fetching yet and becomes their leader;
+    keys already in flight are awaited instead of being fetched again.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def claim(self, keys):
+        """Split keys into (claimed keys, {key: future} for keys in flight)."""
+        claimed, waiting = [], {}
+        with self._lock:
+            for key in keys:
+                future = self._inflight.get(key)
+                if future is None:
+                    self._inflight[key] = Future()
+                    claimed.append(key)
+                else:
+                    waiting[key] = future
+        return claimed, waiting
+
+    def resolve(self, results, claimed):
+        """Publish the results of claimed keys (missing keys resolve to None)."""
+        with self._lock:
+            futures = [self._inflight.pop(key) for key in claimed]
+        for key, future in zip(claimed, futures):
+            future.set_result(results.get(key))
+
+    def fail(self, error, claimed):
+        """Propagate a fetch error to everyone waiting on the claimed keys."""
+        with self._lock:
+            futures = [self._inflight.pop(key) for key in claimed]
+        for future in futures:
+            future.set_exception(error)
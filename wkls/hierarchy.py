@@ -0,0 +1,177 @@
+from collections import defaultdict, deque
+
+from .index import normalize_name
+
+
+def _subtype_set(subtypes):
+    if subtypes is None:
+        return None
+    if isinstance(subtypes, str):
+        return {subtypes}
+    return set(subtypes)
+
+
+class Hierarchy:
+    """Parent/child adjacency between the divisions of the wkls metadata table.
+
+    Rows are grouped by division_id, since a division may have several
+    areas. A division's parent is its parent_division_id when the metadata
+    carries parent links (see scripts/build_metadata.py); otherwise places
+    hang off their region and regions off their country, following the
+    country and region codes. Walks only touch the divisions they return, so
+    enumerating a subtree costs O(subtree size) rather than a table scan per
+    level.
+    """
+
+    def __init__(self, columns, rows):
+        self.columns = list(columns)
+        col = {name: i for i, name in enumerate(self.columns)}
+        self._country_i, self._region_i = col["country"], col["region"]
+        self._subtype_i, self._name_i = col["subtype"], col["name"]
+        self._id_i, self._division_i = col["id"], col["division_id"]
+        parent_i = col.get("parent_division_id")
+
+        self.rows = list(rows)
+        self.division_rows = defaultdict(list)
+        self.region_rows = defaultdict(list)
+        countries, regions = {}, {}
+        for position, row in enumerate(self.rows):
+            division_id = self.division_of(row)
+            self.division_rows[division_id].append(position)
+            subtype = row[self._subtype_i]
+            if subtype == "country":
+                countries.setdefault(row[self._country_i], division_id)
+            elif subtype == "region":
+                regions.setdefault(
+                    (row[self._country_i], row[self._region_i]), division_id
+                )
+            elif row[self._region_i] is not None:
+                self.region_rows[(row[self._country_i], row[self._region_i])].append(
+                    position
+                )
+        self.division_rows = dict(self.division_rows)
+        self.region_rows = dict(self.region_rows)
+
+        self.parent = {}
+        self.children = defaultdict(list)
+        for division_id, positions in self.division_rows.items():
+            row = self.rows[positions[0]]
+            parent = row[parent_i] if parent_i is not None else None
+            if parent not in self.division_rows:
+                subtype = row[self._subtype_i]
+                if subtype == "country":
+                    parent = None
+                elif subtype == "region":
+                    parent = countries.get(row[self._country_i])
+                else:
+                    parent = regions.get(
+                        (row[self._country_i], row[self._region_i])
+                    ) or countries.get(row[self._country_i])
+            if parent is not None and parent != division_id:
+                self.parent[division_id] = parent
+                self.children[parent].append(division_id)
+        self.children = dict(self.children)
+
+    @classmethod
+    def from_cursor(cls, cursor):
+        """Build the hierarchy from the wkls table through a DuckDB cursor."""
+        cursor.execute("SELECT * FROM wkls")
+        columns = [d[0] for d in cursor.description]
+        return cls(columns, cursor.fetchall())
+
+    def division_of(self, row):
+        """Return the division a row belongs to, falling back to its own id."""
+        return row[self._division_i] or row[self._id_i]
+
+    def rows_of(self, division_ids, subtypes=None):
+        """Return the rows of some divisions in table order, optionally by subtype."""
+        subtypes = _subtype_set(subtypes)
+        positions = sorted(
+            position
+            for division_id in division_ids
+            for position in self.division_rows.get(division_id, ())
+            if subtypes is None or self.rows[position][self._subtype_i] in subtypes
+        )
+        return [self.rows[position] for position in positions]
+
+    def child_divisions(self, division_ids):
+        """Return the direct children of some divisions."""
+        return list(
+            dict.fromkeys(
+                child
+                for division_id in division_ids
+                for child in self.children.get(division_id, ())
+            )
+        )
+
+    def parent_divisions(self, division_ids):
+        """Return the direct parents of some divisions."""
+        return list(
+            dict.fromkeys(
+                self.parent[division_id]
+                for division_id in division_ids
+                if division_id in self.parent
+            )
+        )
+
+    def ancestor_divisions(self, division_ids):
+        """Return every ancestor of some divisions, nearest first."""
+        seen = set(division_ids)
+        ancestors = []
+        level = self.parent_divisions(division_ids)
+        while level:
+            level = [division_id for division_id in level if division_id not in seen]
+            seen.update(level)
+            ancestors.extend(level)
+            level = self.parent_divisions(level)
+        return ancestors
+
+    def descendant_divisions(self, division_ids):
+        """Return every descendant of some divisions, breadth first."""
+        seen = set(division_ids)
+        descendants = []
+        queue = deque(self.child_divisions(division_ids))
+        while queue:
+            division_id = queue.popleft()
+            if division_id in seen:
+                continue
+            seen.add(division_id)
+            descendants.append(division_id)
+            queue.extend(self.children.get(division_id, ()))
+        return descendants
+
+    def find_descendants(self, division_ids, name):
+        """Return the shallowest descendants whose name matches a chain part.
+
+        name is compared like the third level of a chain: without spaces and
+        case-insensitively.
+        """
+        key = normalize_name(name)
+        seen = set(division_ids)
+        level = self.child_divisions(division_ids)
+        while level:
+            matches = [
+                division_id
+                for division_id in level
+                if self._name_key(division_id) == key
+            ]
+            if matches:
+                return matches
+            seen.update(level)
+            level = [
+                child for child in self.child_divisions(level) if child not in seen
+            ]
+        return []
+
+    def _name_key(self, division_id):
+        name = self.rows[self.division_rows[division_id][0]][self._name_i]
+        return normalize_name(name) if name is not None else None
+
+    def in_region(self, country, region, subtypes):
+        """Return the rows below region level with a region code, in table order."""
+        subtypes = _subtype_set(subtypes)
+        return [
+            self.rows[position]
+            for position in self.region_rows.get((country, region), ())
+            if self.rows[position][self._subtype_i] in subtypes
+        ]
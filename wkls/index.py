@@ -0,0 +1,79 @@
+from collections import defaultdict
+
+# Subtypes matched by the third level of a chain (see CITY_QUERY)
+PLACE_SUBTYPES = ("county", "locality", "localadmin")
+
+# Characters that make ILIKE treat a name as a pattern rather than a literal
+LIKE_WILDCARDS = ("%", "_")
+
+
+def normalize_name(name):
+    """Normalize a place name the way CITY_QUERY compares them.
+
+    CITY_QUERY strips spaces from both sides and compares with ILIKE, which
+    lowercases each character on its own: "Straße" does not match "strasse",
+    "İstanbul" matches "istanbul" and every "Σ" is "σ". str.lower() and
+    str.casefold() differ on exactly those names, so characters whose full
+    lowercase mapping is longer, or depends on context, are lowered one by one.
+    """
+    name = name.replace(" ", "")
+    lowered = name.lower()
+    if len(lowered) == len(name) and "Σ" not in name:
+        return lowered
+    return "".join(c.lower()[0] for c in name)
+
+
+class MetadataIndex:
+    """Pure-Python lookup tables over the rows of the wkls metadata table.
+
+    Rows are kept as tuples in table order and grouped by country, by
+    (country, region) and by (country, region, normalized name), so exact
+    chain lookups are dictionary hits instead of SQL queries.
+    """
+
+    def __init__(self, columns, rows):
+        self.columns = list(columns)
+        col = {name: i for i, name in enumerate(self.columns)}
+        country_i, region_i = col["country"], col["region"]
+        subtype_i, name_i = col["subtype"], col["name"]
+
+        self.countries = defaultdict(list)
+        self.regions = defaultdict(list)
+        self.places = defaultdict(list)
+        for row in rows:
+            subtype = row[subtype_i]
+            if subtype == "country":
+                self.countries[row[country_i]].append(row)
+            elif subtype == "region":
+                self.regions[(row[country_i], row[region_i])].append(row)
+            elif subtype in PLACE_SUBTYPES and row[name_i] is not None:
+                key = (row[country_i], row[region_i], normalize_name(row[name_i]))
+                self.places[key].append(row)
+        # Freeze the tables so that lookups of missing keys don't grow them
+        self.countries = dict(self.countries)
+        self.regions = dict(self.regions)
+        self.places = dict(self.places)
+
+    @classmethod
+    def from_cursor(cls, cursor):
+        """Build the index from the wkls table through a DuckDB cursor."""
+        cursor.execute("SELECT * FROM wkls")
+        columns = [d[0] for d in cursor.description]
+        return cls(columns, cursor.fetchall())
+
+    def lookup(self, chain):
+        """Return the rows matching a 1-3 level chain.
+
+        Returns None when the chain contains LIKE wildcards, in which case the
+        caller has to fall back to the SQL query.
+        """
+        country_iso = chain[0].upper()
+        if len(chain) == 1:
+            return self.countries.get(country_iso, [])
+        region_iso = country_iso + "-" + chain[1].upper()
+        if len(chain) == 2:
+            return self.regions.get((country_iso, region_iso), [])
+        if any(c in chain[2] for c in LIKE_WILDCARDS):
+            return None
+        key = (country_iso, region_iso, normalize_name(chain[2]))
+        return self.places.get(key, [])
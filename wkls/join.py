@@ -0,0 +1,174 @@
+import os
+
+from .engine import sql_string
+from .export import EXPORT_FORMATS
+from .results import fetch
+
+# Metadata columns added to every input row, prefixed with the level
+JOIN_COLUMNS = ("id", "name", "region")
+
+# Boundaries of one level whose bounding box overlaps the extent of the input
+BOUNDARIES_QUERY = """
+    CREATE OR REPLACE TEMP TABLE wkls_join_boundaries AS
+    SELECT b.id, w.name, w.region, b.xmin, b.ymin, b.xmax, b.ymax,
+           NULL::GEOMETRY AS geometry
+    FROM ({bboxes}) b
+    JOIN wkls w ON w.id = b.id
+    WHERE w.subtype = ?
+      {country}
+      AND b.xmax >= ? AND b.xmin <= ?
+      AND b.ymax >= ? AND b.ymin <= ?
+"""
+
+# Bounding boxes from the metadata table, or read from the geometry source
+METADATA_BBOXES = "SELECT id, xmin, ymin, xmax, ymax FROM wkls WHERE xmin IS NOT NULL"
+SOURCE_BBOXES = """
+    SELECT id, bbox.xmin AS xmin, bbox.ymin AS ymin,
+           bbox.xmax AS xmax, bbox.ymax AS ymax
+    FROM parquet_scan({source})
+    WHERE subtype = {level}
+"""
+
+
+def _relation(cursor, data):
+    """Return the SQL relation reading the input, registering in-memory tables."""
+    if isinstance(data, (str, os.PathLike)):
+        return f"read_parquet({sql_string(data)})"
+    cursor.register("wkls_join_input", data)
+    return "wkls_join_input"
+
+
+def _geometry_expr(cursor, relation, column):
+    """Return the expression turning an input geometry column into GEOMETRY."""
+    types = {
+        row[0]: row[1]
+        for row in cursor.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()
+    }
+    if column not in types:
+        raise ValueError(f"The input has no {column} column.")
+    if types[column] == "BLOB":
+        return f'ST_GeomFromWKB(i."{column}")'
+    if types[column] == "VARCHAR":
+        return f'ST_GeomFromText(i."{column}")'
+    return f'i."{column}"'
+
+
+def _input_shape(cursor, relation, lon, lat, geometry):
+    """Return the per-row bbox expressions of the input and the exact predicate."""
+    if geometry is None:
+        columns = {
+            row[0]
+            for row in cursor.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()
+        }
+        if lon in columns and lat in columns:
+            x, y = f'i."{lon}"', f'i."{lat}"'
+            return (x, y, x, y), f"ST_Contains(b.geometry, ST_Point({x}, {y}))"
+        if "geometry" not in columns:
+            raise ValueError(
+                f"spatial_join() needs {lon} and {lat} columns, or a geometry column."
+            )
+        geometry = "geometry"
+    geom = _geometry_expr(cursor, relation, geometry)
+    bounds = tuple(f"ST_{part}({geom})" for part in ("XMin", "YMin", "XMax", "YMax"))
+    return bounds, f"ST_Intersects(b.geometry, {geom})"
+
+
+def spatial_join(
+    engine,
+    data,
+    level="county",
+    country=None,
+    lon="lon",
+    lat="lat",
+    geometry=None,
+    output=None,
+    prefix=None,
+):
+    """Tag every row of a table with the boundaries of one level it falls in.
+
+    data is a pandas DataFrame, a pyarrow Table or the path (or glob) of
+    Parquet files, holding either lon/lat columns or a geometry column as
+    WKB, WKT or GEOMETRY. Points are matched to the boundaries containing
+    them, geometries to the boundaries they intersect.
+
+    The whole join runs in DuckDB: one pass over the input computes its
+    extent, the boundaries of level (optionally in one country) whose
+    bounding box overlaps it are picked, their geometries are fetched once
+    (through the geometry cache), and a bbox range join followed by the exact
+    test tags the rows. Every input row is kept, once per matching boundary,
+    with NULLs when nothing matches; the id, name and region of the boundary
+    are added as {prefix}id, {prefix}name and {prefix}region, prefix
+    defaulting to "{level}_".
+
+    With output, the result is streamed by DuckDB into a Parquet file, so
+    Parquet inputs larger than memory are never loaded, and the number of
+    rows written is returned. Otherwise the result is returned as a DataFrame
+    or pyarrow Table.
+    """
+    prefix = f"{level}_" if prefix is None else prefix
+    if not engine.sql(
+        "SELECT count(*) FROM wkls WHERE subtype = ?", [level]
+    ).fetchone()[0]:
+        raise ValueError(f"Unknown level: {level}. Use a subtype from wkls.subtypes().")
+    engine.load_spatial()
+    cursor = engine.cursor()
+    relation = _relation(cursor, data)
+    try:
+        (xmin, ymin, xmax, ymax), predicate = _input_shape(
+            cursor, relation, lon, lat, geometry
+        )
+        extent = cursor.execute(
+            f"SELECT min({xmin}), max({xmax}), min({ymin}), max({ymax}) "
+            f"FROM {relation} i"
+        ).fetchone()
+
+        if engine.has_spatial_metadata():
+            bboxes = METADATA_BBOXES
+        else:
+            bboxes = SOURCE_BBOXES.format(
+                source=sql_string(engine.geometry_source), level=sql_string(level)
+            )
+        # An empty input has a NULL extent, which matches no boundary
+        params = [level] + ([country.upper()] if country else []) + list(extent)
+        cursor.execute(
+            BOUNDARIES_QUERY.format(
+                bboxes=bboxes, country="AND w.country = ?" if country else ""
+            ),
+            params,
+        )
+        ids = [
+            row[0]
+            for row in cursor.execute("SELECT id FROM wkls_join_boundaries").fetchall()
+        ]
+        if ids:
+            wkbs = engine.fetch_wkb_many(ids)
+            cursor.execute(
+                """
+                UPDATE wkls_join_boundaries b
+                SET geometry = ST_GeomFromWKB(g.wkb)
+                FROM (SELECT UNNEST($1) AS id, UNNEST($2) AS wkb) g
+                WHERE b.id = g.id
+                """,
+                [list(wkbs), list(wkbs.values())],
+            )
+
+        added = ", ".join(
+            f'b.{column} AS "{prefix}{column}"' for column in JOIN_COLUMNS
+        )
+        query = f"""
+            SELECT i.*, {added}
+            FROM {relation} i
+            LEFT JOIN wkls_join_boundaries b
+              ON {xmax} >= b.xmin AND {xmin} <= b.xmax
+             AND {ymax} >= b.ymin AND {ymin} <= b.ymax
+             AND {predicate}
+        """
+        if output is not None:
+            return cursor.execute(
+                f"COPY ({query}) TO {sql_string(output)} ({EXPORT_FORMATS['parquet']})"
+            ).fetchone()[0]
+        return fetch(cursor.execute(query), engine.backend)
+    finally:
+        cursor.execute("DROP TABLE IF EXISTS wkls_join_boundaries")
+        if relation == "wkls_join_input":
+            cursor.unregister("wkls_join_input")
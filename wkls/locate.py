@@ -0,0 +1,104 @@
+from .index import PLACE_SUBTYPES
+from .results import fetch, from_rows, pa, pd
+
+# Subtypes reported by reverse geocoding, outermost first
+LOCATE_SUBTYPES = ("country", "region") + PLACE_SUBTYPES
+
+# Number of points tested per DuckDB query in locate_many()
+LOCATE_CHUNK_SIZE = 1_000_000
+
+_SUBTYPE_ORDER = "[" + ", ".join(f"'{s}'" for s in LOCATE_SUBTYPES) + "]"
+
+# Divisions whose bounding box contains at least one point
+CANDIDATES_QUERY = """
+    SELECT DISTINCT b.id
+    FROM wkls_points p
+    JOIN wkls_bbox b
+      ON p.lon BETWEEN b.xmin AND b.xmax
+     AND p.lat BETWEEN b.ymin AND b.ymax
+"""
+
+LOCATE_QUERY = f"""
+    SELECT p.point, w.*
+    FROM wkls_points p
+    JOIN wkls_bbox b
+      ON p.lon BETWEEN b.xmin AND b.xmax
+     AND p.lat BETWEEN b.ymin AND b.ymax
+    JOIN wkls_locate_geoms g ON g.id = b.id
+    JOIN wkls w ON w.id = b.id
+    WHERE ST_Contains(g.geometry, ST_Point(p.lon, p.lat))
+    ORDER BY p.point, list_position({_SUBTYPE_ORDER}, w.subtype)
+"""
+
+
+def locate_points(engine, lons, lats, chunk_size=LOCATE_CHUNK_SIZE):
+    """Return the divisions containing each (lon, lat) point.
+
+    Candidates are picked with a range join against the engine's bounding box
+    table, their geometries are fetched once (through the geometry cache) and
+    the exact point-in-polygon tests run in bulk in DuckDB. Points are
+    processed in chunks of chunk_size to bound memory.
+
+    Returns a long DataFrame (or pyarrow Table) with a point column (the position of the point in
+    the input) followed by the metadata columns, one row per containing
+    division, ordered by point and then from country down to place.
+    """
+    arrow = engine.backend == "arrow"
+    if arrow:
+        lons, lats = _float_array(lons), _float_array(lats)
+    else:
+        lons = pd.Series(lons, dtype="float64").to_numpy()
+        lats = pd.Series(lats, dtype="float64").to_numpy()
+    if len(lons) != len(lats):
+        raise ValueError("lons and lats must have the same length.")
+
+    engine.load_spatial()
+    engine.initialize_bboxes()
+    cursor = engine.cursor()
+    cursor.execute(
+        "CREATE OR REPLACE TEMP TABLE wkls_locate_geoms (id VARCHAR, geometry GEOMETRY)"
+    )
+    loaded = set()
+    frames = []
+    try:
+        for start in range(0, len(lons), chunk_size):
+            stop = min(start + chunk_size, len(lons))
+            columns = {
+                "point": range(start, stop),
+                "lon": lons[start:stop],
+                "lat": lats[start:stop],
+            }
+            points = pa.table(columns) if arrow else pd.DataFrame(columns)
+            cursor.register("wkls_points", points)
+            try:
+                candidates = cursor.execute(CANDIDATES_QUERY).fetchall()
+                new = [geom_id for (geom_id,) in candidates if geom_id not in loaded]
+                if new:
+                    wkbs = engine.fetch_wkb_many(new)
+                    ids = list(wkbs)
+                    cursor.execute(
+                        """
+                        INSERT INTO wkls_locate_geoms
+                        SELECT id, ST_GeomFromWKB(wkb)
+                        FROM (SELECT UNNEST($1) AS id, UNNEST($2) AS wkb)
+                        """,
+                        [ids, [wkbs[geom_id] for geom_id in ids]],
+                    )
+                    loaded.update(new)
+                frames.append(fetch(cursor.execute(LOCATE_QUERY), engine.backend))
+            finally:
+                cursor.unregister("wkls_points")
+    finally:
+        cursor.execute("DROP TABLE IF EXISTS wkls_locate_geoms")
+
+    if not frames:
+        return from_rows(["point"] + engine.index().columns, [], engine.backend)
+    if arrow:
+        return pa.concat_tables(frames)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _float_array(values):
+    if isinstance(values, pa.ChunkedArray):
+        return values.combine_chunks().cast(pa.float64())
+    return pa.array(values, pa.float64())
@@ -0,0 +1,217 @@
+import multiprocessing
+import os
+import posixpath
+import queue
+from collections import defaultdict
+
+import duckdb
+
+from .engine import BATCH_CHUNK_SIZE, sql_string
+
+# Column expression that returns geometries as WKB, the format that is cached
+WKB_EXPR = "ST_AsWKB(geometry)"
+
+# Messages each worker may have waiting in the result queue; bounds how many
+# fetched chunks are held in memory when the consumer is slower than workers
+QUEUE_CHUNKS_PER_WORKER = 2
+
+# Seconds between checks that no worker died without reporting
+WORKER_POLL_SECONDS = 1.0
+
+CANDIDATE_FILES_QUERY = """
+    SELECT DISTINCT r.file_name, i.id
+    FROM (SELECT UNNEST(?::VARCHAR[]) AS id) i
+    JOIN (
+        SELECT file_name, stats_min_value AS lo, stats_max_value AS hi
+        FROM parquet_metadata({source})
+        WHERE path_in_schema = 'id'
+    ) r
+      ON (r.lo IS NULL OR i.id >= r.lo)
+     AND (r.hi IS NULL OR i.id <= r.hi)
+"""
+
+
+def candidate_files(engine, geom_ids):
+    """Return a dict of division_area file to the requested ids it can contain.
+
+    Ids in the row-group index map to the one file holding them. The other
+    ids are matched against the min/max id statistics of every row group,
+    read from the parquet footers, so each id goes to the files whose ranges
+    cover it.
+    """
+    files = defaultdict(list)
+    rest = list(geom_ids)
+    cursor = engine.cursor()
+    if engine.rowgroup_index and rest:
+        base = posixpath.dirname(engine.geometry_source)
+        located = cursor.execute(
+            f"""
+            SELECT file, id FROM read_parquet({sql_string(engine.rowgroup_index)})
+            WHERE id IN (SELECT UNNEST(?::VARCHAR[]))
+            """,
+            [rest],
+        ).fetchall()
+        for file, geom_id in located:
+            files[f"{base}/{file}"].append(geom_id)
+        found = {geom_id for _, geom_id in located}
+        rest = [geom_id for geom_id in rest if geom_id not in found]
+    if rest:
+        query = CANDIDATE_FILES_QUERY.format(source=sql_string(engine.geometry_source))
+        for file, geom_id in cursor.execute(query, [rest]).fetchall():
+            files[file].append(geom_id)
+    return dict(files)
+
+
+def partition_files(files, workers):
+    """Split a dict of file to ids into at most `workers` disjoint sets of files.
+
+    Files are assigned largest first to the worker with the fewest ids so far,
+    which keeps the ids per worker balanced.
+    """
+    partitions = [[] for _ in range(min(workers, len(files)))]
+    loads = [0] * len(partitions)
+    for file, ids in sorted(files.items(), key=lambda item: -len(item[1])):
+        worker = loads.index(min(loads))
+        partitions[worker].append((file, ids))
+        loads[worker] += len(ids)
+    return partitions
+
+
+def _fetch_worker(index, assignment, expr, chunk_size, threads, memory_limit, results):
+    """Read the ids of a disjoint set of files on a connection of its own."""
+    try:
+        conn = duckdb.connect(":memory:")
+        conn.execute(f"SET threads = {threads}")
+        if memory_limit:
+            conn.execute(f"SET memory_limit = {sql_string(memory_limit)}")
+        conn.execute("INSTALL spatial")
+        conn.load_extension("spatial")
+        for file, ids in assignment:
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start : start + chunk_size]
+                placeholders = ", ".join("?" for _ in chunk)
+                query = f"""
+                    SELECT id, {expr}
+                    FROM read_parquet({sql_string(file)})
+                    WHERE id IN ({placeholders})
+                """
+                results.put(("rows", conn.execute(query, chunk).fetchall()))
+        results.put(("done", index))
+    except Exception as e:
+        results.put(("error", f"{type(e).__name__}: {e}"))
+        raise
+
+
+def _record_misses(engine, geom_ids, fetched=()):
+    """Count ids whose fetch is complete and remember those that were not found."""
+    engine.count_fetches("misses", len(geom_ids))
+    engine.record_missing(geom_id for geom_id in geom_ids if geom_id not in fetched)
+
+
+def fetch_parallel(
+    engine,
+    geom_ids,
+    workers=None,
+    expr=WKB_EXPR,
+    chunk_size=BATCH_CHUNK_SIZE,
+    memory_limit=None,
+):
+    """Yield (id, geometry) pairs, fetched by a pool of worker processes.
+
+    Ids already in the local geometry cache are yielded first. The others
+    are grouped by the division_area files that can contain them, and each
+    worker process reads a disjoint set of files on its own DuckDB
+    connection, with its share of the CPU threads and an optional DuckDB
+    memory_limit. Results are yielded as each chunk of ids finishes; the
+    queue between workers and the caller holds a few chunks per worker, so
+    memory stays bounded when the caller is slower. expr is the column
+    expression to return, WKB by default; WKB results are written to the
+    cache. Ids without a geometry are not yielded; they are counted as
+    misses and remembered in the negative cache as soon as every worker
+    whose files could hold them is done.
+
+    Workers are started with the "spawn" method: scripts calling this must
+    guard their entry point with `if __name__ == "__main__":`.
+    """
+    geom_ids = list(dict.fromkeys(geom_ids))
+    cache = engine.geometry_cache()
+    cached = {}
+    pending = []
+    for geom_id in geom_ids:
+        if engine.is_known_missing(geom_id):
+            continue
+        wkb = cache.get(geom_id) if cache is not None else None
+        if wkb is None:
+            pending.append(geom_id)
+        else:
+            cached[geom_id] = wkb
+    engine.count_fetches("hits", len(cached))
+    if cached:
+        values = list(cached.values())
+        if expr != WKB_EXPR:
+            values = engine.convert_wkb_many(values, expr)
+        yield from zip(cached, values)
+    if not pending:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    partitions = partition_files(candidate_files(engine, pending), workers)
+    # Number of partitions still to finish that have files which can hold
+    # each id; ids no file can hold are missing right away
+    partition_ids = [
+        {i for _, ids in assignment for i in ids} for assignment in partitions
+    ]
+    remaining = defaultdict(int)
+    for ids in partition_ids:
+        for geom_id in ids:
+            remaining[geom_id] += 1
+    fetched = set()
+    _record_misses(engine, [geom_id for geom_id in pending if geom_id not in remaining])
+    threads = max(1, (os.cpu_count() or 1) // max(1, len(partitions)))
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue(maxsize=QUEUE_CHUNKS_PER_WORKER * max(1, len(partitions)))
+    processes = [
+        context.Process(
+            target=_fetch_worker,
+            args=(index, assignment, expr, chunk_size, threads, memory_limit, results),
+            daemon=True,
+        )
+        for index, assignment in enumerate(partitions)
+    ]
+    for process in processes:
+        process.start()
+
+    try:
+        running = len(processes)
+        while running:
+            try:
+                kind, payload = results.get(timeout=WORKER_POLL_SECONDS)
+            except queue.Empty:
+                if any(process.exitcode not in (None, 0) for process in processes):
+                    raise RuntimeError("A geometry fetch worker exited unexpectedly")
+                continue
+            if kind == "done":
+                running -= 1
+                completed = []
+                for geom_id in partition_ids[payload]:
+                    remaining[geom_id] -= 1
+                    if not remaining[geom_id]:
+                        completed.append(geom_id)
+                _record_misses(engine, completed, fetched)
+            elif kind == "error":
+                raise RuntimeError(f"Geometry fetch worker failed: {payload}")
+            else:
+                for geom_id, value in payload:
+                    if geom_id in fetched:
+                        continue
+                    fetched.add(geom_id)
+                    if expr == WKB_EXPR:
+                        value = bytes(value)
+                        if cache is not None:
+                            cache.put(geom_id, value)
+                    yield geom_id, value
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
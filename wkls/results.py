@@ -0,0 +1,86 @@
+import os
+
+# pandas and pyarrow are both optional; at least one of them is needed
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Result types returned by listing and lookup methods
+BACKENDS = ("pandas", "arrow")
+
+# Field metadata marking a binary column as GeoArrow WKB
+GEOARROW_WKB_METADATA = {
+    b"ARROW:extension:name": b"geoarrow.wkb",
+    b"ARROW:extension:metadata": b'{"crs": "OGC:CRS84"}',
+}
+
+
+def resolve_backend(backend=None):
+    """Return the result backend to use, checking that its library is installed.
+
+    Without an explicit backend, $WKLS_BACKEND is used, falling back to pandas
+    when it is installed and to arrow otherwise.
+    """
+    backend = backend or os.environ.get("WKLS_BACKEND")
+    if not backend:
+        if pd is None and pa is None:
+            raise ValueError(
+                "wkls results need pandas or pyarrow. Install wkls[pandas] or wkls[arrow]."
+            )
+        backend = "pandas" if pd is not None else "arrow"
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown result backend: {backend}. Use one of {', '.join(BACKENDS)}."
+        )
+    if backend == "pandas" and pd is None:
+        raise ValueError(
+            "The pandas backend requires pandas. Install wkls[pandas] or use the arrow backend."
+        )
+    if backend == "arrow" and pa is None:
+        raise ValueError(
+            "The arrow backend requires pyarrow. Install wkls[arrow] or use the pandas backend."
+        )
+    return backend
+
+
+def fetch(result, backend):
+    """Fetch a DuckDB query result as a pandas DataFrame or a pyarrow Table."""
+    if backend == "arrow":
+        # to_arrow_table() replaces fetch_arrow_table() in newer DuckDB releases
+        to_arrow = getattr(result, "to_arrow_table", None) or result.fetch_arrow_table
+        return to_arrow()
+    return result.df()
+
+
+def from_rows(
+    columns, rows, backend, float_columns=(), binary_columns=(), int_columns=()
+):
+    """Build a result from row tuples.
+
+    With the arrow backend, columns are typed as strings unless listed in
+    float_columns, binary_columns or int_columns.
+    """
+    if backend == "arrow":
+        types = {name: pa.float64() for name in float_columns}
+        types.update({name: pa.int64() for name in int_columns})
+        types.update({name: pa.binary() for name in binary_columns})
+        return pa.table(
+            {
+                name: pa.array([row[i] for row in rows], types.get(name, pa.string()))
+                for i, name in enumerate(columns)
+            }
+        )
+    return pd.DataFrame(list(rows), columns=columns)
+
+
+def with_geoarrow_wkb(table, column="geometry"):
+    """Tag a binary column of a pyarrow Table as GeoArrow WKB."""
+    index = table.schema.get_field_index(column)
+    field = pa.field(column, pa.binary(), metadata=GEOARROW_WKB_METADATA)
+    return table.set_column(index, field, table.column(column).cast(pa.binary()))
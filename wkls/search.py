@@ -0,0 +1,206 @@
+import bisect
+import heapq
+import math
+import unicodedata
+from array import array
+from collections import Counter, defaultdict
+
+# Letters that do not decompose into a base letter plus combining accents
+TRANSLITERATIONS = str.maketrans(
+    {
+        "æ": "ae",
+        "ø": "o",
+        "œ": "oe",
+        "ł": "l",
+        "đ": "d",
+        "ð": "d",
+        "þ": "th",
+        "ı": "i",
+    }
+)
+
+# Order of subtypes among equally good matches, most prominent first
+SUBTYPE_RANK = {
+    subtype: rank
+    for rank, subtype in enumerate(
+        (
+            "country",
+            "dependency",
+            "region",
+            "locality",
+            "localadmin",
+            "county",
+            "borough",
+            "macrohood",
+            "neighborhood",
+            "microhood",
+        )
+    )
+}
+
+# Minimum trigram similarity of a fuzzy match
+FUZZY_THRESHOLD = 0.4
+
+
+def search_key(name):
+    """Normalize a name for search: casefolded, unaccented, letters and digits only.
+
+    "São Paulo", "sao paulo" and "SAO-PAULO" all map to "saopaulo".
+    """
+    name = unicodedata.normalize("NFKD", name.casefold().translate(TRANSLITERATIONS))
+    return "".join(c for c in name if c.isalnum() and not unicodedata.combining(c))
+
+
+def trigrams(key):
+    """Return the set of trigrams of a search key, padded like pg_trgm."""
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _sorted_buckets(groups):
+    """Return (key length, subtype rank, row indices) buckets, best first."""
+    return [
+        (length, subtype_rank, array("I", indices))
+        for (length, subtype_rank), indices in sorted(groups.items())
+    ]
+
+
+class _BucketKeys:
+    """The search keys of a bucket's rows, as a sequence that can be bisected."""
+
+    __slots__ = ("_indices", "_keys")
+
+    def __init__(self, indices, keys):
+        self._indices = indices
+        self._keys = keys
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        return self._keys[self._indices[i]]
+
+
+class SearchIndex:
+    """Prefix and fuzzy name search over the rows of the wkls metadata table.
+
+    Rows are kept sorted by search key. Prefix matches score by key length
+    alone, so rows are also grouped into buckets by key length and subtype
+    (overall and per country), visited best first: each bucket is a bisected
+    range, and the search stops as soon as limit matches are found, however
+    many rows share a short prefix. Queries without enough prefix matches
+    fall back to trigram candidates, ranked by trigram similarity. Results
+    are ordered by match quality, then subtype prominence, then name length,
+    then alphabetically.
+    """
+
+    def __init__(self, columns, rows):
+        self.columns = list(columns)
+        col = {name: i for i, name in enumerate(self.columns)}
+        self._country_i, self._subtype_i = col["country"], col["subtype"]
+        self._name_i = col["name"]
+
+        entries = sorted(
+            (
+                (search_key(row[self._name_i]), row)
+                for row in rows
+                if row[self._name_i] is not None
+            ),
+            key=lambda entry: (entry[0], entry[1][self._name_i]),
+        )
+        self.keys = [key for key, _ in entries]
+        self.rows = [row for _, row in entries]
+
+        groups = defaultdict(list)
+        country_groups = defaultdict(lambda: defaultdict(list))
+        for i, (key, row) in enumerate(entries):
+            bucket = (len(key), self._subtype_rank(row))
+            groups[bucket].append(i)
+            country_groups[row[self._country_i]][bucket].append(i)
+        self._buckets = _sorted_buckets(groups)
+        self._country_buckets = {
+            country: _sorted_buckets(buckets)
+            for country, buckets in country_groups.items()
+        }
+        self.gram_counts = []
+        postings = defaultdict(list)
+        for i, key in enumerate(self.keys):
+            grams = trigrams(key)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(i)
+        self.postings = dict(postings)
+
+    def _subtype_rank(self, row):
+        return SUBTYPE_RANK.get(row[self._subtype_i], len(SUBTYPE_RANK))
+
+    @classmethod
+    def from_cursor(cls, cursor):
+        """Build the index from the wkls table through a DuckDB cursor."""
+        cursor.execute("SELECT * FROM wkls")
+        columns = [d[0] for d in cursor.description]
+        return cls(columns, cursor.fetchall())
+
+    def search(self, query, country=None, limit=10):
+        """Return up to limit (row, score) pairs matching query, best first.
+
+        Exact matches score 1, prefix matches between 0.5 and 1 (longer
+        completions score lower) and fuzzy matches below 0.5.
+        """
+        key = search_key(query)
+        if not key or limit <= 0:
+            return []
+        country = country.upper() if country else None
+
+        scores = {}
+        buckets = (
+            self._buckets if country is None else self._country_buckets.get(country, [])
+        )
+        # Buckets come best first, and within one bucket matches come in rank
+        # order, so the first limit matches are the best prefix matches
+        for length, _, indices in buckets[bisect.bisect_left(buckets, (len(key),)) :]:
+            keys = _BucketKeys(indices, self.keys)
+            start = bisect.bisect_left(keys, key)
+            stop = bisect.bisect_left(keys, key + "\uffff", lo=start)
+            for i in indices[start : min(stop, start + limit - len(scores))]:
+                scores[i] = 0.5 + 0.5 * len(key) / length
+            if len(scores) >= limit:
+                break
+
+        if len(scores) < limit and len(key) >= 3:
+            # A match shares at least `needed` trigrams with the query, so it
+            # must contain one of the len(grams) - needed + 1 rarest ones
+            grams = sorted(trigrams(key), key=lambda g: len(self.postings.get(g, ())))
+            needed = math.ceil(FUZZY_THRESHOLD * len(grams) / (2 - FUZZY_THRESHOLD))
+            probe, rest = (
+                grams[: len(grams) - needed + 1],
+                grams[len(grams) - needed + 1 :],
+            )
+            shared = Counter()
+            for gram in probe:
+                shared.update(self.postings.get(gram, ()))
+            for i, count in shared.items():
+                if i in scores:
+                    continue
+                if country is not None and self.rows[i][self._country_i] != country:
+                    continue
+                if rest:
+                    padded = f"  {self.keys[i]} "
+                    count += sum(gram in padded for gram in rest)
+                similarity = 2 * count / (len(grams) + self.gram_counts[i])
+                if similarity >= FUZZY_THRESHOLD:
+                    scores[i] = 0.5 * similarity
+
+        def rank(i):
+            row = self.rows[i]
+            key = self.keys[i]
+            return (
+                -scores[i],
+                self._subtype_rank(row),
+                len(key),
+                key,
+                row[self._name_i],
+            )
+
+        best = heapq.nsmallest(limit, scores, key=rank)
+        return [(self.rows[i], scores[i]) for i in best]
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+# Phases of a wkls call that are timed when instrumentation is enabled:
+# chain resolution, geometry reads (cache or source), conversion to the
+# requested format and metadata listings
+PHASES = ("resolve", "fetch", "convert", "list")
+
+# One timed phase, as passed to hooks
+Event = namedtuple(
+    "Event", ["phase", "seconds", "rows", "bytes_read", "files_read", "error"]
+)
+
+# Totals of a phase since instrumentation was enabled or reset
+PhaseStats = namedtuple(
+    "PhaseStats", ["calls", "seconds", "rows", "bytes_read", "files_read", "errors"]
+)
+EMPTY_PHASE = PhaseStats(0, 0.0, 0, 0, 0, 0)
+
+
+def profile_totals(profile):
+    """Return (bytes read, files read) from a DuckDB JSON query profile."""
+    files = 0
+    nodes = [profile]
+    while nodes:
+        node = nodes.pop()
+        files += int(node.get("extra_info", {}).get("Total Files Read", 0))
+        nodes.extend(node.get("children", ()))
+    return int(profile.get("total_bytes_read", 0)), files
+
+
+class _NullSpan:
+    """The span handed out while instrumentation is disabled. Does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, rows=0, bytes_read=0, files_read=0):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Times one phase of a call and reports it when the block exits."""
+
+    __slots__ = ("_start", "_stats", "bytes_read", "files_read", "phase", "rows")
+
+    def __init__(self, stats, phase):
+        self._stats = stats
+        self.phase = phase
+        self.rows = self.bytes_read = self.files_read = 0
+
+    def __enter__(self):
+        self._stats._push(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        self._stats._pop()
+        self._stats.record(
+            Event(
+                self.phase,
+                seconds,
+                self.rows,
+                self.bytes_read,
+                self.files_read,
+                None if exc_type is None else exc_type.__name__,
+            )
+        )
+        return False
+
+    def add(self, rows=0, bytes_read=0, files_read=0):
+        """Add rows returned and bytes and files read to the phase."""
+        self.rows += rows
+        self.bytes_read += bytes_read
+        self.files_read += files_read
+
+
+class Instrumentation:
+    """Optional per-phase timing of wkls calls.
+
+    While enabled, the engine wraps chain resolution, geometry fetches,
+    format conversion and listings in spans that record wall time and rows
+    returned. Queries reading the geometry source also record the bytes and
+    files DuckDB read, taken from its query profile. Totals per phase are
+    kept for snapshot(), and every finished span is passed to the registered
+    hooks, e.g. to feed an OpenTelemetry or Prometheus exporter.
+
+    While disabled, span() returns a shared no-op span and DuckDB profiling
+    stays off. Enabled by default when $WKLS_STATS is set to 1.
+    """
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get("WKLS_STATS") == "1"
+        self.enabled = enabled
+        self.hooks = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._totals = {}
+
+    def configure(self, enabled=True, hooks=None):
+        """Turn instrumentation on or off and replace the hooks if given."""
+        self.enabled = enabled
+        if hooks is not None:
+            self.hooks = list(hooks)
+
+    def span(self, phase):
+        """Return a context manager timing one phase of a call."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, phase)
+
+    def _push(self, span):
+        stack = getattr(self._local, "spans", None)
+        if stack is None:
+            stack = self._local.spans = []
+        stack.append(span)
+
+    def _pop(self):
+        self._local.spans.pop()
+
+    def add_profile(self, cursor):
+        """Add what the last query of a cursor read to the innermost open span."""
+        stack = getattr(self._local, "spans", None)
+        if not self.enabled or not stack:
+            return
+        profile = json.loads(cursor.get_profiling_information(format="json"))
+        bytes_read, files_read = profile_totals(profile)
+        stack[-1].add(bytes_read=bytes_read, files_read=files_read)
+
+    def record(self, event):
+        """Add a finished span to the totals and pass it to the hooks."""
+        with self._lock:
+            totals = self._totals.get(event.phase, EMPTY_PHASE)
+            self._totals[event.phase] = PhaseStats(
+                totals.calls + 1,
+                totals.seconds + event.seconds,
+                totals.rows + event.rows,
+                totals.bytes_read + event.bytes_read,
+                totals.files_read + event.files_read,
+                totals.errors + (event.error is not None),
+            )
+        for hook in self.hooks:
+            hook(event)
+
+    def snapshot(self, reset=False):
+        """Return a dict of phase to PhaseStats, optionally zeroing the totals."""
+        with self._lock:
+            totals = {phase: self._totals.get(phase, EMPTY_PHASE) for phase in PHASES}
+            if reset:
+                self._totals = {}
+        return totals
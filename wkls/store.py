@@ -0,0 +1,316 @@
+import bisect
+import json
+import mmap
+import sys
+from array import array
+
+from .index import LIKE_WILDCARDS, PLACE_SUBTYPES, normalize_name
+
+MAGIC = b"WKLSMETA"
+# Bumped when lookup keys change; 2 lowers names per character like ILIKE
+FORMAT_VERSION = 2
+
+# Low-cardinality columns stored as small integer codes into a value table
+DICTIONARY_COLUMNS = ("country", "region", "subtype")
+
+# Columns returned by countries(), as in its SQL listing
+COUNTRY_LIST_COLUMNS = ("id", "country", "subtype", "name", "division_id")
+
+# Sections start on multiples of this many bytes so that they can be cast
+ALIGNMENT = 8
+
+# Separates the parts of a lookup key; sorts before every printable character
+KEY_SEP = "\x1f"
+
+
+def lookup_key(country, region, subtype, name):
+    """Return the sort key that finds a row by chain or listing prefix.
+
+    Countries are keyed by code, regions by country and region code and every
+    other row by country, region code and normalized name.
+    """
+    if subtype == "country":
+        return f"c{KEY_SEP}{country}"
+    if subtype == "region":
+        return f"r{KEY_SEP}{country}{KEY_SEP}{region}"
+    name = normalize_name(name) if name is not None else ""
+    return f"p{KEY_SEP}{country}{KEY_SEP}{region or ''}{KEY_SEP}{name}"
+
+
+def _prefix_end(prefix):
+    # Prefixes end with KEY_SEP; the next character bounds every key below them
+    return prefix[:-1] + chr(ord(KEY_SEP) + 1)
+
+
+def _code_typecode(size):
+    return "B" if size <= 0xFF else "H" if size <= 0xFFFF else "I"
+
+
+class _Writer:
+    def __init__(self):
+        self.body = bytearray()
+
+    def section(self, data, typecode="B"):
+        self.body.extend(b"\0" * (-len(self.body) % ALIGNMENT))
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        offset = len(self.body)
+        self.body.extend(raw)
+        return {"offset": offset, "length": len(raw), "typecode": typecode}
+
+    def strings(self, values):
+        encoded = [(value or "").encode() for value in values]
+        total = sum(len(value) for value in encoded)
+        offsets = array("I" if total <= 0xFFFFFFFF else "Q", [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        return {
+            "offsets": self.section(offsets, offsets.typecode),
+            "data": self.section(b"".join(encoded)),
+        }
+
+    def column(self, name, values):
+        spec = {"name": name}
+        present = [value for value in values if value is not None]
+        if len(present) < len(values):
+            spec["valid"] = self.section(bytes(value is not None for value in values))
+        if not present:
+            spec["kind"] = "null"
+        elif name in DICTIONARY_COLUMNS:
+            table = sorted(set(present))
+            codes = {value: code for code, value in enumerate(table)}
+            typecode = _code_typecode(len(table))
+            spec["kind"] = "dict"
+            spec["values"] = self.strings(table)
+            spec["codes"] = self.section(
+                array(typecode, [codes.get(value, 0) for value in values]), typecode
+            )
+        elif isinstance(present[0], float):
+            spec["kind"] = "float64"
+            spec["data"] = self.section(
+                array("d", [0.0 if value is None else value for value in values]),
+                "d",
+            )
+        elif isinstance(present[0], int):
+            spec["kind"] = "int64"
+            spec["data"] = self.section(
+                array("q", [0 if value is None else value for value in values]), "q"
+            )
+        else:
+            spec["kind"] = "str"
+            spec.update(self.strings(values))
+        return spec
+
+
+def write_store(path, columns, rows):
+    """Write the rows of the wkls metadata table as a memory-mappable store.
+
+    Country, region and subtype are interned into per-column value tables;
+    other strings are kept once in a blob indexed by offsets, and numbers as
+    flat arrays. A sorted lookup key per row, with the permutation that sorts
+    the rows by it, answers chain lookups and listings by binary search.
+    """
+    columns = list(columns)
+    rows = list(rows)
+    col = {name: i for i, name in enumerate(columns)}
+    writer = _Writer()
+    specs = [
+        writer.column(name, [row[i] for row in rows]) for i, name in enumerate(columns)
+    ]
+    keys = [
+        lookup_key(
+            row[col["country"]],
+            row[col["region"]],
+            row[col["subtype"]],
+            row[col["name"]],
+        )
+        for row in rows
+    ]
+    order = sorted(range(len(rows)), key=lambda position: (keys[position], position))
+    order_typecode = "I" if len(rows) <= 0xFFFFFFFF else "Q"
+    header = {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "rows": len(rows),
+        "columns": specs,
+        "keys": writer.strings([keys[position] for position in order]),
+        "order": writer.section(array(order_typecode, order), order_typecode),
+    }
+    encoded = json.dumps(header).encode()
+    start = len(MAGIC) + 4 + len(encoded)
+    padding = -start % ALIGNMENT
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(4, "little"))
+        f.write(encoded)
+        f.write(b"\0" * padding)
+        f.write(writer.body)
+    return len(rows)
+
+
+def _section(body, spec):
+    view = body[spec["offset"] : spec["offset"] + spec["length"]]
+    return view.cast(spec["typecode"])
+
+
+class _Strings:
+    """Read-only sequence over an offset-indexed string section."""
+
+    def __init__(self, body, spec):
+        self._offsets = _section(body, spec["offsets"])
+        self._data = _section(body, spec["data"])
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self._data[self._offsets[i] : self._offsets[i + 1]], "utf-8")
+
+
+class _Column:
+    def __init__(self, body, spec):
+        self.kind = spec["kind"]
+        self._valid = _section(body, spec["valid"]) if "valid" in spec else None
+        if self.kind == "dict":
+            self.values = list(_Strings(body, spec["values"]))
+            self._codes = _section(body, spec["codes"])
+        elif self.kind == "str":
+            self._strings = _Strings(body, spec)
+        elif self.kind != "null":
+            self._data = _section(body, spec["data"])
+
+    def __getitem__(self, position):
+        if self._valid is not None and not self._valid[position]:
+            return None
+        if self.kind == "dict":
+            return self.values[self._codes[position]]
+        if self.kind == "str":
+            return self._strings[position]
+        return self._data[position]
+
+
+class MetadataStore:
+    """Read-only, memory-mapped copy of the wkls metadata table.
+
+    The file is written by write_store() (see
+    scripts/build_metadata_store.py) and mapped rather than loaded, so
+    processes reading the same file share its pages through the page cache
+    instead of each holding the table and its lookup index. Only the value
+    tables of the dictionary columns are decoded up front; rows are decoded
+    when returned.
+
+    It answers the same chain lookups as MetadataIndex and the country,
+    region and per-region listings, returning rows as tuples in table order.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if view[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a wkls metadata store: {path}")
+        size = int.from_bytes(view[len(MAGIC) : len(MAGIC) + 4], "little")
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(view[start : start + size]))
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported wkls metadata store version {header['version']}: "
+                f"{path}. Rebuild it with scripts/build_metadata_store.py."
+            )
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(
+                f"The wkls metadata store {path} was built on a "
+                f"{header['byteorder']}-endian machine. Rebuild it on this one."
+            )
+        start += size
+        body = view[start + (-start % ALIGNMENT) :]
+        self.columns = [spec["name"] for spec in header["columns"]]
+        self._columns = [_Column(body, spec) for spec in header["columns"]]
+        self._col = {name: i for i, name in enumerate(self.columns)}
+        self._rows = header["rows"]
+        self._keys = _Strings(body, header["keys"])
+        self._order = _section(body, header["order"])
+
+    def __len__(self):
+        return self._rows
+
+    def row(self, position):
+        """Return the row at a position of the table as a tuple."""
+        return tuple(column[position] for column in self._columns)
+
+    def rows(self, positions, columns=None):
+        """Return the rows at some positions in table order, optionally some columns."""
+        selected = self._columns
+        if columns is not None:
+            selected = [self._columns[self._col[name]] for name in columns]
+        return [
+            tuple(column[position] for column in selected)
+            for position in sorted(positions)
+        ]
+
+    def _positions(self, lo, hi):
+        start = bisect.bisect_left(self._keys, lo)
+        end = bisect.bisect_left(self._keys, hi, start)
+        return self._order[start:end]
+
+    def _matching(self, key):
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_right(self._keys, key, start)
+        return self._order[start:end]
+
+    def _with_prefix(self, prefix):
+        return self._positions(prefix, _prefix_end(prefix))
+
+    def lookup(self, chain):
+        """Return the rows matching a 1-3 level chain, like MetadataIndex.lookup.
+
+        Returns None when the chain contains LIKE wildcards, in which case the
+        caller has to fall back to the SQL query.
+        """
+        country_iso = chain[0].upper()
+        if len(chain) == 1:
+            return self.rows(
+                self._matching(lookup_key(country_iso, None, "country", None))
+            )
+        region_iso = country_iso + "-" + chain[1].upper()
+        if len(chain) == 2:
+            return self.rows(
+                self._matching(lookup_key(country_iso, region_iso, "region", None))
+            )
+        if any(c in chain[2] for c in LIKE_WILDCARDS):
+            return None
+        key = lookup_key(country_iso, region_iso, None, chain[2])
+        subtype = self._columns[self._col["subtype"]]
+        name = self._columns[self._col["name"]]
+        return self.rows(
+            position
+            for position in self._matching(key)
+            if subtype[position] in PLACE_SUBTYPES and name[position] is not None
+        )
+
+    def countries(self):
+        """Return (columns, rows) of the countries, with the columns of countries()."""
+        positions = self._with_prefix(f"c{KEY_SEP}")
+        return list(COUNTRY_LIST_COLUMNS), self.rows(positions, COUNTRY_LIST_COLUMNS)
+
+    def regions(self, country):
+        """Return (columns, rows) of the regions of a country."""
+        return self.columns, self.rows(
+            self._with_prefix(f"r{KEY_SEP}{country}{KEY_SEP}")
+        )
+
+    def in_region(self, country, region, subtypes):
+        """Return the rows below region level with a region code, in table order."""
+        subtypes = {subtypes} if isinstance(subtypes, str) else set(subtypes)
+        subtype = self._columns[self._col["subtype"]]
+        prefix = f"p{KEY_SEP}{country}{KEY_SEP}{region}{KEY_SEP}"
+        return self.rows(
+            position
+            for position in self._with_prefix(prefix)
+            if subtype[position] in subtypes
+        )
+
+    def subtypes(self):
+        """Return (columns, rows) of the distinct subtypes."""
+        return ["subtype"], [
+            (value,) for value in self._columns[self._col["subtype"]].values
+        ]